@@ -0,0 +1 @@
+# Performance benchmarks for the game, run with: python -m benchmarks.<name>
@@ -0,0 +1,67 @@
+"""
+Micro-benchmark comparing scalar and batched slice collision
+
+Run from the repository root:
+    python -m benchmarks.collision
+"""
+import random
+import timeit
+from fruit_ninja.utils import CollisionDetector
+
+FRUIT_COUNTS = (10, 100, 1000)
+SLICE_POINTS = 15  # Matches InputHandler.max_slice_points
+
+
+def make_scene(fruit_count, seed=0):
+    """Create random fruits and a slice path across an 800x600 screen"""
+    rng = random.Random(seed)
+    centers = [(rng.uniform(0, 800), rng.uniform(0, 600)) for _ in range(fruit_count)]
+    radii = [rng.randint(35, 45) for _ in range(fruit_count)]
+    slice_points = [(50 + i * 50, 300 + rng.uniform(-40, 40)) for i in range(SLICE_POINTS)]
+    return centers, radii, slice_points
+
+
+def scalar_hits(slice_points, centers, radii):
+    """Per-fruit, per-segment test as done by BaseFruit.check_slice"""
+    hits = []
+    for index, ((x, y), radius) in enumerate(zip(centers, radii)):
+        for i in range(len(slice_points) - 1):
+            p1 = slice_points[i]
+            p2 = slice_points[i + 1]
+            if CollisionDetector.point_to_line_distance(x, y, p1[0], p1[1], p2[0], p2[1]) < radius:
+                hits.append((index, i))
+                break
+    return hits
+
+
+def batched_hits(slice_points, centers, radii):
+    fruit_indices, segments = CollisionDetector.batch_slice_hits(slice_points, centers, radii)
+    return list(zip(fruit_indices.tolist(), segments.tolist()))
+
+
+def time_call(func, *args, repeat=5):
+    """Best time of one call in milliseconds"""
+    timer = timeit.Timer(lambda: func(*args))
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number * 1000
+
+
+def main():
+    if not CollisionDetector.batch_available():
+        print("NumPy is not installed, the batched collision path is unavailable")
+        return
+
+    print(f"{'fruits':>8} {'scalar ms':>12} {'batched ms':>12} {'speedup':>9}")
+    for fruit_count in FRUIT_COUNTS:
+        centers, radii, slice_points = make_scene(fruit_count)
+
+        # Both paths must agree on which fruits were hit and by which segment
+        assert scalar_hits(slice_points, centers, radii) == batched_hits(slice_points, centers, radii)
+
+        scalar_ms = time_call(scalar_hits, slice_points, centers, radii)
+        batched_ms = time_call(batched_hits, slice_points, centers, radii)
+        print(f"{fruit_count:>8} {scalar_ms:>12.4f} {batched_ms:>12.4f} {scalar_ms / batched_ms:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
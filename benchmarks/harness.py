@@ -0,0 +1,141 @@
+"""
+Timing and allocation measurement helpers shared by the benchmarks
+"""
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+
+def use_dummy_drivers():
+    """Run pygame without a window or audio device; must be called before pygame.init()"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def summarize(samples_ms):
+    """Mean, p50, p95 and p99 of a list of timings in milliseconds"""
+    ordered = sorted(samples_ms)
+    return {
+        "samples": len(ordered),
+        "mean_ms": statistics.fmean(ordered) if ordered else 0.0,
+        "p50_ms": percentile(ordered, 0.50),
+        "p95_ms": percentile(ordered, 0.95),
+        "p99_ms": percentile(ordered, 0.99),
+        "max_ms": ordered[-1] if ordered else 0.0
+    }
+
+
+class PhaseRecorder:
+    """
+    Collects per-phase timings over many iterations, and optionally allocations
+
+    Allocations are measured with tracemalloc, which slows everything down, so
+    they are recorded in a separate pass from the timings: per phase we keep
+    the peak number of bytes allocated above the starting point, and the net
+    change in live memory blocks.
+    """
+    def __init__(self, track_allocations=False):
+        self.track_allocations = track_allocations
+        self.timings = {}
+        self.alloc_peaks = {}
+        self.alloc_blocks = {}
+
+    def measure(self, phase, func, *args):
+        """Run func(*args) as one sample of the named phase and return its result"""
+        if self.track_allocations:
+            tracemalloc.reset_peak()
+            start_bytes, _ = tracemalloc.get_traced_memory()
+            start_blocks = sys.getallocatedblocks()
+            result = func(*args)
+            _, peak_bytes = tracemalloc.get_traced_memory()
+            self.alloc_peaks.setdefault(phase, []).append(peak_bytes - start_bytes)
+            self.alloc_blocks.setdefault(phase, []).append(sys.getallocatedblocks() - start_blocks)
+            return result
+
+        start = time.perf_counter()
+        result = func(*args)
+        self.timings.setdefault(phase, []).append((time.perf_counter() - start) * 1000)
+        return result
+
+    def results(self):
+        """Summary statistics per phase"""
+        results = {}
+        for phase, samples in self.timings.items():
+            results[phase] = summarize(samples)
+        for phase, peaks in self.alloc_peaks.items():
+            phase_result = results.setdefault(phase, {})
+            phase_result["alloc_peak_kb_mean"] = statistics.fmean(peaks) / 1024
+            phase_result["alloc_peak_kb_max"] = max(peaks) / 1024
+            phase_result["alloc_net_blocks_mean"] = statistics.fmean(self.alloc_blocks[phase])
+        return results
+
+
+def run_scenario(scenario, iterations, warmup, track_allocations=True):
+    """
+    Run a scenario: warm up, time every iteration, then repeat a shorter pass with allocation tracking
+    scenario(recorder, iterations) must do its own setup and call recorder.measure for each phase
+    """
+    scenario(PhaseRecorder(), warmup)
+
+    recorder = PhaseRecorder()
+    scenario(recorder, iterations)
+
+    if track_allocations:
+        alloc_recorder = PhaseRecorder(track_allocations=True)
+        tracemalloc.start()
+        try:
+            scenario(alloc_recorder, max(1, iterations // 10))
+        finally:
+            tracemalloc.stop()
+
+        results = recorder.results()
+        for phase, data in alloc_recorder.results().items():
+            results.setdefault(phase, {}).update(data)
+        return results
+    return recorder.results()
+
+
+def environment_info():
+    """Details of the machine and build, so results are only compared like for like"""
+    info = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%d %H:%M:%S")
+    }
+    try:
+        import pygame
+        info["pygame"] = pygame.version.ver
+        info["sdl"] = ".".join(str(part) for part in pygame.get_sdl_version())
+    except ImportError:
+        pass
+    try:
+        import numpy
+        info["numpy"] = numpy.__version__
+    except ImportError:
+        info["numpy"] = None
+    try:
+        info["git_commit"] = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        info["git_commit"] = None
+    return info
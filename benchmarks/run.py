@@ -0,0 +1,57 @@
+"""
+Run the benchmark scenarios and write the results as JSON
+
+Run from the repository root:
+    python -m benchmarks.run
+    python -m benchmarks.run --scenarios idle,fruits_500 --iterations 600 --output results.json
+
+Results hold mean/p50/p95/p99 milliseconds per phase and allocation figures,
+plus details of the machine and commit. Compare runs made on the same machine.
+"""
+import argparse
+import json
+import sys
+from .harness import environment_info, run_scenario, use_dummy_drivers
+from .scenarios import ITERATION_SCALE, SCENARIOS
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run Fruit Slicer benchmark scenarios")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help="comma-separated scenario names (default: all)")
+    parser.add_argument("--iterations", type=int, default=300, help="timed iterations per scenario")
+    parser.add_argument("--warmup", type=int, default=20, help="untimed iterations before timing")
+    parser.add_argument("--no-alloc", action="store_true", help="skip the allocation tracking pass")
+    parser.add_argument("--output", help="JSON file to write (default: print to stdout)")
+    args = parser.parse_args(argv)
+
+    names = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)} (available: {', '.join(SCENARIOS)})")
+
+    use_dummy_drivers()
+    results = {"environment": environment_info(), "iterations": args.iterations, "scenarios": {}}
+    for name in names:
+        scale = ITERATION_SCALE.get(name, 1.0)
+        iterations = max(1, int(args.iterations * scale))
+        warmup = max(1, int(args.warmup * scale))
+        print(f"Running {name} ({iterations} iterations)...", file=sys.stderr)
+        phases = run_scenario(SCENARIOS[name], iterations, warmup, track_allocations=not args.no_alloc)
+        results["scenarios"][name] = phases
+
+        for phase, stats in phases.items():
+            print(f"  {phase:<14} mean {stats.get('mean_ms', 0):8.3f} ms  p95 {stats.get('p95_ms', 0):8.3f} ms  "
+                  f"p99 {stats.get('p99_ms', 0):8.3f} ms  alloc peak {stats.get('alloc_peak_kb_mean', 0):9.1f} KB",
+                  file=sys.stderr)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+"""
+Scripted benchmark scenarios
+
+Every scenario is a function scenario(recorder, iterations) that sets up its
+own state, untimed, and records each timed phase through recorder.measure.
+Scenarios reseed the RNG so every run of the same commit does the same work.
+"""
+import os
+import random
+import tempfile
+import time
+from .harness import use_dummy_drivers
+
+SEED = 1234
+SLICE_TRAIL_POINTS = 200
+SCORE_STORE_ROWS = 10 ** 6
+SCORE_STORE_PLAYERS = 1000
+SPAWN_TABLE_FRUITS = 10000
+SPAWN_TABLE_LEVELS = 1000
+# Recorded session played by the replay scenario; set FRUIT_SLICER_BENCH_REPLAY to benchmark another recording
+REPLAY_FILE = os.environ.get("FRUIT_SLICER_BENCH_REPLAY",
+                             os.path.join(os.path.dirname(os.path.abspath(__file__)), "replays", "session.replay"))
+
+_game = None
+_temp_dir = None
+_score_store = None
+
+
+def get_game():
+    """Create the shared Game once, showing gameplay and writing scores to a temporary file"""
+    global _game, _temp_dir
+    if _game is None:
+        use_dummy_drivers()
+        from fruit_ninja.game import Game
+
+        _temp_dir = tempfile.mkdtemp(prefix="fruit_ninja_bench_")
+        _game = Game()
+        from fruit_ninja.score_backends import JsonScoreBackend
+        _game.high_score_manager.backend = JsonScoreBackend(os.path.join(_temp_dir, "scores.json"))
+        _game.high_score_manager.high_scores = []
+    return _game
+
+
+def start_gameplay(game, width=800, height=600):
+    """Reset into a gameplay session that can't end and doesn't spawn on its own"""
+    random.seed(SEED)
+    if (game.screen_width, game.screen_height) != (width, height):
+        game.handle_resize(width, height)
+    game.current_screen = "GAME"
+    game.reset()
+    game.simulation.lives_manager.lose_life = lambda: None  # Benchmark sessions never run out of lives
+    game.simulation.fruit_spawner.spawn_interval = float("inf")
+    game.input_handler.slicing = False
+    game.input_handler.trail.clear()
+
+
+def fill_fruits(game, count, rng):
+    """Top the simulation up to count fruits spread over the screen"""
+    simulation = game.simulation
+    while len(simulation.fruits) < count:
+        fruit = simulation.fruit_factory.create_fruit(simulation.world_width, simulation.world_height)
+        fruit.y = fruit.prev_y = rng.uniform(0, simulation.world_height)
+        simulation.add_fruit(fruit)
+
+
+def frame(game, recorder):
+    """One frame of Game.run, split into its phases"""
+    recorder.measure("handle_events", game.handle_events)
+    recorder.measure("update", game.update)
+    recorder.measure("render", game.render)
+    recorder.measure("flip", game.present)
+
+
+def idle(recorder, iterations):
+    """Gameplay screen with nothing on it"""
+    game = get_game()
+    start_gameplay(game)
+    for _ in range(iterations):
+        frame(game, recorder)
+
+
+def fruit_scenario(count):
+    """Gameplay with a steady number of fruits on screen"""
+    def scenario(recorder, iterations):
+        game = get_game()
+        start_gameplay(game)
+        rng = random.Random(SEED)
+        for _ in range(iterations):
+            fill_fruits(game, count, rng)
+            frame(game, recorder)
+    scenario.__doc__ = f"Gameplay with {count} fruits on screen"
+    return scenario
+
+
+def make_trail(game, rng, points=SLICE_TRAIL_POINTS):
+    """A zigzag slice path across the whole screen"""
+    width, height = game.screen_width, game.screen_height
+    return [(i * width / (points - 1), height / 2 + rng.uniform(-height / 3, height / 3))
+            for i in range(points)]
+
+
+def set_trail(game, points):
+    """Make the input handler slice along points, sampled now"""
+    import pygame
+    handler = game.input_handler
+    handler.slicing = True
+    handler.trail.clear()
+    now = pygame.time.get_ticks()
+    for x, y in points:
+        handler.trail.add(x, y, now)
+
+
+def long_slice_trail(recorder, iterations):
+    """Slicing 500 fruits with a 200 point trail, then drawing the trail"""
+    game = get_game()
+    start_gameplay(game)
+    rng = random.Random(SEED)
+    trail = make_trail(game, rng)
+    for _ in range(iterations):
+        game.simulation.clear_fruits()
+        fill_fruits(game, 500, rng)
+        recorder.measure("slice", game.simulation.slice_fruits, trail)
+        set_trail(game, trail)
+        recorder.measure("render", game.render)
+        game.input_handler.slicing = False
+        game.input_handler.trail.clear()
+
+
+def slice_collision(recorder, iterations):
+    """Slice test of a normal 15 point trail against 1000 fruits"""
+    game = get_game()
+    start_gameplay(game)
+    rng = random.Random(SEED)
+    trail = make_trail(game, rng, points=15)
+    for _ in range(iterations):
+        game.simulation.clear_fruits()
+        fill_fruits(game, 1000, rng)
+        recorder.measure("slice", game.simulation.slice_fruits, trail)
+
+
+def mass_removal(recorder, iterations):
+    """5000 fruits falling off the bottom of the screen in the same tick"""
+    game = get_game()
+    start_gameplay(game)
+    rng = random.Random(SEED)
+    for _ in range(iterations):
+        game.simulation.clear_fruits()
+        fill_fruits(game, 5000, rng)
+        for fruit in game.simulation.fruits:
+            fruit.y = game.screen_height + 100
+            fruit.vy = 5
+        recorder.measure("update", game.update)
+
+
+def fruit_churn(recorder, iterations):
+    """Simulation ticks spawning a fruit every tick while as many fall off the screen"""
+    game = get_game()
+    start_gameplay(game)
+    simulation = game.simulation
+    simulation.fruit_spawner.spawn_interval = 0
+    for _ in range(iterations):
+        recorder.measure("step", simulation.step)
+
+
+def spawn_table(recorder, iterations):
+    """Drawing fruits and looking up levels in a table of 10000 fruits over 1000 levels"""
+    from fruit_ninja.spawn_table import SpawnTable
+    rng = random.Random(SEED)
+    names = [f"fruit_{i}" for i in range(SPAWN_TABLE_FRUITS)]
+    levels = [{"score": i * 100, "weights": {rng.choice(names): rng.uniform(0, 10) for _ in range(10)}}
+              for i in range(SPAWN_TABLE_LEVELS)]
+    table = SpawnTable({"defaults": {"special_fruit": names[0]}, "levels": levels}, names)
+    for _ in range(iterations):
+        level = table.get_level(rng.randrange(SPAWN_TABLE_LEVELS))
+        recorder.measure("sample", level.sampler.sample, rng)
+        recorder.measure("level_lookup", table.get_level_index, rng.randrange(SPAWN_TABLE_LEVELS * 100))
+
+
+def replay(recorder, iterations):
+    """Headless playback of a recorded session, one simulation tick per iteration, starting over at its end"""
+    from fruit_ninja.replay import Replay, ReplayPlayer
+    recorded = Replay.load(REPLAY_FILE)
+    player = ReplayPlayer(recorded)
+    for _ in range(iterations):
+        if player.is_finished():
+            player = ReplayPlayer(recorded)
+        recorder.measure("step", player.step)
+
+
+def resize(recorder, iterations):
+    """Window resizes alternating between two sizes"""
+    game = get_game()
+    start_gameplay(game)
+    sizes = [(1024, 768), (800, 600)]
+    for i in range(iterations):
+        recorder.measure("handle_resize", game.handle_resize, *sizes[i % 2])
+    game.handle_resize(800, 600)
+
+
+def sprite_loading(recorder, iterations):
+    """Loading and scaling every fruit sprite"""
+    get_game()  # Sprites need a display to convert to
+    from fruit_ninja.sprite_manager import SpriteManager
+    for _ in range(iterations):
+        recorder.measure("load_sprites", SpriteManager)
+
+
+def high_score_io(recorder, iterations):
+    """Loading and adding high scores with a full table"""
+    get_game()
+    from fruit_ninja.high_scores import HighScoreManager
+    scores_file = os.path.join(_temp_dir, "io_scores.json")
+    if os.path.exists(scores_file):
+        os.remove(scores_file)
+    manager = HighScoreManager(scores_file)
+    rng = random.Random(SEED)
+    for _ in range(10):
+        manager.add_score(rng.randint(0, 5000))
+    for _ in range(iterations):
+        recorder.measure("add_score", manager.add_score, rng.randint(0, 5000))
+        recorder.measure("flush", manager.flush)
+        recorder.measure("load_scores", manager.load_scores)
+    manager.close()
+
+
+def get_score_store():
+    """Build a SQLite score store of SCORE_STORE_ROWS random runs once, in the temporary directory"""
+    global _score_store
+    if _score_store is None:
+        get_game()
+        from fruit_ninja.score_backends import SqliteScoreBackend
+        rng = random.Random(SEED)
+        start = time.mktime((2024, 1, 1, 0, 0, 0, 0, 0, -1))
+        entries = [{
+            "name": f"player{rng.randrange(SCORE_STORE_PLAYERS)}",
+            "score": rng.randint(0, 100000),
+            "date": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(start + rng.randrange(365 * 86400)))
+        } for _ in range(SCORE_STORE_ROWS)]
+        _score_store = SqliteScoreBackend(os.path.join(_temp_dir, "store_scores.db"))
+        _score_store.write(entries)
+    return _score_store
+
+
+def score_store(recorder, iterations):
+    """Queries and adds on a SQLite score store of SCORE_STORE_ROWS runs"""
+    backend = get_score_store()
+    rng = random.Random(SEED)
+    for i in range(iterations):
+        score = rng.randint(0, 100000)
+        name = f"player{rng.randrange(SCORE_STORE_PLAYERS)}"
+        month = rng.randint(1, 12)
+        recorder.measure("top_10", backend.get_top, 10)
+        recorder.measure("rank", backend.get_rank, score)
+        # The same rank by counting the index entries above the score, for comparison
+        recorder.measure("rank_by_count", lambda: backend.connection.execute(
+            "SELECT COUNT(*) FROM scores WHERE score > ?", (score,)).fetchone())
+        recorder.measure("player_best", backend.get_player_best, name)
+        recorder.measure("date_range", backend.get_between, f"2024-{month:02d}-01", f"2024-{month:02d}-02")
+        recorder.measure("add", backend.write, [{"name": name, "score": score, "date": f"2025-01-01 00:00:{i % 60:02d}"}])
+
+
+SCENARIOS = {
+    "idle": idle,
+    "fruits_50": fruit_scenario(50),
+    "fruits_500": fruit_scenario(500),
+    "fruits_5000": fruit_scenario(5000),
+    "long_slice_trail": long_slice_trail,
+    "slice_collision": slice_collision,
+    "mass_removal": mass_removal,
+    "fruit_churn": fruit_churn,
+    "spawn_table": spawn_table,
+    "replay": replay,
+    "resize": resize,
+    "sprite_loading": sprite_loading,
+    "high_score_io": high_score_io,
+    "score_store": score_store
+}
+
+# Scenarios that are slow per iteration run fewer iterations
+ITERATION_SCALE = {
+    "fruits_5000": 0.2,
+    "mass_removal": 0.2,
+    "resize": 0.1,
+    "sprite_loading": 0.1
+}
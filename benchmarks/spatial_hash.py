@@ -0,0 +1,118 @@
+"""
+Benchmark of the spatial hash broad phase for slicing
+
+Fruits are spread at a constant density over a world that grows with the
+fruit count, as on a larger screen, while the slice path stays the same
+length. Brute force cost grows linearly with the fruit count; the broad
+phase query only grows with the number of fruits near the slice path.
+
+Run from the repository root:
+    python -m benchmarks.spatial_hash
+"""
+import math
+import random
+import timeit
+try:
+    import numpy as np
+except ImportError:  # Only the packed variant needs NumPy
+    np = None
+from fruit_ninja.spatial_hash import SpatialHash, PackedSpatialHash
+from fruit_ninja.utils import CollisionDetector
+
+FRUIT_COUNTS = (100, 1000, 10000, 100000)
+FRUITS_PER_SCREEN = 50  # Fruits per 800x600 area
+SLICE_POINTS = 15
+
+
+def make_scene(fruit_count, seed=0):
+    """Create fruits at constant density and a slice path in the middle of the world"""
+    rng = random.Random(seed)
+    scale = math.sqrt(fruit_count / FRUITS_PER_SCREEN)
+    width, height = 800 * scale, 600 * scale
+    centers = [(rng.uniform(0, width), rng.uniform(0, height)) for _ in range(fruit_count)]
+    radii = [rng.randint(35, 45) for _ in range(fruit_count)]
+    start_x, y = width / 2 - 350, height / 2
+    slice_points = [(start_x + i * 50, y + rng.uniform(-40, 40)) for i in range(SLICE_POINTS)]
+    return centers, radii, slice_points
+
+
+def brute_force(slice_points, centers, radii):
+    """Narrow-phase test of every fruit against every segment"""
+    hits = []
+    for index, ((x, y), radius) in enumerate(zip(centers, radii)):
+        for i in range(len(slice_points) - 1):
+            p1, p2 = slice_points[i], slice_points[i + 1]
+            if CollisionDetector.point_to_line_distance(x, y, p1[0], p1[1], p2[0], p2[1]) < radius:
+                hits.append(index)
+                break
+    return hits
+
+
+def broad_phase(spatial_hash, slice_points, centers, radii):
+    """Query the hash, then narrow-phase test only the candidates"""
+    hits = []
+    for index in sorted(spatial_hash.query_polyline(slice_points)):
+        (x, y), radius = centers[index], radii[index]
+        for i in range(len(slice_points) - 1):
+            p1, p2 = slice_points[i], slice_points[i + 1]
+            if CollisionDetector.point_to_line_distance(x, y, p1[0], p1[1], p2[0], p2[1]) < radius:
+                hits.append(index)
+                break
+    return hits
+
+
+def time_call(func, repeat=5):
+    """Best time of one call in milliseconds"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number * 1000
+
+
+def main():
+    print(f"{'fruits':>8} {'candidates':>11} {'brute ms':>10} {'query ms':>10} "
+          f"{'rebuild ms':>11} {'update ms':>10} {'packed query ms':>16} {'packed rebuild ms':>18} "
+          f"{'packed refresh ms':>18}")
+    for fruit_count in FRUIT_COUNTS:
+        centers, radii, slice_points = make_scene(fruit_count)
+        spatial_hash = SpatialHash()
+        spatial_hash.rebuild(centers, radii)
+
+        assert brute_force(slice_points, centers, radii) == broad_phase(spatial_hash, slice_points, centers, radii)
+        candidates = len(spatial_hash.query_polyline(slice_points))
+
+        brute_ms = time_call(lambda: brute_force(slice_points, centers, radii))
+        query_ms = time_call(lambda: broad_phase(spatial_hash, slice_points, centers, radii))
+        rebuild_ms = time_call(lambda: spatial_hash.rebuild(centers, radii), repeat=3)
+
+        # Incremental update after every fruit moved by one frame's worth of motion
+        moved = [(x + 2.0, y - 6.0) for x, y in centers]
+        def update_all():
+            for item, ((x, y), radius) in enumerate(zip(moved, radii)):
+                spatial_hash.update(item, x, y, radius)
+        update_ms = time_call(update_all, repeat=3)
+
+        # Bulk-built NumPy variant used by the game, given arrays like the game's physics state
+        packed_ms = packed_rebuild_ms = packed_refresh_ms = float("nan")
+        if CollisionDetector.batch_available():
+            packed = PackedSpatialHash()
+            packed.rebuild(centers, radii)
+            spatial_hash.rebuild(centers, radii)
+            assert sorted(spatial_hash.query_polyline(slice_points)) == packed.query_polyline(slice_points).tolist()
+            packed_ms = time_call(lambda: packed.query_polyline(slice_points))
+            center_array, moved_array, radius_array = np.array(centers), np.array(moved), np.array(radii)
+            packed_rebuild_ms = time_call(lambda: packed.rebuild(center_array, radius_array), repeat=3)
+
+            # Every fruit moving by one frame and back, only the ones that change cells are touched
+            positions = [center_array, moved_array]
+            def refresh_moved():
+                positions.reverse()
+                packed.refresh(positions[0], radius_array)
+            packed_refresh_ms = time_call(refresh_moved, repeat=3)
+
+        print(f"{fruit_count:>8} {candidates:>11} {brute_ms:>10.3f} {query_ms:>10.3f} "
+              f"{rebuild_ms:>11.3f} {update_ms:>10.3f} {packed_ms:>16.3f} {packed_rebuild_ms:>18.3f} "
+              f"{packed_refresh_ms:>18.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Check of swept slice collision against a corpus of tunneling cases
+
+Each case in tunneling_cases.json is a fruit moving from start to end over
+one tick and a slice trail, with whether the slice must hit it. Every
+collision path has to agree with the corpus: the scalar and batched swept
+tests, BaseFruit.check_slice, and Simulation.slice_fruits with both physics
+backends. The report also shows which cases the old test of the end
+position alone got wrong, and what the swept test costs.
+
+Run from the repository root:
+    python -m benchmarks.tunneling
+"""
+import json
+import os
+import random
+import timeit
+from fruit_ninja.constants import GameConstants
+from fruit_ninja.fruit import SpriteFruit
+from fruit_ninja.simulation import Simulation
+from fruit_ninja.utils import CollisionDetector
+from fruit_ninja import physics
+
+CASES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tunneling_cases.json")
+TIMING_FRUITS = 1000
+TIMING_SLICE_POINTS = 15
+
+
+def load_cases(path=CASES_FILE):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def point_hit(case):
+    """The old test: only where the fruit ended the tick"""
+    (x, y), trail = case["end"], case["trail"]
+    return any(CollisionDetector.point_to_line_distance(x, y, *trail[i], *trail[i + 1]) < case["radius"]
+               for i in range(len(trail) - 1))
+
+
+def swept_hit(case):
+    (x1, y1), (x2, y2), trail = case["start"], case["end"], case["trail"]
+    return any(CollisionDetector.segment_to_segment_distance(x1, y1, x2, y2, *trail[i], *trail[i + 1]) < case["radius"]
+               for i in range(len(trail) - 1))
+
+
+def batched_swept_hit(case):
+    fruit_indices, _ = CollisionDetector.batch_swept_slice_hits(case["trail"], [case["start"]], [case["end"]],
+                                                                [case["radius"]])
+    return len(fruit_indices) == 1
+
+
+def make_fruit(case):
+    """A fruit that moved from the case's start to its end during the last tick"""
+    (x1, y1), (x2, y2) = case["start"], case["end"]
+    fruit = SpriteFruit(x2, y2, x2 - x1, y2 - y1, case["radius"])
+    fruit.prev_x, fruit.prev_y = x1, y1
+    return fruit
+
+
+def fruit_hit(case):
+    return make_fruit(case).check_slice(case["trail"])
+
+
+def simulation_hit(case, backend):
+    GameConstants.PHYSICS_BACKEND = backend
+    simulation = Simulation(800, 600)
+    simulation.add_fruit(make_fruit(case))
+    return len(simulation.slice_fruits(case["trail"])) == 1
+
+
+def check_cases(cases):
+    """Run every case through every path; returns the number of disagreements with the corpus"""
+    backend = GameConstants.PHYSICS_BACKEND
+    paths = [("swept", swept_hit), ("fruit", fruit_hit), ("sim_python", lambda case: simulation_hit(case, "python"))]
+    if CollisionDetector.batch_available():
+        paths.append(("batched", batched_swept_hit))
+    if physics.is_available():
+        paths.append(("sim_numpy", lambda case: simulation_hit(case, "numpy")))
+
+    failures = 0
+    tunneled = 0
+    print(f"{'case':<34} {'expected':>8} {'old test':>9}  paths")
+    try:
+        for case in cases:
+            wrong = [name for name, hit in paths if hit(case) != case["hit"]]
+            failures += len(wrong)
+            old = point_hit(case)
+            if old != case["hit"]:
+                tunneled += 1
+            status = "ok" if not wrong else "WRONG: " + ", ".join(wrong)
+            print(f"{case['name']:<34} {str(case['hit']):>8} {'ok' if old == case['hit'] else 'missed':>9}  {status}")
+    finally:
+        GameConstants.PHYSICS_BACKEND = backend
+    print(f"{len(cases)} cases: the old test got {tunneled} wrong, the swept paths {failures} wrong "
+          f"({len(paths)} paths checked)")
+    return failures
+
+
+def time_call(func, *args, repeat=5):
+    """Best time of one call in milliseconds"""
+    timer = timeit.Timer(lambda: func(*args))
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number * 1000
+
+
+def time_batched():
+    """Cost of the swept batched test next to the end position test"""
+    rng = random.Random(0)
+    ends = [(rng.uniform(0, 800), rng.uniform(0, 600)) for _ in range(TIMING_FRUITS)]
+    starts = [(x + rng.uniform(-10, 10), y + rng.uniform(-30, 30)) for x, y in ends]
+    radii = [rng.randint(35, 45) for _ in range(TIMING_FRUITS)]
+    trail = [(50 + i * 50, 300 + rng.uniform(-40, 40)) for i in range(TIMING_SLICE_POINTS)]
+    # The batched test must pick the same fruits and segments as the scalar one
+    expected = []
+    for index, ((x1, y1), (x2, y2), radius) in enumerate(zip(starts, ends, radii)):
+        for i in range(len(trail) - 1):
+            if CollisionDetector.segment_to_segment_distance(x1, y1, x2, y2, *trail[i], *trail[i + 1]) < radius:
+                expected.append((index, i))
+                break
+    fruit_indices, segments = CollisionDetector.batch_swept_slice_hits(trail, starts, ends, radii)
+    assert expected == list(zip(fruit_indices.tolist(), segments.tolist()))
+
+    point_ms = time_call(CollisionDetector.batch_slice_hits, trail, ends, radii)
+    swept_ms = time_call(CollisionDetector.batch_swept_slice_hits, trail, starts, ends, radii)
+    print(f"{TIMING_FRUITS} fruits, {TIMING_SLICE_POINTS} point trail: end position {point_ms:.3f} ms, "
+          f"swept {swept_ms:.3f} ms")
+
+
+def main():
+    failures = check_cases(load_cases())
+    if CollisionDetector.batch_available():
+        time_batched()
+    if failures:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+Pre-baked asset pack: derived images stored as raw pixels and memory-mapped at startup
+
+Build it with:
+    python -m fruit_ninja.asset_pack
+"""
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import pygame
+from .constants import GameConstants
+from .texture_atlas import TextureAtlas, get_image_name
+
+MAGIC = b"FSPK"
+HEADER = struct.Struct("<4sII")  # Magic, pack version, index length in bytes
+DATA_ALIGNMENT = 16
+PIXEL_FORMAT = "RGBA"
+
+def hash_file(path):
+    """Content hash of a source file, stored with the images baked from it"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as source:
+        for chunk in iter(lambda: source.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def get_key(path):
+    """Key of an image in the pack: its source path relative to the assets directory"""
+    return os.path.relpath(path, GameConstants.ASSETS_DIR).replace(os.sep, "/")
+
+class AssetPack:
+    """
+    A versioned file of raw RGBA pixels with a JSON index
+
+    Layout: a header (magic, ASSET_PACK_VERSION, index length), the index,
+    then the pixel data aligned to DATA_ALIGNMENT. Each index entry records
+    the size, offset and length of its pixels and the hash of the source file
+    it was baked from. The fruit sprites are also stored packed into a texture
+    atlas, with its rects and the hashes of all its sources, so that a fresh
+    atlas can be loaded in one piece.
+
+    The file is memory-mapped and surfaces are created straight over it with
+    pygame.image.frombuffer, so loading an image costs no decoding or scaling.
+    Images whose source changed since the pack was built, or that aren't in
+    it, are decoded from the original file instead, as is everything when the
+    pack is missing or was built by another version.
+    """
+    def __init__(self, path=GameConstants.ASSET_PACK_FILE):
+        self.path = path
+        self.entries = {}
+        self.atlas = None  # Index entry of the baked texture atlas
+        self.data = None  # Memoryview of the mapped pixel data
+        self.hits = 0
+        self.misses = 0
+        self.open()
+
+    def open(self):
+        """Map the pack, leaving it empty if it is missing or out of date"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "rb") as pack_file:
+                mapped = mmap.mmap(pack_file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, index_length = HEADER.unpack_from(mapped, 0)
+            if magic != MAGIC or version != GameConstants.ASSET_PACK_VERSION:
+                print(f"Ignoring asset pack {self.path}: built for another version, rebuild it")
+                mapped.close()
+                return
+            index = json.loads(mapped[HEADER.size:HEADER.size + index_length].decode("utf-8"))
+            self.entries = index["entries"]
+            self.atlas = index.get("atlas")
+            self.data = memoryview(mapped)[index["data_offset"]:]
+        except Exception as e:
+            print(f"Error opening asset pack {self.path}: {e}")
+            self.entries = {}
+            self.atlas = None
+            self.data = None
+
+    def is_fresh(self, path, source_hash):
+        """Check if a source file is unchanged since it was baked"""
+        try:
+            return hash_file(path) == source_hash
+        except OSError:
+            return True  # Only the baked copy is left, use it
+
+    def get_pixels(self, entry):
+        """Surface over the mapped pixels of an index entry"""
+        pixels = self.data[entry["offset"]:entry["offset"] + entry["length"]]
+        return pygame.image.frombuffer(pixels, tuple(entry["size"]), PIXEL_FORMAT)
+
+    def get(self, path):
+        """
+        Get the baked image for a source file, or None if the pack has no up to date copy
+        The surface shares the mapped memory, so convert it before keeping it
+        """
+        entry = self.entries.get(get_key(path))
+        if entry is None or not self.is_fresh(path, entry["hash"]):
+            return None
+        return self.get_pixels(entry)
+
+    def get_atlas(self):
+        """
+        Get the baked texture atlas, or None if the pack has none or any of its sources changed
+        Its surface shares the mapped memory, so convert it before keeping it
+        """
+        if self.atlas is None:
+            return None
+        for key, source_hash in self.atlas["sources"].items():
+            if not self.is_fresh(os.path.join(GameConstants.ASSETS_DIR, key), source_hash):
+                return None
+        self.hits += len(self.atlas["rects"])
+        return TextureAtlas(self.get_pixels(self.atlas), self.atlas["rects"])
+
+    def load(self, path, decode):
+        """Get the baked image for a source file, falling back to decode(path) (thread safe)"""
+        image = self.get(path)
+        if image is not None:
+            self.hits += 1
+            return image
+        self.misses += 1
+        return decode(path)
+
+def build_pack(path, recipes, atlas_sources=None):
+    """
+    Bake images into a pack at path
+    recipes is a list of (source path, decode function) pairs; each function
+    returns the image derived from its source, as used at runtime. The images
+    of atlas_sources, all of them by default, are also packed into the atlas
+    Returns the index
+    """
+    blobs = []
+    offset = 0
+
+    def add_pixels(image):
+        nonlocal offset
+        pixels = pygame.image.tobytes(image, PIXEL_FORMAT)
+        entry = {"size": list(image.get_size()), "offset": offset, "length": len(pixels)}
+        blobs.append(pixels)
+        padding = -len(pixels) % DATA_ALIGNMENT
+        if padding:
+            blobs.append(bytes(padding))
+        offset += len(pixels) + padding
+        return entry
+
+    entries = {}
+    images = {}
+    hashes = {}
+    for source, decode in recipes:
+        image = decode(source)
+        key = get_key(source)
+        entries[key] = add_pixels(image)
+        entries[key]["hash"] = hash_file(source)
+        if atlas_sources is None or source in atlas_sources:
+            hashes[key] = entries[key]["hash"]
+            images[get_image_name(source)] = image
+
+    atlas = TextureAtlas.build(images)
+    atlas_entry = add_pixels(atlas.surface)
+    atlas_entry["rects"] = {name: list(rect) for name, rect in atlas.rects.items()}
+    atlas_entry["sources"] = hashes
+    atlas_entry["report"] = atlas.get_report()
+
+    # The index holds the data offset, which depends on the index length, so pad it to a fixed alignment
+    index = {"version": GameConstants.ASSET_PACK_VERSION, "data_offset": 0, "entries": entries, "atlas": atlas_entry}
+    index_bytes = json.dumps(index).encode("utf-8")
+    data_offset = HEADER.size + len(index_bytes) + 32
+    data_offset += -data_offset % DATA_ALIGNMENT
+    index["data_offset"] = data_offset
+    index_bytes = json.dumps(index).encode("utf-8")
+    index_bytes += b" " * (data_offset - HEADER.size - len(index_bytes))
+
+    # Write to a temporary file first so a running game never maps a half-written pack
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as pack_file:
+        pack_file.write(HEADER.pack(MAGIC, GameConstants.ASSET_PACK_VERSION, len(index_bytes)))
+        pack_file.write(index_bytes)
+        for blob in blobs:
+            pack_file.write(blob)
+    os.replace(temp_path, path)
+    return index
+
+def main():
+    parser = argparse.ArgumentParser(description="Bake the scaled sprites, cursor and buttons into an asset pack")
+    parser.add_argument("--output", default=GameConstants.ASSET_PACK_FILE, help="pack file to write")
+    args = parser.parse_args()
+
+    # Imported here, the game module is only needed for its lists of baked images
+    from .game import Game
+    index = build_pack(args.output, Game.get_baked_images(), [path for path, decode in Game.get_sprite_images()])
+    size = os.path.getsize(args.output)
+    print(f"Wrote {len(index['entries'])} images and their atlas ({size / 1024:.0f} KiB) to {args.output}")
+    report = index["atlas"]["report"]
+    print(f"Atlas {report['size'][0]}x{report['size'][1]}, {report['efficiency']:.0%} packed, "
+          f"{report['atlas_bytes'] / 1024:.0f} KiB vs {report['individual_bytes'] / 1024:.0f} KiB as separate surfaces")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Background images, decoded once and rescaled to the window off the main thread
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pygame
+from .constants import GameConstants
+from .pixel_format import optimize
+
+def scale_to_cover(image, width, height):
+    """
+    Scale an image to cover width x height while preserving its aspect ratio, cropping the overflow evenly
+    The crop is copied out, so the oversized scaled image isn't kept alive by it
+    """
+    image_aspect = image.get_width() / image.get_height()
+    screen_aspect = width / height
+
+    if image_aspect > screen_aspect:
+        # Image is wider than screen, scale by height
+        new_height = height
+        new_width = int(new_height * image_aspect)
+        scaled = pygame.transform.smoothscale(image, (new_width, new_height))
+        # Center horizontally
+        x_offset = (new_width - width) // 2
+        return scaled.subsurface((x_offset, 0, width, height)).copy()
+    else:
+        # Image is taller than screen, scale by width
+        new_width = width
+        new_height = int(new_width / image_aspect)
+        scaled = pygame.transform.smoothscale(image, (new_width, new_height))
+        # Center vertically
+        y_offset = (new_height - height) // 2
+        return scaled.subsurface((0, y_offset, width, height)).copy()
+
+class BackgroundLibrary:
+    """
+    Decoded background originals and copies of them scaled to the window
+
+    Originals are decoded from disk once. When the window size changes, the
+    background on screen is scaled right away and the others are scaled on a
+    worker thread, so resizing doesn't stall the frame loop. A background that
+    is needed before its worker job has finished is scaled on the spot.
+    """
+    HOME = "home"  # Key of the menu background; gameplay backgrounds are keyed by level index
+
+    def __init__(self, size, load=True):
+        self.size = size
+        self.originals = {}  # Maps a key to its decoded image, or None if it couldn't be loaded
+        self.scaled = {}  # Maps a key to its image scaled for self.size
+        self.generation = 0  # Bumped on every resize so late worker results for old sizes are dropped
+        self.lock = threading.Lock()  # Guards size, scaled and generation
+        self.scale_locks = {}  # One per original, so an image is never scaled by two threads at once
+        self.executor = ThreadPoolExecutor(max_workers=GameConstants.BACKGROUND_SCALE_WORKERS,
+                                           thread_name_prefix="background-scale")
+
+        # Without load, call load_originals() later, e.g. with images decoded on worker threads
+        if load:
+            self.load_originals()
+
+    @classmethod
+    def get_sources(cls):
+        """(key, path) of every background image"""
+        sources = [(cls.HOME, GameConstants.HOME_SCREEN_BACKGROUND)]
+        sources.extend(enumerate(GameConstants.BACKGROUND_IMAGES))
+        return sources
+
+    def load_originals(self, decoded=None):
+        """
+        Load every background image
+        decoded optionally maps keys to images already decoded with pygame.image.load
+        """
+        for key, path in self.get_sources():
+            self.load_original(key, path, decoded.get(key) if decoded else None)
+
+    def load_original(self, key, path, image=None):
+        """
+        Decode an image from disk, unless it was decoded in advance, and convert it for the display
+        Opaque backgrounds are converted without alpha, so they are copied rather than blended when drawn
+        """
+        try:
+            if image is None:
+                image = pygame.image.load(path)
+            self.originals[key] = optimize(image, f"Background {key}")
+        except Exception as e:
+            print(f"Error loading background {path}: {e}")
+            self.originals[key] = None
+        self.scale_locks[key] = threading.Lock()
+
+    def get_gameplay_count(self):
+        return len(self.originals) - 1
+
+    def get_gameplay_key(self, level):
+        """Key of the gameplay background for a 0-based level"""
+        return min(level, self.get_gameplay_count() - 1)
+
+    def get(self, key):
+        """Get a background scaled to the current size, scaling it now if it isn't ready yet"""
+        with self.lock:
+            scaled = self.scaled.get(key)
+            size = self.size
+            generation = self.generation
+        if scaled is not None:
+            return scaled
+
+        scaled = self.scale(key, size)
+        with self.lock:
+            if generation == self.generation:
+                # A worker may have finished it meanwhile, keep one copy
+                scaled = self.scaled.setdefault(key, scaled)
+        return scaled
+
+    def set_size(self, size, visible_key=None):
+        """Rescale for a new window size: the visible background now, the rest in the background"""
+        with self.lock:
+            if size == self.size and self.scaled:
+                return
+            self.size = size
+            self.scaled = {}
+            self.generation += 1
+            generation = self.generation
+
+        if visible_key is not None:
+            self.get(visible_key)
+        for key in self.originals:
+            if key != visible_key:
+                self.executor.submit(self.scale_job, key, size, generation)
+
+    def scale_job(self, key, size, generation):
+        """Worker: scale one background unless the window was resized again since"""
+        if generation != self.generation:
+            return
+        try:
+            scaled = self.scale(key, size)
+        except Exception as e:
+            print(f"Error scaling background {key}: {e}")
+            return
+        with self.lock:
+            if generation == self.generation:
+                self.scaled.setdefault(key, scaled)
+
+    def scale(self, key, size):
+        """Scale an original to size; a black surface stands in for images that failed to load"""
+        original = self.originals.get(key)
+        if original is None:
+            # Use a fallback color if image can't be loaded
+            fallback = pygame.Surface(size)
+            fallback.fill(GameConstants.BLACK)
+            return fallback
+        with self.scale_locks[key]:
+            return scale_to_cover(original, *size)
+
+    def shutdown(self):
+        """Stop the worker, dropping jobs that haven't started"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,110 @@
+"""
+Mixer channel pool with reserved categories, priorities and instance limits
+"""
+import time
+import pygame
+from .constants import GameConstants
+
+class Voice:
+    """What a channel was last asked to play"""
+    def __init__(self, name, sound, priority, started):
+        self.name = name
+        self.sound = sound
+        self.priority = priority
+        self.started = started
+
+class ChannelManager:
+    """
+    Plays sounds on channels reserved per category
+
+    Every mixer channel is reserved, so pygame never picks one on its own, and
+    each category gets its own block of them: gameplay spam can fill only the
+    gameplay channels, never the ones the game over or high score cues need.
+    A sound may play at most max_instances times at once, later plays are
+    dropped. When its category has no free channel, it steals the channel of
+    the lowest priority, oldest voice if that priority isn't higher than its
+    own, and is dropped otherwise. Volume is set on the channel, so it never
+    leaks into other plays of the same Sound.
+    """
+    def __init__(self, categories=GameConstants.SOUND_CHANNEL_CATEGORIES):
+        total = sum(categories.values())
+        pygame.mixer.set_num_channels(total)
+        pygame.mixer.set_reserved(total)
+
+        self.categories = {}  # Maps a category to its channel indices
+        index = 0
+        for category, count in categories.items():
+            self.categories[category] = list(range(index, index + count))
+            index += count
+        self.channels = [pygame.mixer.Channel(i) for i in range(total)]
+        self.voices = [None] * total
+
+        self.played = 0
+        self.dropped = 0  # Plays refused by an instance limit or a full category of higher priorities
+        self.stolen = 0  # Voices cut off for a play of the same or higher priority
+
+    def is_playing(self, index):
+        """Check if a channel is still playing the voice it was given"""
+        voice = self.voices[index]
+        if voice is None:
+            return False
+        if not self.channels[index].get_busy() or self.channels[index].get_sound() is not voice.sound:
+            self.voices[index] = None
+            return False
+        return True
+
+    def count_instances(self, name):
+        """Number of channels playing a sound"""
+        return sum(1 for index, voice in enumerate(self.voices)
+                   if voice and voice.name == name and self.is_playing(index))
+
+    def play(self, name, sound, volume=1.0, settings=None):
+        """
+        Play a sound under its settings (category, priority, max instances)
+        Returns the channel used, or None if the play was dropped
+        """
+        if settings is None:
+            settings = GameConstants.SOUND_SETTINGS.get(name, GameConstants.DEFAULT_SOUND_SETTINGS)
+        category, priority, max_instances = settings
+        if self.count_instances(name) >= max_instances:
+            self.dropped += 1
+            return None
+
+        indices = self.categories[category]
+        target = None
+        for index in indices:
+            if not self.is_playing(index):
+                target = index
+                break
+
+        if target is None:
+            # Steal the least important voice, the oldest among equals
+            victim = min(indices, key=lambda index: (self.voices[index].priority, self.voices[index].started))
+            if self.voices[victim].priority > priority:
+                self.dropped += 1
+                return None
+            self.channels[victim].stop()
+            self.stolen += 1
+            target = victim
+
+        channel = self.channels[target]
+        channel.set_volume(volume)
+        channel.play(sound)
+        self.voices[target] = Voice(name, sound, priority, time.perf_counter())
+        self.played += 1
+        return channel
+
+    def stop_all(self):
+        for index, channel in enumerate(self.channels):
+            channel.stop()
+            self.voices[index] = None
+
+    def get_stats(self):
+        """Play counters and the number of busy channels per category"""
+        return {
+            "played": self.played,
+            "dropped": self.dropped,
+            "stolen": self.stolen,
+            "busy": {category: sum(1 for index in indices if self.is_playing(index))
+                     for category, indices in self.categories.items()}
+        }
@@ -7,7 +7,12 @@ class GameConstants:
     # Default window size (can be resized)
     DEFAULT_SCREEN_WIDTH = 800
     DEFAULT_SCREEN_HEIGHT = 600
-    FPS = 60
+    FPS = 60  # Render rate
+    
+    # Simulation runs at a fixed tick rate, independent of the render rate
+    SIM_HZ = 60
+    BASE_TICK_RATE = 60  # Tick rate that per-tick velocities, gravity and spawn intervals are tuned for
+    MAX_SIM_STEPS_PER_FRAME = 8  # Beyond this the game slows down instead of spiralling on slow frames
     WHITE = (255, 255, 255)
     BLACK = (0, 0, 0)
     RED = (255, 0, 0)
@@ -80,6 +85,12 @@ class GameConstants:
         }
     }
     
+    # Fruits in FRUIT_IMAGES that are never spawned
+    SKIPPED_FRUITS = ("magic_bean",)
+    
+    # Per-level fruit weights, special fruits, points and score thresholds (see spawn_table.py)
+    SPAWN_TABLE_FILE = os.environ.get("FRUIT_SLICER_SPAWN_TABLE", os.path.join(ASSETS_DIR, "spawn_table.json"))
+    
     # Special items
     BOMB_IMAGE = os.path.join(ASSETS_DIR, "res", "Bomb.png")
     BOMB_SLICED_IMAGE = os.path.join(ASSETS_DIR, "res", "Bomb.png")  # Same image as we don't want to show sliced bomb
@@ -115,7 +126,6 @@ class GameConstants:
         "game_start": os.path.join(ASSETS_DIR, "sounds", "GameStart.wav"),
         "lose_life": os.path.join(ASSETS_DIR, "sounds", "LoseLife.wav"),
         "main_menu_exit": os.path.join(ASSETS_DIR, "sounds", "MainMenuExit.wav"),
-        "main_theme": os.path.join(ASSETS_DIR, "sounds", "MainTheme.wav"),
         "new_background": os.path.join(ASSETS_DIR, "sounds", "NewBackground.wav"),
         "new_high_score": os.path.join(ASSETS_DIR, "sounds", "NewHighScore.wav"),
         "pause": os.path.join(ASSETS_DIR, "sounds", "Pause.wav"),
@@ -123,11 +133,107 @@ class GameConstants:
         "times_up": os.path.join(ASSETS_DIR, "sounds", "TimesUp.wav")
     }
     
+    # Mixer channels reserved per category, so spammy gameplay sounds can't take the channels cues need
+    SOUND_CHANNEL_CATEGORIES = {"gameplay": 10, "cue": 4, "ui": 2}
+    # Category, priority (a play may steal a channel from a lower or equal priority) and max simultaneous instances
+    SOUND_SETTINGS = {
+        "fruit_slice": ("gameplay", 2, 4),
+        "fruit_throw": ("gameplay", 1, 3),
+        "bomb_explode": ("gameplay", 3, 2),
+        "bomb_throw": ("gameplay", 1, 2),
+        "combo": ("gameplay", 2, 1),
+        "freeze_banana": ("gameplay", 2, 1),
+        "extra_life": ("cue", 2, 1),
+        "lose_life": ("cue", 3, 2),
+        "game_over": ("cue", 4, 1),
+        "new_high_score": ("cue", 4, 1),
+        "new_background": ("cue", 2, 1),
+        "game_start": ("cue", 3, 1),
+        "times_up": ("cue", 3, 1),
+        "button_click": ("ui", 1, 2),
+        "pause": ("ui", 2, 1),
+        "resume": ("ui", 2, 1),
+        "main_menu_exit": ("ui", 2, 1)
+    }
+    DEFAULT_SOUND_SETTINGS = ("gameplay", 1, 2)
+    
+    # Sound effects decoded at startup; the rest are decoded the first time they play
+    SOUND_PREWARM = ("fruit_slice", "fruit_throw", "button_click", "game_start", "lose_life")
+    
+    # Music tracks, streamed rather than decoded into memory
+    MUSIC = {
+        "main_theme": os.path.join(ASSETS_DIR, "sounds", "MainTheme.wav")
+    }
+    # A compressed copy next to a track (e.g. MainTheme.ogg) is streamed instead when present
+    COMPRESSED_MUSIC_FORMATS = (".ogg", ".mp3")
+    
     # Legacy paths (for backward compatibility)
     NEW_FRUITS_SPRITESHEET = os.path.join(ASSETS_DIR, "Fruits", "Asset", "Fruits.png")
     SLICED_FRUITS_SPRITESHEET = os.path.join(ASSETS_DIR, "sliced_fruits", "PACK", "sprites.png")
     WINDOW_ICON = os.path.join(ASSETS_DIR, "res", "GreenApple.png")
     
+    # Fruit physics backend: "numpy" steps all fruits together in arrays (falls back to "python" without NumPy)
+    PHYSICS_BACKEND = "numpy"
+    # Most removed fruits kept for reuse by FruitFactory; more than ever fly at once in normal play
+    FRUIT_POOL_SIZE = 256
+    
+    # Slice trail: samples older than this many milliseconds fade out, at most SLICE_TRAIL_CAPACITY are kept
+    SLICE_TRAIL_MAX_AGE_MS = 200
+    SLICE_TRAIL_CAPACITY = 256
+    
+    # Grid cell size in pixels for the spatial hash used to find fruits near the slice path
+    SPATIAL_HASH_CELL_SIZE = 128
+    
+    # Rotation cache for fruit sprites
+    ROTATION_CACHE_ANGLE_STEP = 5  # Degrees per pre-rendered angle bucket
+    ROTATION_CACHE_MAX_BYTES = 32 * 1024 * 1024  # Memory cap before least recently used entries are evicted
+    ROTATION_CACHE_WARM = False  # Pre-render every bucket at load instead of filling lazily
+    
+    # Only push the screen rects that changed during gameplay, with a full flip past this fraction of the screen
+    DIRTY_RECT_RENDERING = True
+    DIRTY_RECT_MAX_AREA = 0.5
+    
+    # HUD text is composed from a per-font glyph atlas, with whole strings cached
+    GLYPH_ATLAS_CHARACTERS = "".join(chr(code) for code in range(32, 127))  # Printable ASCII
+    TEXT_CACHE_SIZE = 64  # Strings per font before the least recently used is evicted
+    
+    # Window resizing
+    RESIZE_DEBOUNCE_MS = 150  # A burst of resize events is applied once none has arrived for this long
+    BACKGROUND_SCALE_WORKERS = 1  # Threads rescaling the backgrounds that aren't on screen
+    
+    # Startup assets are decoded and scaled on this many threads behind a loading screen (0 loads them in order)
+    ASSET_LOADER_WORKERS = int(os.environ.get("FRUIT_SLICER_LOADER_WORKERS", min(8, os.cpu_count() or 4)))
+    
+    # Fruit sprites can be packed into one texture atlas surface. Off by default: no packing
+    # fills every pixel, so for the current art the atlas takes more pixel memory than separate surfaces
+    TEXTURE_ATLAS = os.environ.get("FRUIT_SLICER_TEXTURE_ATLAS", "0") != "0"
+    ATLAS_MAX_WIDTH = 1024
+    ATLAS_WIDTH_STEP = 8  # Atlas widths tried when looking for the tightest packing
+    # Space between images. pygame transforms of a subsurface never read past its rect, so none is needed
+    ATLAS_PADDING = 0
+    
+    # Scaled sprites, cursor and buttons baked as raw pixels by `python -m fruit_ninja.asset_pack`
+    ASSET_PACK_FILE = os.path.join(ASSETS_DIR, "assets.pack")
+    ASSET_PACK_VERSION = 3  # Bump when the pack layout or the baked sizes change, so old packs are ignored
+    
+    # High score storage: "json" keeps the top 10 in SCORES_FILE, "sqlite" keeps every run in SQLITE_SCORES_FILE
+    SCORE_BACKEND = os.environ.get("FRUIT_SLICER_SCORE_BACKEND", "json")
+    SCORES_FILE = "fruit_ninja_scores.json"
+    SQLITE_SCORES_FILE = "fruit_ninja_scores.db"
+    SCORE_RANK_BITS = 32  # Scores are ranked over 0 to 2**SCORE_RANK_BITS - 1
+    
+    # High scores are written on a background thread, batching the scores added within this long into one write
+    SCORE_WRITE_BATCH_SECONDS = 0.5
+    SCORE_LOCK_TIMEOUT = 2.0  # Longest wait for another game instance to finish writing the scores file
+    
+    # Performance overlay, toggled with F3
+    PERF_OVERLAY_HISTORY = 240  # Frames kept for the rolling timings and graph
+    PERF_SUMMARY_FILE = os.environ.get("FRUIT_SLICER_PERF_SUMMARY")  # JSON session summary written on exit, if set
+    
+    # Replays: the seed and input of every game in a session, written on exit to REPLAY_RECORD_FILE if set
+    REPLAY_RECORD_FILE = os.environ.get("FRUIT_SLICER_RECORD_REPLAY")
+    REPLAY_VERSION = 1  # Bump when the replay format or anything that changes gameplay for the same input changes
+    
     # Sprite dimensions
     FRUIT_SPRITE_SIZE = 64
     NEW_FRUIT_SPRITE_SIZE = 64
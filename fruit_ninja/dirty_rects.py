@@ -0,0 +1,86 @@
+"""
+Dirty-rectangle display updates
+"""
+import pygame
+from .constants import GameConstants
+from .perf_overlay import counters
+
+class DirtyRectTracker:
+    """
+    Tracks the screen rects drawn in the current and previous frame
+
+    At the start of a frame the rects drawn in the previous frame are restored
+    from the background, which leaves the screen as a clean background again.
+    Everything is then drawn on top, and only the previous and current rects
+    are pushed to the display. When they cover more than max_area_fraction of
+    the screen a single full flip is cheaper, so that is used instead.
+    """
+    def __init__(self, max_area_fraction=GameConstants.DIRTY_RECT_MAX_AREA):
+        self.max_area_fraction = max_area_fraction
+        self.previous = []  # Rects drawn last frame
+        self.current = []  # Rects drawn this frame
+        self.full_redraw = True  # The screen doesn't hold a known background
+        self.full_update = True  # The whole display must be pushed this frame
+        self.full_updates = 0
+        self.partial_updates = 0
+
+        # Opaque copy of the background to restore from. A background that kept
+        # per-pixel alpha may be very slightly translucent, and blending it over
+        # old pixels in a restored rect would leave faint ghosts of old sprites
+        self.background_source = None
+        self.background = None
+
+    def invalidate(self):
+        """Redraw and push the whole screen next frame (resize, window exposed)"""
+        self.full_redraw = True
+        self.full_update = True
+
+    def begin_frame(self, screen, background):
+        """Restore the background under last frame's rects, or everywhere after invalidate()"""
+        if background is not self.background_source:
+            self.background_source = background
+            self.background = background.convert() if background else None
+            self.invalidate()
+        background = self.background
+
+        if self.full_redraw:
+            if background:
+                screen.blit(background, (0, 0))
+                counters.blits += 1
+            else:
+                screen.fill(GameConstants.BLACK)
+            self.full_redraw = False
+        else:
+            for rect in self.previous:
+                if background:
+                    screen.blit(background, rect, rect)
+                    counters.blits += 1
+                else:
+                    screen.fill(GameConstants.BLACK, rect)
+        self.current = []
+
+    def add(self, rect):
+        """Mark a rect drawn to this frame"""
+        if rect:
+            self.current.append(rect)
+
+    def extend(self, rects):
+        """Mark several rects drawn to this frame"""
+        for rect in rects:
+            if rect:
+                self.current.append(rect)
+
+    def present(self, screen):
+        """Push this frame to the display"""
+        rects = self.previous + self.current
+        max_area = screen.get_width() * screen.get_height() * self.max_area_fraction
+        if self.full_update or sum(rect.width * rect.height for rect in rects) > max_area:
+            pygame.display.flip()
+            self.full_updates += 1
+        else:
+            pygame.display.update(rects)
+            self.partial_updates += 1
+
+        self.previous = self.current
+        self.current = []
+        self.full_update = False
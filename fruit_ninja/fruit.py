@@ -6,10 +6,42 @@ import pygame
 from .constants import GameConstants
 from .interfaces import GameObject, Sliceable, Renderer
 from .utils import CollisionDetector
+from .physics import physics_fields, FruitPhysics
+from .perf_overlay import counters
+from .spawn_table import load_spawn_table
 
+def _lerp(previous, current, alpha):
+    """Interpolate between the previous and current value of a simulated quantity"""
+    if alpha >= 1.0:
+        return current
+    return previous + (current - previous) * alpha
+
+
+@physics_fields
 class BaseFruit(GameObject, Sliceable, Renderer):
-    """Base class for all fruit types"""
-    def __init__(self, x, y, vx, vy, radius, sprite=None, sprite_index=0, sliced_sprites=None, points=10, is_special=False):
+    """
+    Base class for all fruit types
+    State lives in __slots__ rather than a per-object __dict__, and FruitFactory
+    recycles removed fruits through reset(), which reinitializes one exactly
+    like a new fruit
+    """
+    __slots__ = FruitPhysics.FIELDS + FruitPhysics.FLAGS + (
+        "_physics", "_slot", "sprite", "sprite_index", "sliced_sprites", "rotation_cache", "points", "is_special"
+    )
+    
+    def __init__(self, x, y, vx, vy, radius, sprite=None, sprite_index=0, sliced_sprites=None, points=10, is_special=False,
+                 rotation_cache=None, rotation_speed=None):
+        self._physics = None
+        self._slot = None
+        self.reset(x, y, vx, vy, radius, sprite, sprite_index, sliced_sprites, points, is_special, rotation_cache,
+                   rotation_speed)
+    
+    def reset(self, x, y, vx, vy, radius, sprite=None, sprite_index=0, sliced_sprites=None, points=10, is_special=False,
+              rotation_cache=None, rotation_speed=None):
+        """
+        Reinitialize the fruit as if it was just created with these arguments
+        rotation_speed is drawn from the global random module when not given
+        """
         self.x = x
         self.y = y
         self.vx = vx
@@ -23,6 +55,7 @@ class BaseFruit(GameObject, Sliceable, Renderer):
         self.sprite = sprite
         self.sprite_index = sprite_index
         self.sliced_sprites = sliced_sprites
+        self.rotation_cache = rotation_cache  # Shared RotationCache, or None to rotate every frame
         
         # Point value and special status
         self.points = points
@@ -40,58 +73,82 @@ class BaseFruit(GameObject, Sliceable, Renderer):
         
         # Rotation properties
         self.rotation = 0
-        self.rotation_speed = random.uniform(-2, 2)
+        self.rotation_speed = random.uniform(-2, 2) if rotation_speed is None else rotation_speed
         self.left_rotation = 0
         self.right_rotation = 0
         self.left_rotation_speed = 0
         self.right_rotation_speed = 0
+        
+        # State at the start of the last simulation tick, for render interpolation
+        self.prev_x = x
+        self.prev_y = y
+        self.prev_rotation = 0
+        self.prev_left_piece_x = 0
+        self.prev_left_piece_y = 0
+        self.prev_left_rotation = 0
+        self.prev_right_piece_x = 0
+        self.prev_right_piece_y = 0
+        self.prev_right_rotation = 0
+    
+    def save_previous_state(self):
+        """Remember the current state as the start of the next tick"""
+        self.prev_x = self.x
+        self.prev_y = self.y
+        self.prev_rotation = self.rotation
+        self.prev_left_piece_x = self.left_piece_x
+        self.prev_left_piece_y = self.left_piece_y
+        self.prev_left_rotation = self.left_rotation
+        self.prev_right_piece_x = self.right_piece_x
+        self.prev_right_piece_y = self.right_piece_y
+        self.prev_right_rotation = self.right_rotation
     
-    def update(self):
+    def update(self, world_width, world_height, time_scale=1.0):
+        """
+        Advance the fruit by one simulation tick inside a world of the given size
+        time_scale is the tick length in frames of GameConstants.BASE_TICK_RATE,
+        which the per-tick velocities and gravity are tuned for
+        """
+        self.save_previous_state()
+        
         if not self._sliced:
             # Apply gravity to vertical velocity
-            self.vy += self.gravity
+            self.vy += self.gravity * time_scale
             
             # Update position
-            self.x += self.vx
-            self.y += self.vy
+            self.x += self.vx * time_scale
+            self.y += self.vy * time_scale
             
             # Update rotation
-            self.rotation += self.rotation_speed
-            
-            # Get current screen dimensions
-            screen_width, screen_height = pygame.display.get_surface().get_size()
+            self.rotation += self.rotation_speed * time_scale
             
             # Bounce off walls with energy preservation
             if self.x < self.radius:
                 self.x = self.radius
                 self.vx = abs(self.vx) * 0.9
-            elif self.x > screen_width - self.radius:
-                self.x = screen_width - self.radius
+            elif self.x > world_width - self.radius:
+                self.x = world_width - self.radius
                 self.vx = -abs(self.vx) * 0.9
             
             # Mark for removal if it falls off screen
-            if self.y > screen_height + self.radius and self.vy > 0:
+            if self.y > world_height + self.radius and self.vy > 0:
                 self._remove = True
         else:
             # Update sliced pieces
             # Left piece
-            self.left_vy += self.gravity
-            self.left_piece_x += self.left_vx
-            self.left_piece_y += self.left_vy
-            self.left_rotation += self.left_rotation_speed
+            self.left_vy += self.gravity * time_scale
+            self.left_piece_x += self.left_vx * time_scale
+            self.left_piece_y += self.left_vy * time_scale
+            self.left_rotation += self.left_rotation_speed * time_scale
             
             # Right piece
-            self.right_vy += self.gravity
-            self.right_piece_x += self.right_vx
-            self.right_piece_y += self.right_vy
-            self.right_rotation += self.right_rotation_speed
-            
-            # Get current screen dimensions
-            screen_width, screen_height = pygame.display.get_surface().get_size()
+            self.right_vy += self.gravity * time_scale
+            self.right_piece_x += self.right_vx * time_scale
+            self.right_piece_y += self.right_vy * time_scale
+            self.right_rotation += self.right_rotation_speed * time_scale
             
             # Mark for removal if both pieces fall off screen
-            if (self.left_piece_y > screen_height + self.radius and 
-                self.right_piece_y > screen_height + self.radius):
+            if (self.left_piece_y > world_height + self.radius and 
+                self.right_piece_y > world_height + self.radius):
                 self._remove = True
     
     def is_removable(self):
@@ -108,72 +165,104 @@ class BaseFruit(GameObject, Sliceable, Renderer):
         """Check if this is a special fruit"""
         return self.is_special
     
-    def check_slice(self, slice_points):
+    def check_slice(self, slice_points, rng=random):
         if self._sliced:
             return False
             
-        # Check if any line segment of the slice intersects the fruit
+        # Check if any line segment of the slice comes within the radius of the
+        # path the fruit moved along this tick, so fast fruits can't skip over it
         for i in range(len(slice_points) - 1):
             p1 = slice_points[i]
             p2 = slice_points[i + 1]
             
-            # Simple distance-based collision detection
-            distance = CollisionDetector.point_to_line_distance(
-                self.x, self.y, p1[0], p1[1], p2[0], p2[1]
+            distance = CollisionDetector.segment_to_segment_distance(
+                self.prev_x, self.prev_y, self.x, self.y, p1[0], p1[1], p2[0], p2[1]
             )
             if distance < self.radius:
-                self._sliced = True
-                
-                # Calculate slice direction vector
-                dx = p2[0] - p1[0]
-                dy = p2[1] - p1[1]
-                
-                # Normalize the vector
-                length = (dx**2 + dy**2)**0.5
-                if length > 0:
-                    dx /= length
-                    dy /= length
-                
-                # Initialize slice pieces with positions and velocities
-                # Position them further apart for larger slices
-                self.left_piece_x = self.x - 15
-                self.left_piece_y = self.y
-                self.right_piece_x = self.x + 15
-                self.right_piece_y = self.y
-                
-                # Set velocities for pieces based on slice direction and original velocity
-                slice_force = 4.0  # Increased force for better separation
-                self.left_vx = self.vx - dy * slice_force
-                self.left_vy = self.vy + dx * slice_force
-                self.right_vx = self.vx + dy * slice_force
-                self.right_vy = self.vy - dx * slice_force
-                
-                # Set rotation speeds for the pieces
-                self.left_rotation_speed = random.uniform(-5, -2)
-                self.right_rotation_speed = random.uniform(2, 5)
-                
+                self.slice_with_segment(p1, p2, rng)
                 return True
         
         return False
+    
+    def slice_with_segment(self, p1, p2, rng=random):
+        """
+        Slice the fruit along the slice segment from p1 to p2
+        rng draws the rotation speeds of the pieces
+        """
+        self._sliced = True
+        
+        # Calculate slice direction vector
+        dx = p2[0] - p1[0]
+        dy = p2[1] - p1[1]
+        
+        # Normalize the vector
+        length = (dx**2 + dy**2)**0.5
+        if length > 0:
+            dx /= length
+            dy /= length
+        
+        # Initialize slice pieces with positions and velocities
+        # Position them further apart for larger slices
+        self.left_piece_x = self.x - 15
+        self.left_piece_y = self.y
+        self.right_piece_x = self.x + 15
+        self.right_piece_y = self.y
+        
+        # Pieces appear where they were cut, so there is nothing to interpolate from
+        self.prev_left_piece_x = self.left_piece_x
+        self.prev_left_piece_y = self.left_piece_y
+        self.prev_left_rotation = self.left_rotation
+        self.prev_right_piece_x = self.right_piece_x
+        self.prev_right_piece_y = self.right_piece_y
+        self.prev_right_rotation = self.right_rotation
+        
+        # Set velocities for pieces based on slice direction and original velocity
+        slice_force = 4.0  # Increased force for better separation
+        self.left_vx = self.vx - dy * slice_force
+        self.left_vy = self.vy + dx * slice_force
+        self.right_vx = self.vx + dy * slice_force
+        self.right_vy = self.vy - dx * slice_force
+        
+        # Set rotation speeds for the pieces
+        self.left_rotation_speed = rng.uniform(-5, -2)
+        self.right_rotation_speed = rng.uniform(2, 5)
 
 
 class SpriteFruit(BaseFruit):
     """Fruit implementation using sprites"""
-    def render(self, screen):
+    __slots__ = ()
+    
+    def render(self, screen, alpha=1.0):
+        """
+        Render the fruit and return the list of screen rects drawn to
+        alpha is how far the display time is between the previous and the
+        current simulation tick, positions are interpolated between the two
+        """
+        if not self._sliced:
+            x = _lerp(self.prev_x, self.x, alpha)
+            y = _lerp(self.prev_y, self.y, alpha)
+        else:
+            left_x = _lerp(self.prev_left_piece_x, self.left_piece_x, alpha)
+            left_y = _lerp(self.prev_left_piece_y, self.left_piece_y, alpha)
+            right_x = _lerp(self.prev_right_piece_x, self.right_piece_x, alpha)
+            right_y = _lerp(self.prev_right_piece_y, self.right_piece_y, alpha)
+        
         if not self.sprite:
             # Fallback to colored circle if no sprite
             if not self._sliced:
-                pygame.draw.circle(screen, GameConstants.RED, (int(self.x), int(self.y)), self.radius)
-            else:
-                pygame.draw.circle(screen, GameConstants.RED, (int(self.left_piece_x), int(self.left_piece_y)), self.radius // 2)
-                pygame.draw.circle(screen, GameConstants.RED, (int(self.right_piece_x), int(self.right_piece_y)), self.radius // 2)
-            return
+                return [pygame.draw.circle(screen, GameConstants.RED, (int(x), int(y)), self.radius)]
+            return [
+                pygame.draw.circle(screen, GameConstants.RED, (int(left_x), int(left_y)), self.radius // 2),
+                pygame.draw.circle(screen, GameConstants.RED, (int(right_x), int(right_y)), self.radius // 2)
+            ]
             
         if not self._sliced:
             # Draw whole fruit sprite with rotation
-            rotated_sprite = pygame.transform.rotate(self.sprite, self.rotation)
-            sprite_rect = rotated_sprite.get_rect(center=(int(self.x), int(self.y)))
-            screen.blit(rotated_sprite, sprite_rect)
+            rotation = _lerp(self.prev_rotation, self.rotation, alpha)
+            rotated_sprite = self._rotate(self.sprite, "whole", rotation)
+            sprite_rect = rotated_sprite.get_rect(center=(int(x), int(y)))
+            counters.blits += 1
+            return [screen.blit(rotated_sprite, sprite_rect)]
         else:
             # Draw sliced fruit sprites
             if self.sliced_sprites and len(self.sliced_sprites) == 2:
@@ -183,26 +272,35 @@ class SpriteFruit(BaseFruit):
                 if left_half and right_half:
                     try:
                         # Rotate the sliced pieces
-                        rotated_left = pygame.transform.rotate(left_half, self.left_rotation)
-                        rotated_right = pygame.transform.rotate(right_half, self.right_rotation)
+                        left_rotation = _lerp(self.prev_left_rotation, self.left_rotation, alpha)
+                        right_rotation = _lerp(self.prev_right_rotation, self.right_rotation, alpha)
+                        rotated_left = self._rotate(left_half, "left", left_rotation)
+                        rotated_right = self._rotate(right_half, "right", right_rotation)
                         
                         # Draw the sliced pieces - using the same size as the original fruit
-                        left_rect = rotated_left.get_rect(center=(int(self.left_piece_x), int(self.left_piece_y)))
-                        right_rect = rotated_right.get_rect(center=(int(self.right_piece_x), int(self.right_piece_y)))
+                        left_rect = rotated_left.get_rect(center=(int(left_x), int(left_y)))
+                        right_rect = rotated_right.get_rect(center=(int(right_x), int(right_y)))
                         
-                        screen.blit(rotated_left, left_rect)
-                        screen.blit(rotated_right, right_rect)
+                        counters.blits += 2
+                        return [screen.blit(rotated_left, left_rect), screen.blit(rotated_right, right_rect)]
                     except Exception as e:
                         print(f"Error rendering sliced fruit: {e}")
-                        self._render_fallback_slices(screen)
+                        return self._render_fallback_slices(screen, left_x, left_y, right_x, right_y)
                 else:
                     # Fallback if sliced sprites are invalid
-                    self._render_fallback_slices(screen)
+                    return self._render_fallback_slices(screen, left_x, left_y, right_x, right_y)
             else:
                 # Fallback if sliced sprites aren't available
-                self._render_fallback_slices(screen)
+                return self._render_fallback_slices(screen, left_x, left_y, right_x, right_y)
     
-    def _render_fallback_slices(self, screen):
+    def _rotate(self, surface, part, angle):
+        """Rotate a sprite, using the shared rotation cache when available"""
+        if self.rotation_cache:
+            return self.rotation_cache.get(self.sprite_index, part, surface, angle)
+        counters.rotations += 1
+        return pygame.transform.rotate(surface, angle)
+    
+    def _render_fallback_slices(self, screen, left_x, left_y, right_x, right_y):
         """Render fallback sliced pieces if the proper sprites aren't available"""
         # Use the original fruit color for the fallback slices
         color = GameConstants.RED
@@ -217,72 +315,91 @@ class SpriteFruit(BaseFruit):
                 pass
         
         half_radius = self.radius // 2
-        pygame.draw.circle(screen, color, (int(self.left_piece_x), int(self.left_piece_y)), half_radius)
-        pygame.draw.circle(screen, color, (int(self.right_piece_x), int(self.right_piece_y)), half_radius)
+        return [
+            pygame.draw.circle(screen, color, (int(left_x), int(left_y)), half_radius),
+            pygame.draw.circle(screen, color, (int(right_x), int(right_y)), half_radius)
+        ]
 
 
 class FruitFactory:
-    """Factory for creating different types of fruits"""
-    def __init__(self, sprite_manager):
+    """
+    Factory for creating different types of fruits
+    Every random draw comes from rng, so a factory with a seeded
+    random.Random spawns the same fruits every run
+    """
+    def __init__(self, sprite_manager=None, spawn_table=None, rng=None):
+        # Without a sprite manager (headless), fruits get no sprites and render as circles
         self.sprite_manager = sprite_manager
-        self.special_fruit_chance = 0.05  # 5% chance for special fruit (frozen banana)
-    
-    def create_fruit(self, speed_multiplier=1.0, current_level=1):
-        radius = random.randint(35, 45)  # Further reduced radius from previous 40-50
+        if sprite_manager:
+            self.fruit_names = sprite_manager.fruit_names
+        else:
+            self.fruit_names = [name for name in GameConstants.FRUIT_IMAGES if name not in GameConstants.SKIPPED_FRUITS]
         
-        # Determine if this should be a special fruit (frozen banana)
-        is_special = random.random() < self.special_fruit_chance
+        # Per-level fruit weights, special fruit chance and points
+        self.spawn_table = spawn_table or load_spawn_table(self.fruit_names)
+        self.rng = rng if rng is not None else random
+        
+        # Removed fruits waiting to be reused, so spawning doesn't allocate in steady play
+        self.pool = []
+        self.created = 0
+        self.reused = 0
+    
+    def create_fruit(self, world_width, world_height, speed_multiplier=1.0, level=0):
+        """Create a fruit for a 0-based level of the spawn table"""
+        settings = self.spawn_table.get_level(level)
+        rng = self.rng
+        radius = rng.randint(35, 45)  # Further reduced radius from previous 40-50
         
-        # Get a random fruit sprite and its index, or specifically get the frozen banana
+        # Either the level's special fruit or one drawn by the level's weights
+        is_special = rng.random() < settings.special_chance
         if is_special:
-            # Find the frozen banana in the sprite manager
-            frozen_banana_index = None
-            for i, name in enumerate(self.sprite_manager.fruit_names):
-                if name == "freeze_banana":
-                    frozen_banana_index = i
-                    break
-            
-            if frozen_banana_index is not None:
-                sprite = self.sprite_manager.fruit_sprites[frozen_banana_index]
-                sprite_index = frozen_banana_index
-            else:
-                # If frozen banana not found, get a random fruit
-                is_special = False
-                sprite, sprite_index = self.sprite_manager.get_random_fruit_sprite()
+            sprite_index = settings.special_index
         else:
-            # Get a random regular fruit
-            sprite, sprite_index = self.sprite_manager.get_random_fruit_sprite()
-        
-        sliced_sprites = self.sprite_manager.get_matching_sliced_sprite(sprite_index)
+            sprite_index = settings.sampler.sample(rng)
         
-        # Get current screen dimensions
-        screen_width, screen_height = pygame.display.get_surface().get_size()
+        if self.sprite_manager:
+            sprite = self.sprite_manager.fruit_sprites[sprite_index]
+            sliced_sprites = self.sprite_manager.get_matching_sliced_sprite(sprite_index)
+            rotation_cache = self.sprite_manager.rotation_cache
+        else:
+            sprite = None
+            sliced_sprites = None
+            rotation_cache = None
         
         # Spawn fruits at random positions along the width
-        x = random.randint(radius, screen_width - radius)
+        x = rng.randint(radius, world_width - radius)
         
         # Random spawn height between bottom and middle of screen
-        spawn_height = random.randint(screen_height // 2, screen_height)
+        spawn_height = rng.randint(world_height // 2, world_height)
         y = spawn_height
         
-        # Initial velocities - reduce for first 3 levels
-        base_speed = speed_multiplier
-        if current_level <= 3:
-            base_speed *= 0.8  # 20% slower for first 3 levels
-        
-        vx = random.uniform(-1.5, 1.5) * base_speed
-        vy = random.uniform(-8, -6) * base_speed
+        # Initial velocities
+        base_speed = speed_multiplier * settings.speed_scale
+        vx = rng.uniform(-1.5, 1.5) * base_speed
+        vy = rng.uniform(-8, -6) * base_speed
+        rotation_speed = rng.uniform(-2, 2)
         
-        # Calculate points based on level and special status
-        points = 10  # Base points
+        points = settings.get_points(is_special)
         
-        # Increase points based on level
-        if current_level > 1:
-            points += (current_level - 1) * 5  # +5 points per level above 1
-        
-        # Double points for special fruits
-        if is_special:
-            points *= 2
-        
-        # Create a new fruit with the whole fruit sprite
-        return SpriteFruit(x, y, vx, vy, radius, sprite, sprite_index, sliced_sprites, points, is_special)
+        # Reuse a removed fruit if there is one, otherwise create a new one with the whole fruit sprite
+        if self.pool:
+            fruit = self.pool.pop()
+            fruit.reset(x, y, vx, vy, radius, sprite, sprite_index, sliced_sprites, points, is_special, rotation_cache,
+                        rotation_speed)
+            self.reused += 1
+            return fruit
+        self.created += 1
+        return SpriteFruit(x, y, vx, vy, radius, sprite, sprite_index, sliced_sprites, points, is_special,
+                           rotation_cache, rotation_speed)
+    
+    def release(self, fruit):
+        """
+        Return a fruit that was removed from play to the pool
+        The caller must not keep using it, the next create_fruit may hand it out again
+        """
+        if len(self.pool) < GameConstants.FRUIT_POOL_SIZE:
+            self.pool.append(fruit)
+    
+    def get_pool_stats(self):
+        """Fruits created and reused so far, and how many are waiting in the pool"""
+        return {"created": self.created, "reused": self.reused, "pooled": len(self.pool)}
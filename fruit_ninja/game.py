@@ -3,22 +3,35 @@ Main game class that orchestrates all components
 """
 import pygame
 import random
+import time
 from .constants import GameConstants
-from .fruit import FruitFactory
-from .managers import ScoreManager, LivesManager, DifficultyManager, GameState, FruitSpawner
+from .simulation import Simulation
 from .input_handler import InputHandler
 from .renderer import UIRenderer
-from .screens import HomeScreen, AboutScreen, HighScoreScreen
+from .screens import HomeScreen, AboutScreen, HighScoreScreen, LoadingScreen
 from .sprite_manager import SpriteManager
 from .sound_manager import SoundManager
 from .high_scores import HighScoreManager
+from .score_backends import create_score_backend
+from .perf_overlay import PerfOverlay, counters
+from .dirty_rects import DirtyRectTracker
+from .backgrounds import BackgroundLibrary
+from .loader import AssetLoader, decode_image, fit_size, scale_image
+from .asset_pack import AssetPack
+from .texture_atlas import TextureAtlas, get_image_name
+from .replay import ReplayRecorder
+from .pixel_format import ALPHA, log_format, optimize
 
 class Game:
     """Main game class that orchestrates all components"""
     def __init__(self):
+        self.init_start = time.perf_counter()
+        self.startup_time = None  # Seconds from here to the first interactive frame
+        
         # Initialize pygame if not already initialized
         if not pygame.get_init():
             pygame.init()
+        InputHandler.install_event_filter()
             
         # Create a resizable window
         self.screen_width = GameConstants.DEFAULT_SCREEN_WIDTH
@@ -30,42 +43,46 @@ class Game:
         pygame.display.set_caption('Fruit Slicer')
         self.clock = pygame.time.Clock()
         
+        self.interpolation_alpha = 1.0  # How far the display is between the last two simulation ticks
+        self.perf_overlay = PerfOverlay()  # Frame timings, toggled with F3
+        
+        # Frames only push the parts of the screen that changed
+        self.dirty_rects = DirtyRectTracker() if GameConstants.DIRTY_RECT_RENDERING else None
+        
         # Set window icon
         self.set_window_icon()
         
-        # Load custom cursor
-        self.load_custom_cursor()
+        # Window size from the latest resize event, applied once resizing pauses
+        self.pending_resize = None
+        self.pending_resize_time = 0
         
-        # Initialize sprite manager
-        self.sprite_manager = SpriteManager()
+        # Managers are created empty and filled by load_assets()
+        self.sprite_manager = SpriteManager(load=False)
+        self.sound_manager = SoundManager(load=False)
+        self.backgrounds = BackgroundLibrary((self.screen_width, self.screen_height), load=False)
         
-        # Initialize sound manager
-        self.sound_manager = SoundManager()
+        # Load sprites, sounds, backgrounds, cursor and buttons behind a loading screen
+        self.load_assets()
         
-        # Initialize high score manager
-        self.high_score_manager = HighScoreManager()
+        # Gameplay runs in a display-independent simulation, this class presents it
+        self.simulation = Simulation(self.screen_width, self.screen_height, self.sprite_manager)
+        self.update_background()
         
-        # Load background images
-        self.load_backgrounds()
+        # Initialize high score manager
+        self.high_score_manager = HighScoreManager(backend=create_score_backend())
         
         # Initialize components
-        self.fruits = []
-        self.score_manager = ScoreManager()
-        self.lives_manager = LivesManager(5)
-        self.difficulty_manager = DifficultyManager()
         self.input_handler = InputHandler()
-        self.game_state = GameState()
-        self.fruit_spawner = FruitSpawner()
         self.ui_renderer = UIRenderer()
-        self.fruit_factory = FruitFactory(self.sprite_manager)
+        
+        # Records the seed and input of every game when FRUIT_SLICER_RECORD_REPLAY is set
+        self.replay_recorder = ReplayRecorder(self.simulation) if GameConstants.REPLAY_RECORD_FILE else None
+        self.input_handler.recorder = self.replay_recorder
         
         # Game state
         self.current_screen = "HOME"  # HOME, GAME, ABOUT
         self.paused = False
         
-        # Load UI buttons
-        self.load_ui_buttons()
-        
         # Initialize screens
         self.home_screen = HomeScreen(self.screen, self.home_background, self.high_score_manager)
         self.about_screen = AboutScreen(self.screen, self.home_background)
@@ -74,25 +91,141 @@ class Game:
         # Start playing background music
         self.sound_manager.play_music("main_theme")
     
-    def load_custom_cursor(self):
-        """Load custom sword cursor"""
+    def load_assets(self):
+        """
+        Load every startup asset, showing a loading screen meanwhile
+        Files are decoded and scaled on ASSET_LOADER_WORKERS threads; converting
+        them to the display format and handing them to their managers runs on
+        the main thread between loading screen frames
+        """
+        loader = AssetLoader(GameConstants.ASSET_LOADER_WORKERS)
+        
+        # Scaled sprites, cursor and buttons come from the pre-baked pack when it is up to date
+        pack = AssetPack()
+        
+        # Sprites, cursor and buttons are loaded on workers. With TEXTURE_ATLAS the sprites share one
+        # texture atlas, which the pack may hold ready made, otherwise the atlas is packed from them
+        sprite_images = self.get_sprite_images()
+        baked_atlas = pack.get_atlas() if GameConstants.TEXTURE_ATLAS else None
+        if baked_atlas is None:
+            for path, decode in sprite_images:
+                loader.add(("image", path), lambda path=path, decode=decode: pack.load(path, decode))
+            loader.add("unconverted_atlas", lambda *images: self.build_texture_atlas(sprite_images, images),
+                       [("image", path) for path, decode in sprite_images])
+        else:
+            loader.add("unconverted_atlas", lambda: baked_atlas)
+        loader.add("atlas", self.load_texture_atlas, ["unconverted_atlas"], main_thread=True)
+        loader.add("sprites", self.sprite_manager.load_sprites, ["atlas"], main_thread=True)
+        
+        # The cursor and buttons stay separate surfaces so they can be run-length encoded
+        for path, decode in self.get_ui_images():
+            loader.add(("image", path), lambda path=path, decode=decode: pack.load(path, decode))
+        loader.add("cursor", self.load_custom_cursor, [("image", GameConstants.CURSOR_IMAGE)], main_thread=True)
+        loader.add("buttons", self.load_ui_buttons,
+                   [("image", GameConstants.PAUSE_BUTTON), ("image", GameConstants.RESUME_BUTTON)], main_thread=True)
+        
+        # Hot set of sound effects, the others load on first use and music is streamed
+        sound_names = list(GameConstants.SOUND_PREWARM)
+        for name in sound_names:
+            loader.add(("sound", name), lambda name=name: SoundManager.decode_sound(GameConstants.SOUNDS[name]))
+        loader.add("sounds", lambda *sounds: self.sound_manager.load_sounds(dict(zip(sound_names, sounds))),
+                   [("sound", name) for name in sound_names], main_thread=True)
+        
+        # Backgrounds, with the home screen one scaled to the window on a worker
+        background_keys = []
+        for key, path in BackgroundLibrary.get_sources():
+            background_keys.append(key)
+            loader.add(("background", key), lambda path=path: decode_image(path))
+        loader.add("backgrounds", lambda *images: self.backgrounds.load_originals(dict(zip(background_keys, images))),
+                   [("background", key) for key in background_keys], main_thread=True)
+        loader.add("home_background", lambda _: self.scale_backgrounds(), ["backgrounds"])
+        
+        if GameConstants.ASSET_LOADER_WORKERS > 0:
+            loading_screen = LoadingScreen(self.screen)
+            loader.start()
+            while not loader.poll():
+                # Keep the window responsive; a resize is applied once loading is done
+                for event in pygame.event.get():
+                    if event.type == pygame.VIDEORESIZE:
+                        self.request_resize(event.w, event.h)
+                loading_screen.draw(loader.get_progress())
+                pygame.display.flip()
+                self.clock.tick(GameConstants.FPS)
+        else:
+            loader.run_sequentially()
+        
+        self.home_background = self.backgrounds.get(BackgroundLibrary.HOME)
+        self.asset_load_time = loader.get_elapsed()
+        print(f"Loaded assets in {self.asset_load_time * 1000:.0f} ms "
+              f"({GameConstants.ASSET_LOADER_WORKERS} worker threads, {pack.hits} images from the asset pack)")
+    
+    @staticmethod
+    def build_texture_atlas(baked_images, images):
+        """
+        Pack the loaded baked images into an atlas, leaving out any that failed to load (thread safe)
+        Without TEXTURE_ATLAS, the images are returned by name as they are
+        """
+        images = {get_image_name(path): image for (path, decode), image in zip(baked_images, images)
+                  if image is not None}
+        return TextureAtlas.build(images) if GameConstants.TEXTURE_ATLAS else images
+    
+    def load_texture_atlas(self, atlas):
+        """
+        Convert the texture atlas for the display and report how well it packed
+        Separate images from build_texture_atlas get the pixel format pass one by one
+        """
+        if isinstance(atlas, dict):
+            self.texture_atlas = None
+            return {name: optimize(image, name) for name, image in atlas.items()}
+        self.texture_atlas = atlas.convert() if atlas else None
+        if self.texture_atlas:
+            print(self.texture_atlas.format_report())
+            # Converting the sprites would copy them out of the atlas, so they are only logged
+            for name in self.texture_atlas.rects:
+                log_format(self.texture_atlas.get(name), f"{name} (atlas)", ALPHA)
+        return self.texture_atlas
+    
+    def scale_backgrounds(self):
+        """Scale the backgrounds to the window, returning the home screen one (thread safe)"""
+        self.backgrounds.set_size((self.screen_width, self.screen_height))
+        return self.backgrounds.get(BackgroundLibrary.HOME)
+    
+    @staticmethod
+    def decode_cursor(path=GameConstants.CURSOR_IMAGE):
+        """Decode the cursor image scaled to a height of 60, preserving aspect ratio (thread safe)"""
+        cursor_img = decode_image(path)
+        return scale_image(cursor_img, fit_size(cursor_img, 60, by_height=True))
+    
+    @staticmethod
+    def decode_button(path):
+        """Decode a UI button image scaled to 50 x 50 (thread safe)"""
+        return decode_image(path, (50, 50))
+    
+    @staticmethod
+    def get_sprite_images():
+        """(source path, decode function) of every fruit sprite, the images the texture atlas holds"""
+        return [(path, SpriteManager.decode_sprite) for path in SpriteManager.get_sprite_paths()]
+    
+    @staticmethod
+    def get_ui_images():
+        """(source path, decode function) of the cursor and buttons"""
+        return [(GameConstants.CURSOR_IMAGE, Game.decode_cursor),
+                (GameConstants.PAUSE_BUTTON, Game.decode_button),
+                (GameConstants.RESUME_BUTTON, Game.decode_button)]
+    
+    @staticmethod
+    def get_baked_images():
+        """(source path, decode function) of every fixed-size image the asset pack holds"""
+        return Game.get_sprite_images() + Game.get_ui_images()
+    
+    def load_custom_cursor(self, image=None):
+        """Load custom sword cursor, from the already decoded image when given"""
         try:
-            # Load cursor image
-            cursor_img = pygame.image.load(GameConstants.CURSOR_IMAGE).convert_alpha()
-            
-            # Get original dimensions
-            original_width = cursor_img.get_width()
-            original_height = cursor_img.get_height()
-            
-            # Calculate aspect ratio
-            aspect_ratio = original_width / original_height
-            
-            # Set a target height and calculate width to maintain aspect ratio
-            target_height = 60
-            target_width = int(target_height * aspect_ratio)
-            
-            # Scale cursor while preserving aspect ratio
-            self.cursor_img = pygame.transform.smoothscale(cursor_img, (target_width, target_height))
+            # Load cursor image, run-length encoded as it is only blitted
+            if image is None:
+                image = self.decode_cursor()
+            self.cursor_img = optimize(image, "Cursor", rle=True)
+            target_width, target_height = self.cursor_img.get_size()
             
             # Set hotspot to the bottom edge of the sword (for slicing with the blade)
             # This will make the bottom edge of the sword the active point for the slice line
@@ -122,102 +255,43 @@ class Game:
         except Exception as e:
             print(f"Could not set window icon: {e}")
     
-    def load_backgrounds(self):
-        """Load and scale all background images"""
+    def load_ui_buttons(self, pause_image=None, resume_image=None):
+        """Load UI button images, from the already decoded images when given"""
         try:
-            # Load home screen background
-            home_bg_path = GameConstants.HOME_SCREEN_BACKGROUND
-            self.home_background = pygame.image.load(home_bg_path).convert_alpha()
-            
-            # Scale to current window size while preserving aspect ratio
-            bg_aspect = self.home_background.get_width() / self.home_background.get_height()
-            screen_aspect = self.screen_width / self.screen_height
-            
-            if bg_aspect > screen_aspect:
-                # Image is wider than screen, scale by height
-                new_height = self.screen_height
-                new_width = int(new_height * bg_aspect)
-                scaled_bg = pygame.transform.smoothscale(self.home_background, (new_width, new_height))
-                # Center horizontally
-                x_offset = (new_width - self.screen_width) // 2
-                self.home_background = scaled_bg.subsurface((x_offset, 0, self.screen_width, self.screen_height))
-            else:
-                # Image is taller than screen, scale by width
-                new_width = self.screen_width
-                new_height = int(new_width / bg_aspect)
-                scaled_bg = pygame.transform.smoothscale(self.home_background, (new_width, new_height))
-                # Center vertically
-                y_offset = (new_height - self.screen_height) // 2
-                self.home_background = scaled_bg.subsurface((0, y_offset, self.screen_width, self.screen_height))
-            
-            # Load all gameplay backgrounds with proper aspect ratio preservation
-            self.game_backgrounds = []
-            for bg_path in GameConstants.BACKGROUND_IMAGES:
-                try:
-                    bg = pygame.image.load(bg_path).convert_alpha()
-                    
-                    # Scale while preserving aspect ratio
-                    bg_aspect = bg.get_width() / bg.get_height()
-                    
-                    if bg_aspect > screen_aspect:
-                        # Image is wider than screen, scale by height
-                        new_height = self.screen_height
-                        new_width = int(new_height * bg_aspect)
-                        scaled_bg = pygame.transform.smoothscale(bg, (new_width, new_height))
-                        # Center horizontally
-                        x_offset = (new_width - self.screen_width) // 2
-                        scaled_bg = scaled_bg.subsurface((x_offset, 0, self.screen_width, self.screen_height))
-                    else:
-                        # Image is taller than screen, scale by width
-                        new_width = self.screen_width
-                        new_height = int(new_width / bg_aspect)
-                        scaled_bg = pygame.transform.smoothscale(bg, (new_width, new_height))
-                        # Center vertically
-                        y_offset = (new_height - self.screen_height) // 2
-                        scaled_bg = scaled_bg.subsurface((0, y_offset, self.screen_width, self.screen_height))
-                    
-                    self.game_backgrounds.append(scaled_bg)
-                except Exception as e:
-                    print(f"Error loading background {bg_path}: {e}")
-                    # Use a fallback color if image can't be loaded
-                    fallback_bg = pygame.Surface((self.screen_width, self.screen_height))
-                    fallback_bg.fill(GameConstants.BLACK)
-                    self.game_backgrounds.append(fallback_bg)
-            
-            # Start with the first background for gameplay
-            self.current_bg_index = 0
-            if self.game_backgrounds:
-                self.background = self.game_backgrounds[self.current_bg_index]
-            else:
-                # Create a fallback background if no backgrounds were loaded
-                self.background = pygame.Surface((self.screen_width, self.screen_height))
-                self.background.fill(GameConstants.BLACK)
-            
-        except Exception as e:
-            print(f"Warning: Could not load background images: {e}")
-            self.home_background = None
-            self.game_backgrounds = []
-            self.background = None
-    
-    def load_ui_buttons(self):
-        """Load UI button images"""
-        try:
-            # Load pause button
-            self.pause_button_img = pygame.image.load(GameConstants.PAUSE_BUTTON).convert_alpha()
-            self.pause_button_img = pygame.transform.smoothscale(self.pause_button_img, (50, 50))
+            # Load pause button, run-length encoded like the cursor
+            if pause_image is None:
+                pause_image = self.decode_button(GameConstants.PAUSE_BUTTON)
+            self.pause_button_img = optimize(pause_image, "Pause button", rle=True)
             self.pause_button_rect = self.pause_button_img.get_rect(topright=(self.screen_width - 10, 10))
             
             # Load resume button
-            self.resume_button_img = pygame.image.load(GameConstants.RESUME_BUTTON).convert_alpha()
-            self.resume_button_img = pygame.transform.smoothscale(self.resume_button_img, (50, 50))
+            if resume_image is None:
+                resume_image = self.decode_button(GameConstants.RESUME_BUTTON)
+            self.resume_button_img = optimize(resume_image, "Resume button", rle=True)
             self.resume_button_rect = self.resume_button_img.get_rect(topright=(self.screen_width - 10, 10))
         except Exception as e:
             print(f"Error loading UI buttons: {e}")
             self.pause_button_img = None
             self.resume_button_img = None
     
+    def request_resize(self, new_width, new_height):
+        """
+        Handle window resize event
+        Dragging a window edge sends a burst of these, so only the last size is
+        applied, once no new one has arrived for RESIZE_DEBOUNCE_MS
+        """
+        self.pending_resize = (new_width, new_height)
+        self.pending_resize_time = pygame.time.get_ticks()
+    
+    def apply_pending_resize(self):
+        """Apply the last requested window size if resizing has paused"""
+        if self.pending_resize and pygame.time.get_ticks() - self.pending_resize_time >= GameConstants.RESIZE_DEBOUNCE_MS:
+            new_width, new_height = self.pending_resize
+            self.pending_resize = None
+            self.handle_resize(new_width, new_height)
+    
     def handle_resize(self, new_width, new_height):
-        """Handle window resize event"""
+        """Resize the window and everything laid out for its size"""
         self.screen_width = max(400, new_width)  # Minimum width
         self.screen_height = max(300, new_height)  # Minimum height
         
@@ -226,14 +300,23 @@ class Game:
             (self.screen_width, self.screen_height),
             pygame.RESIZABLE
         )
+        self.simulation.set_world_size(self.screen_width, self.screen_height)
+        if self.replay_recorder:
+            self.replay_recorder.record_resize(self.screen_width, self.screen_height)
+        self.invalidate_display()
         
-        # Reload and rescale backgrounds
-        self.load_backgrounds()
+        # Rescale the background on screen now and the others on a worker thread
+        if self.current_screen == "GAME":
+            visible_key = self.backgrounds.get_gameplay_key(self.simulation.level)
+        else:
+            visible_key = BackgroundLibrary.HOME
+        self.backgrounds.set_size((self.screen_width, self.screen_height), visible_key)
+        if self.current_screen == "GAME":
+            self.update_background()
         
-        # Update screens with new background
-        self.home_screen = HomeScreen(self.screen, self.home_background, self.high_score_manager)
-        self.about_screen = AboutScreen(self.screen, self.home_background)
-        self.high_score_screen = HighScoreScreen(self.screen, self.home_background, self.high_score_manager)
+        # Screens rebuild their static layers for the new size when next drawn
+        for menu_screen in (self.home_screen, self.about_screen, self.high_score_screen):
+            menu_screen.screen = self.screen
         
         # Update UI button positions
         if hasattr(self, 'pause_button_img') and self.pause_button_img:
@@ -242,123 +325,74 @@ class Game:
     
     def reset(self):
         """Reset the game to initial state"""
-        self.fruits = []
-        self.score_manager.reset()
-        self.lives_manager.reset()
-        self.difficulty_manager.reset()
-        self.fruit_spawner.reset()
-        self.game_state.reset()
+        # A recorded game gets its seed from the recorder, which writes it to the replay
+        seed = self.replay_recorder.record_reset() if self.replay_recorder else None
+        self.simulation.reset(seed)
+        self.update_background()
         self.paused = False
         
         # Play game start sound
         self.sound_manager.play_sound("game_start")
     
-    def spawn_fruits(self):
-        """Spawn new fruits based on current difficulty"""
-        num_fruits = self.fruit_spawner.get_spawn_count()
-        speed_multiplier = self.difficulty_manager.get_speed_multiplier()
-        
-        for _ in range(num_fruits):
-            self.fruits.append(self.fruit_factory.create_fruit(speed_multiplier))
-            # Play fruit throw sound
-            self.sound_manager.play_sound("fruit_throw", 0.3)
-    
     def update_game(self):
-        """Update game state for the current frame"""
+        """Advance gameplay by one simulation tick and react to its events"""
         # Don't update if paused
         if self.paused:
             return
-            
-        # Check if we should spawn new fruits
-        if self.fruit_spawner.update():
-            self.spawn_fruits()
         
-        # Update fruits
-        for fruit in self.fruits[:]:
-            fruit.update()
-            
-            # Check if fruit fell off screen without being sliced
-            if fruit.is_removable():
-                if not fruit.is_sliced():
-                    self.lives_manager.lose_life()
-                    # Play lose life sound
-                    self.sound_manager.play_sound("lose_life")
-                    if not self.lives_manager.has_lives():
-                        self.game_state.set_game_over()
-                        # Play game over sound
-                        self.sound_manager.play_sound("game_over")
-                        
-                        # Check if this is a high score
-                        final_score = self.score_manager.get_score()
-                        if self.high_score_manager.is_high_score(final_score):
-                            # Add to high scores
-                            self.high_score_manager.add_score(final_score)
-                            # Play high score sound
-                            self.sound_manager.play_sound("new_high_score")
-                self.fruits.remove(fruit)
-        
-        # Check for slicing
-        if self.input_handler.is_slicing():
-            slice_points = self.input_handler.get_slice_points()
-            if len(slice_points) > 1:
-                sliced_any = False
-                for fruit in self.fruits:
-                    if fruit.check_slice(slice_points):
-                        sliced_any = True
-                        self.score_manager.add_score(10)
-                        fruits_sliced = self.score_manager.get_fruits_sliced()
-                        self.difficulty_manager.increase_difficulty(fruits_sliced)
-                        
-                        # Check if we should change background based on score
-                        self.check_background_change()
+        self.input_handler.update()
+        slice_points = self.input_handler.get_slice_points() if self.input_handler.is_slicing() else None
+        for event in self.simulation.step(slice_points):
+            if event == "fruit_throw":
+                self.sound_manager.play_sound("fruit_throw", 0.3)
+            elif event == "lose_life":
+                self.sound_manager.play_sound("lose_life")
+            elif event == "game_over":
+                self.sound_manager.play_sound("game_over")
                 
-                # Play slice sound if any fruit was sliced
-                if sliced_any:
-                    self.sound_manager.play_sound("fruit_slice")
+                # Store the run if it is a high score, or every run when the backend keeps the history
+                final_score = self.simulation.score_manager.get_score()
+                is_high_score = self.high_score_manager.is_high_score(final_score)
+                if is_high_score or self.high_score_manager.keeps_history():
+                    self.high_score_manager.add_score(final_score)
+                if is_high_score:
+                    # Play high score sound
+                    self.sound_manager.play_sound("new_high_score")
+            elif event == "fruit_slice":
+                self.sound_manager.play_sound("fruit_slice")
+            elif event == "level_up":
+                self.update_background()
+                # Play sound for background change
+                self.sound_manager.play_sound("new_background")
     
-    def check_background_change(self):
-        """Check if we should change the background based on score"""
-        score = self.score_manager.get_score()
-        
-        # Change background based on score thresholds
-        if score < 200:
-            new_bg_index = 0  # Background1
-        elif score < 500:
-            new_bg_index = 1  # Background2
-        elif score < 1000:
-            new_bg_index = 2  # Background3
-        elif score < 1500:
-            new_bg_index = 3  # Background4
-        elif score < 2000:
-            new_bg_index = 4  # Background5
-        elif score < 2500:
-            new_bg_index = 5  # Background6
-        elif score < 3000:
-            new_bg_index = 6  # Background7
-        else:
-            new_bg_index = 7  # Background8
-        
-        # Increase speed significantly after level 2
-        if new_bg_index >= 2 and self.difficulty_manager.get_speed_multiplier() < 2.0:
-            self.difficulty_manager.speed_multiplier = 2.0
-        
-        if new_bg_index != self.current_bg_index and new_bg_index < len(self.game_backgrounds):
-            self.current_bg_index = new_bg_index
-            self.background = self.game_backgrounds[self.current_bg_index]
-            # Play sound for background change
-            self.sound_manager.play_sound("new_background")
+    def update_background(self):
+        """Show the gameplay background of the current level"""
+        self.background = self.backgrounds.get(self.backgrounds.get_gameplay_key(self.simulation.level))
+    
+    def invalidate_display(self):
+        """Redraw the whole screen next frame instead of only the changed rects"""
+        if self.dirty_rects:
+            self.dirty_rects.invalidate()
     
     def render_game(self):
         """Render the current game state"""
-        # Draw background
-        if self.background:
+        dirty_rects = self.dirty_rects
+        
+        # Draw background, or with dirty rects only restore it where last frame drew
+        if dirty_rects:
+            dirty_rects.begin_frame(self.screen, self.background)
+        elif self.background:
             self.screen.blit(self.background, (0, 0))
+            counters.blits += 1
         else:
             self.screen.fill(GameConstants.BLACK)
         
-        # Draw fruits
-        for fruit in self.fruits:
-            fruit.render(self.screen)
+        # Draw fruits between the last two simulation states, unless the simulation is stopped
+        alpha = self.interpolation_alpha if self.is_simulating() else 1.0
+        for fruit in self.simulation.fruits:
+            rects = fruit.render(self.screen, alpha)
+            if dirty_rects:
+                dirty_rects.extend(rects)
         
         # Draw slice line
         if self.input_handler.is_slicing():
@@ -366,40 +400,52 @@ class Game:
             if len(slice_points) > 1:
                 # Draw a thinner line with a subtle glow effect
                 # First draw a narrower, semi-transparent line for the glow
-                pygame.draw.lines(self.screen, (255, 255, 255, 80), False, slice_points, 4)
+                glow_rect = pygame.draw.lines(self.screen, (255, 255, 255, 80), False, slice_points, 4)
                 # Then draw the main line on top
                 pygame.draw.lines(self.screen, GameConstants.WHITE, False, slice_points, 2)
+                if dirty_rects:
+                    dirty_rects.add(glow_rect)
         
         # Draw UI
-        self.ui_renderer.render_ui(
+        hud_rects = self.ui_renderer.render_ui(
             self.screen,
-            self.score_manager.get_score(),
-            self.lives_manager.get_lives(),
-            self.difficulty_manager.get_speed_multiplier(),
-            self.game_state,
-            self.current_bg_index + 1  # Display current background number (1-based)
+            self.simulation.score_manager.get_score(),
+            self.simulation.lives_manager.get_lives(),
+            self.simulation.difficulty_manager.get_speed_multiplier(),
+            self.simulation.game_state,
+            self.simulation.level + 1  # Display current level number (1-based)
         )
         
         # Draw play/pause button
-        self.render_play_pause_button()
+        button_rect = self.render_play_pause_button()
         
         # Draw custom cursor
-        self.render_custom_cursor()
+        cursor_rect = self.render_custom_cursor()
+        
+        if dirty_rects:
+            dirty_rects.extend(hud_rects)
+            dirty_rects.add(button_rect)
+            dirty_rects.add(cursor_rect)
     
     def render_custom_cursor(self):
-        """Render the custom sword cursor"""
+        """Render the custom sword cursor and return the rect drawn to, if any"""
         if hasattr(self, 'use_custom_cursor') and self.use_custom_cursor and hasattr(self, 'cursor_img'):
             mouse_pos = pygame.mouse.get_pos()
             # Position cursor so the hotspot is at the mouse position
             cursor_pos = (mouse_pos[0] - self.cursor_hotspot[0], mouse_pos[1] - self.cursor_hotspot[1])
-            self.screen.blit(self.cursor_img, cursor_pos)
+            counters.blits += 1
+            return self.screen.blit(self.cursor_img, cursor_pos)
+        return None
     
     def render_play_pause_button(self):
-        """Render the play/pause button"""
+        """Render the play/pause button and return the rect drawn to, if any"""
         if self.paused and self.resume_button_img:
-            self.screen.blit(self.resume_button_img, self.resume_button_rect)
+            counters.blits += 1
+            return self.screen.blit(self.resume_button_img, self.resume_button_rect)
         elif not self.paused and self.pause_button_img:
-            self.screen.blit(self.pause_button_img, self.pause_button_rect)
+            counters.blits += 1
+            return self.screen.blit(self.pause_button_img, self.pause_button_rect)
+        return None
     
     def toggle_pause(self):
         """Toggle game pause state"""
@@ -418,14 +464,22 @@ class Game:
             if event.type == pygame.QUIT:
                 return False
             
+            # Toggle the performance overlay on any screen
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.perf_overlay.toggle()
+            
             # Handle window resize
             elif event.type == pygame.VIDEORESIZE:
-                self.handle_resize(event.w, event.h)
+                self.request_resize(event.w, event.h)
+            
+            # The window contents were lost (uncovered, restored), so push the whole screen again
+            elif event.type == pygame.VIDEOEXPOSE:
+                self.invalidate_display()
             
             # Handle mouse clicks for pause/resume button
             elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 mouse_pos = pygame.mouse.get_pos()
-                if self.current_screen == "GAME" and not self.game_state.is_game_over():
+                if self.current_screen == "GAME" and not self.simulation.game_state.is_game_over():
                     if self.paused and self.resume_button_rect.collidepoint(mouse_pos):
                         self.toggle_pause()
                     elif not self.paused and self.pause_button_rect.collidepoint(mouse_pos):
@@ -451,7 +505,7 @@ class Game:
                     self.sound_manager.play_sound("button_click")
                     
             elif self.current_screen == "GAME":
-                result = self.input_handler.handle_event(event, self.game_state)
+                result = self.input_handler.handle_event(event, self.simulation.game_state)
                 if result == "RESET":
                     self.reset()
                     # Play button sound
@@ -462,44 +516,114 @@ class Game:
                     self.sound_manager.play_sound("main_menu_exit")
                 elif result == "PAUSE":
                     self.toggle_pause()
-                    
+        
+        self.apply_pending_resize()
         return True
     
+    def is_simulating(self):
+        """Check if gameplay is currently advancing"""
+        return self.current_screen == "GAME" and not self.simulation.game_state.is_game_over() and not self.paused
+    
     def update(self):
-        """Update the current screen"""
+        """Advance the current screen by one simulation tick"""
         if self.current_screen == "HOME":
             self.home_screen.update()
         elif self.current_screen == "ABOUT":
             self.about_screen.update()
-        elif self.current_screen == "GAME" and not self.game_state.is_game_over():
+        elif self.current_screen == "GAME" and not self.simulation.game_state.is_game_over():
             self.update_game()
     
     def render(self):
         """Render the current screen"""
         if self.current_screen == "HOME":
-            self.home_screen.draw()
-            self.render_custom_cursor()  # Draw cursor on home screen too
+            self.render_menu(self.home_screen)
         elif self.current_screen == "ABOUT":
-            self.about_screen.draw()
-            self.render_custom_cursor()  # Draw cursor on about screen too
+            self.render_menu(self.about_screen)
         elif self.current_screen == "GAME":
             self.render_game()
     
+    def render_menu(self, menu_screen):
+        """Render a menu screen: its cached static layer, its widgets and the cursor"""
+        # Pick up the home background once it has been rescaled after a resize
+        menu_screen.set_background(self.backgrounds.get(BackgroundLibrary.HOME))
+        
+        if self.dirty_rects:
+            # Only the widgets and cursor need restoring from the static layer
+            self.dirty_rects.begin_frame(self.screen, menu_screen.get_static_layer())
+            self.dirty_rects.extend(menu_screen.draw_widgets())
+            self.dirty_rects.add(self.render_custom_cursor())  # Draw cursor on menu screens too
+        else:
+            menu_screen.draw()
+            self.render_custom_cursor()  # Draw cursor on menu screens too
+    
+    def present(self):
+        """Push the rendered frame to the display"""
+        if self.dirty_rects:
+            self.dirty_rects.present(self.screen)
+        else:
+            pygame.display.flip()
+    
     def run(self):
         """Main game loop"""
         running = True
+        accumulator = 0.0
+        previous_time = time.perf_counter()
+        overlay = self.perf_overlay
         while running:
+            # Phases are only timed while the overlay is shown
+            profiling = overlay.enabled
+            if profiling:
+                phase_start = overlay.begin_frame()
+            
             # Handle events
             running = self.handle_events()
+            if profiling:
+                phase_start = overlay.lap("handle_events", phase_start)
+            
+            # Run as many fixed simulation ticks as real time has passed
+            current_time = time.perf_counter()
+            accumulator += current_time - previous_time
+            previous_time = current_time
             
-            # Update current screen
-            self.update()
+            steps = 0
+            while accumulator >= self.simulation.dt and steps < GameConstants.MAX_SIM_STEPS_PER_FRAME:
+                self.update()
+                accumulator -= self.simulation.dt
+                steps += 1
             
-            # Render current screen
+            # Drop time we can't catch up on rather than falling further behind
+            if steps == GameConstants.MAX_SIM_STEPS_PER_FRAME:
+                accumulator = min(accumulator, self.simulation.dt)
+            if profiling:
+                phase_start = overlay.lap("update", phase_start)
+            
+            # Render current screen between the last two ticks
+            self.interpolation_alpha = accumulator / self.simulation.dt
             self.render()
             
-            pygame.display.flip()
+            # Draw the overlay on top, leaving its own cost out of the timings and counters
+            if profiling and overlay.enabled:
+                overlay.lap("render", phase_start)
+                overlay.end_frame(len(self.simulation.fruits))
+                overlay_rect = overlay.draw(self.screen)
+                if self.dirty_rects:
+                    self.dirty_rects.add(overlay_rect)
+                phase_start = time.perf_counter()
+            
+            self.present()
+            if profiling and overlay.enabled:
+                overlay.lap("flip", phase_start)
+            if self.startup_time is None:
+                self.startup_time = time.perf_counter() - self.init_start
+                print(f"First interactive frame {self.startup_time * 1000:.0f} ms after startup")
             self.clock.tick(GameConstants.FPS)
             
+        if GameConstants.PERF_SUMMARY_FILE:
+            overlay.save_summary(GameConstants.PERF_SUMMARY_FILE)
+        if self.replay_recorder:
+            self.replay_recorder.save(GameConstants.REPLAY_RECORD_FILE)
+        self.backgrounds.shutdown()
+        self.high_score_manager.close()
+        
         # Clean up
         pygame.quit()
@@ -1,39 +1,150 @@
 """
 High score management for the game
 """
-import json
-import os
+import threading
 import time
 from datetime import datetime
+from .constants import GameConstants
+from .score_backends import MAX_HIGH_SCORES, JsonScoreBackend, entry_key, merge_scores
+
+class ScoreWriter:
+    """
+    Background thread persisting new scores for a HighScoreManager
+
+    New entries are queued and written in batches: the writer waits
+    SCORE_WRITE_BATCH_SECONDS after the first one, so scores added together
+    cost one write and one fsync. The backend merges them with the scores
+    other game instances stored meanwhile; the JSON backend does so under a
+    lock file, writing a temporary file, fsyncing it and renaming it over the
+    scores file, so a crash mid-write leaves the old file intact.
+    """
+    def __init__(self, manager):
+        self.manager = manager
+        self.pending = []  # Entries not yet on disk
+        self.condition = threading.Condition()
+        self.flushing = False
+        self.closed = False
+        self.writes = 0
+        self.failures = 0  # Failed write attempts, retried until they succeed
+        self.thread = threading.Thread(target=self.run, name="score-writer", daemon=True)
+        self.thread.start()
+
+    def submit(self, entry):
+        """Queue an entry to be written (never blocks on disk)"""
+        with self.condition:
+            self.pending.append(entry)
+            self.condition.notify_all()
+
+    def flush(self, timeout=GameConstants.SCORE_LOCK_TIMEOUT):
+        """
+        Block until every queued entry is on disk; True if that happened within timeout
+        Returns False as soon as a write attempt fails, rather than waiting out the retries
+        """
+        with self.condition:
+            self.flushing = True
+            self.condition.notify_all()
+            failures = self.failures
+            self.condition.wait_for(lambda: not self.pending or self.failures != failures, timeout)
+            self.flushing = False
+            return not self.pending
+
+    def close(self, timeout=GameConstants.SCORE_LOCK_TIMEOUT):
+        """Write what is queued and stop the thread"""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        self.thread.join(timeout)
+
+    def run(self):
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.pending or self.closed)
+                if not self.pending:
+                    return  # Closed with nothing left to write
+                # Gather the entries added shortly after the first into the same write
+                deadline = time.monotonic() + GameConstants.SCORE_WRITE_BATCH_SECONDS
+                while not (self.flushing or self.closed):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.condition.wait(remaining)
+                batch = list(self.pending)
+
+            merged = self.write(batch)
+
+            with self.condition:
+                if merged is not None:
+                    del self.pending[:len(batch)]
+                    self.writes += 1
+                else:
+                    self.failures += 1
+                self.condition.notify_all()
+            if merged is not None:
+                self.manager.set_merged_scores(merged)
+            elif self.closed:
+                return  # Give up rather than hold up exiting the game
+            else:
+                time.sleep(GameConstants.SCORE_WRITE_BATCH_SECONDS)  # Retry later
+
+    def write(self, batch):
+        """Store a batch through the manager's backend; returns the new top scores, or None on failure"""
+        try:
+            return self.manager.backend.write(batch)
+        except Exception as e:
+            print(f"Error saving high scores: {e}")
+            return None
 
 class HighScoreManager:
-    """Manages high scores for the game"""
+    """
+    Manages high scores for the game
     
-    def __init__(self, scores_file="fruit_ninja_scores.json"):
-        self.scores_file = scores_file
+    Scores are kept in memory and written to disk by a ScoreWriter thread, so
+    adding one never blocks the frame on disk. Storage is a ScoreBackend, the
+    JSON top-10 file unless another is given.
+    """
+    
+    def __init__(self, scores_file=GameConstants.SCORES_FILE, backend=None):
+        self.backend = backend or JsonScoreBackend(scores_file)
+        self.lock = threading.Lock()  # Guards high_scores and revision against the writer thread
         self.high_scores = self.load_scores()
+        self.revision = 0  # Incremented whenever the high scores change, so views know to redraw
+        self.writer = None  # Started on the first new score
         
     def load_scores(self):
         """Load high scores from file"""
         try:
-            if os.path.exists(self.scores_file):
-                with open(self.scores_file, 'r') as f:
-                    return json.load(f)
-            else:
-                return []
+            return self.backend.load()
         except Exception as e:
             print(f"Error loading high scores: {e}")
             return []
             
-    def save_scores(self):
-        """Save high scores to file"""
-        try:
-            with open(self.scores_file, 'w') as f:
-                json.dump(self.high_scores, f, indent=4)
-            return True
-        except Exception as e:
-            print(f"Error saving high scores: {e}")
-            return False
+    def save_scores(self, entry=None):
+        """Queue a new entry to be merged into the scores file in the background"""
+        if entry is None:
+            return
+        if self.writer is None:
+            self.writer = ScoreWriter(self)
+        self.writer.submit(entry)
+        
+    def set_merged_scores(self, scores):
+        """Take in the scores just written, which include other game instances' scores (writer thread)"""
+        with self.lock:
+            # Scores added since the batch was taken aren't on disk yet, so merge rather than replace
+            merged = merge_scores(self.high_scores, scores)
+            if [entry_key(entry) for entry in merged] != [entry_key(entry) for entry in self.high_scores]:
+                self.high_scores = merged
+                self.revision += 1
+        
+    def flush(self, timeout=GameConstants.SCORE_LOCK_TIMEOUT):
+        """Wait until every added score is on disk; False if that didn't happen (see ScoreWriter.flush)"""
+        return self.writer.flush(timeout) if self.writer else True
+        
+    def close(self):
+        """Write any queued scores, stop the writer thread and close the backend"""
+        if self.writer:
+            self.writer.close()
+            self.writer = None
+        self.backend.close()
             
     def add_score(self, score, player_name="Player"):
         """Add a new high score"""
@@ -43,16 +154,13 @@ class HighScoreManager:
             "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         }
         
-        # Add to list and sort
-        self.high_scores.append(new_entry)
-        self.high_scores.sort(key=lambda x: x["score"], reverse=True)
-        
-        # Keep only top 10 scores
-        if len(self.high_scores) > 10:
-            self.high_scores = self.high_scores[:10]
+        # Add to list and sort, keeping only the top MAX_HIGH_SCORES
+        with self.lock:
+            self.high_scores = merge_scores(self.high_scores, [new_entry])
+            self.revision += 1
             
-        # Save to file
-        self.save_scores()
+        # Save to file in the background
+        self.save_scores(new_entry)
         
         # Return position in high scores (1-based)
         return self.get_score_position(score)
@@ -62,14 +170,22 @@ class HighScoreManager:
         for i, entry in enumerate(self.high_scores):
             if score >= entry["score"]:
                 return i + 1
-        return len(self.high_scores) + 1 if len(self.high_scores) < 10 else 0
+        return len(self.high_scores) + 1 if len(self.high_scores) < MAX_HIGH_SCORES else 0
+        
+    def keeps_history(self):
+        """Check if the backend stores every finished run, so all of them should be added"""
+        return self.backend.keeps_history
         
     def is_high_score(self, score):
         """Check if a score qualifies as a high score"""
-        if len(self.high_scores) < 10:
+        if len(self.high_scores) < MAX_HIGH_SCORES:
             return True
         return score > self.high_scores[-1]["score"]
         
     def get_high_scores(self):
         """Get the list of high scores"""
         return self.high_scores
+        
+    def get_rank(self, score):
+        """Rank of a score among every stored score (1-based), including scores beyond the top list"""
+        return self.backend.get_rank(score)
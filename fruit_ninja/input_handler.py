@@ -3,21 +3,64 @@ Input handling for the game
 """
 import pygame
 from pygame.locals import *
+from .slice_trail import SliceTrail
 
 class InputHandler:
     """Handles user input"""
+    # High-rate events nothing in the game reads, kept out of the event queue
+    BLOCKED_EVENTS = (
+        KEYUP, TEXTINPUT, TEXTEDITING, MOUSEWHEEL,
+        JOYAXISMOTION, JOYBALLMOTION, JOYHATMOTION, JOYBUTTONDOWN, JOYBUTTONUP,
+        CONTROLLERAXISMOTION, CONTROLLERBUTTONDOWN, CONTROLLERBUTTONUP,
+        FINGERMOTION, FINGERDOWN, FINGERUP, MULTIGESTURE
+    )
+    
     def __init__(self):
         self.slicing = False
-        self.slice_points = []
-        self.max_slice_points = 15  # Reduced from 25 for faster disappearance
+        self.trail = SliceTrail()
+        self.recorder = None  # ReplayRecorder that logs every change to the trail, if recording
+    
+    @classmethod
+    def install_event_filter(cls):
+        """Block the event types the game never handles (after pygame.init)"""
+        pygame.event.set_blocked(list(cls.BLOCKED_EVENTS))
     
     def is_slicing(self):
         """Check if the player is currently slicing"""
-        return self.slicing and len(self.slice_points) > 0
+        return self.slicing and len(self.trail) > 0
     
     def get_slice_points(self):
-        """Get the current slice path points"""
-        return self.slice_points
+        """Get the current slice path points, oldest first (a view that changes as input arrives)"""
+        return self.trail.get_points()
+    
+    def update(self, now=None):
+        """Let trail samples older than SLICE_TRAIL_MAX_AGE_MS fade out, once per simulation tick"""
+        if now is None:
+            now = pygame.time.get_ticks()
+        if self.recorder:
+            self.recorder.record_tick(now)
+        self.trail.expire(now)
+    
+    def start_slice(self, x, y, timestamp):
+        """Start a new slice path at (x, y)"""
+        if self.recorder:
+            self.recorder.record_slice_start(x, y, timestamp)
+        self.slicing = True
+        self.trail.clear()
+        self.trail.add(x, y, timestamp)
+    
+    def extend_slice(self, x, y, timestamp):
+        """Add (x, y) to the slice path"""
+        if self.recorder:
+            self.recorder.record_slice_move(x, y, timestamp)
+        self.trail.add(x, y, timestamp)
+    
+    def end_slice(self):
+        """Stop slicing and drop the slice path"""
+        if self.recorder:
+            self.recorder.record_slice_end()
+        self.slicing = False
+        self.trail.clear()
     
     def handle_event(self, event, game_state):
         """
@@ -43,19 +86,14 @@ class InputHandler:
         
         elif event.type == MOUSEBUTTONDOWN:
             # Start slicing
-            self.slicing = True
-            self.slice_points = [pygame.mouse.get_pos()]
+            self.start_slice(event.pos[0], event.pos[1], pygame.time.get_ticks())
         
         elif event.type == MOUSEBUTTONUP:
             # End slicing
-            self.slicing = False
-            self.slice_points = []
+            self.end_slice()
         
         elif event.type == MOUSEMOTION and self.slicing:
-            # Add point to slice path
-            self.slice_points.append(pygame.mouse.get_pos())
-            # Keep only the last N points for performance and to create a trailing effect
-            if len(self.slice_points) > self.max_slice_points:
-                self.slice_points = self.slice_points[-self.max_slice_points:]
+            # Add the event's own position, so every motion event is a sample even when several queue up in a frame
+            self.extend_slice(event.pos[0], event.pos[1], pygame.time.get_ticks())
         
         return True
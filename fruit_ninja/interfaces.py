@@ -5,17 +5,24 @@ from abc import ABC, abstractmethod
 
 # Renderer interface
 class Renderer(ABC):
+    __slots__ = ()  # Lets slotted implementations stay free of a __dict__
+    
     @abstractmethod
-    def render(self, screen):
-        """Render the object to the screen"""
+    def render(self, screen, alpha=1.0):
+        """
+        Render the object to the screen and return the list of rects drawn to
+        alpha interpolates between the previous and current simulation state
+        """
         pass
 
 
 # GameObject interface
 class GameObject(ABC):
+    __slots__ = ()
+    
     @abstractmethod
-    def update(self):
-        """Update the object state"""
+    def update(self, world_width, world_height, time_scale=1.0):
+        """Advance the object state by one simulation tick inside a world of the given size"""
         pass
     
     @abstractmethod
@@ -26,6 +33,8 @@ class GameObject(ABC):
 
 # Sliceable interface
 class Sliceable(ABC):
+    __slots__ = ()
+    
     @abstractmethod
     def check_slice(self, slice_points):
         """Check if the object is sliced by the given slice points"""
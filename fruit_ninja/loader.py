@@ -0,0 +1,158 @@
+"""
+Parallel asset loading as a graph of tasks on a thread pool
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pygame
+
+def decode_image(path, size=None):
+    """
+    Decode an image file, optionally smoothscaled to size
+    Safe on worker threads: the result isn't converted to the display format yet
+    """
+    image = pygame.image.load(path)
+    if size:
+        image = scale_image(image, size)
+    return image
+
+def scale_image(image, size):
+    """Smoothscale a decoded image; safe on worker threads"""
+    if image.get_bitsize() < 24:
+        # Paletted images are expanded to 32 bits, smoothscale needs 24 or 32
+        expanded = pygame.Surface(image.get_size(), pygame.SRCALPHA, 32)
+        expanded.blit(image, (0, 0))
+        image = expanded
+    return pygame.transform.smoothscale(image, size)
+
+def fit_size(image, target, by_height=False):
+    """Size that fits an image into a target x target box (or to a target height) keeping its aspect ratio"""
+    aspect_ratio = image.get_width() / image.get_height()
+    if by_height:
+        return (int(target * aspect_ratio), target)
+    if aspect_ratio > 1:
+        return (target, int(target / aspect_ratio))
+    return (int(target * aspect_ratio), target)
+
+class LoadTask:
+    """One node of the loading graph"""
+    def __init__(self, name, func, dependencies=(), main_thread=False):
+        self.name = name
+        self.func = func
+        self.dependencies = tuple(dependencies)
+        self.main_thread = main_thread  # Must run on the main thread (display conversions, wiring results)
+        self.future = None
+        self.done = False
+        self.result = None
+        self.error = None
+
+class AssetLoader:
+    """
+    Runs loading tasks on a thread pool in dependency order
+
+    Tasks receive the results of their dependencies as arguments. Worker tasks
+    decode and scale (PNG decoding and smoothscale release the GIL), while
+    main-thread tasks run inside poll() so the caller can keep drawing a
+    loading screen between them. A failed task is reported and its dependents
+    receive None in place of its result, so they can fall back as they would
+    for a missing file.
+    """
+    def __init__(self, max_workers):
+        self.tasks = {}
+        self.max_workers = max_workers
+        self.executor = None
+        self.started_at = None
+        self.finished_at = None
+
+    def add(self, name, func, dependencies=(), main_thread=False):
+        """Add a task; dependencies are names of tasks added before it"""
+        for dependency in dependencies:
+            if dependency not in self.tasks:
+                raise ValueError(f"Task {name} depends on unknown task {dependency}")
+        self.tasks[name] = LoadTask(name, func, dependencies, main_thread)
+
+    def start(self):
+        """Start running worker tasks whose dependencies are met"""
+        self.started_at = time.perf_counter()
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="asset-loader")
+        self._submit_ready()
+
+    def _is_ready(self, task):
+        return not task.done and task.future is None and all(self.tasks[name].done for name in task.dependencies)
+
+    def _arguments(self, task):
+        return [self.tasks[name].result for name in task.dependencies]
+
+    def _submit_ready(self):
+        for task in self.tasks.values():
+            if not task.main_thread and self._is_ready(task):
+                task.future = self.executor.submit(task.func, *self._arguments(task))
+
+    def _finish(self, task, result=None, error=None):
+        task.done = True
+        task.result = result
+        task.error = error
+        if error is not None:
+            print(f"Error loading {task.name}: {error}")
+
+    def poll(self, time_budget=0.008):
+        """
+        Collect finished worker tasks and run ready main-thread tasks for up to time_budget seconds
+        Returns True when every task is done
+        """
+        deadline = time.perf_counter() + time_budget
+        progressed = True
+        while progressed:
+            progressed = False
+            for task in self.tasks.values():
+                if task.future is not None and not task.done and task.future.done():
+                    error = task.future.exception()
+                    self._finish(task, None if error else task.future.result(), error)
+                    progressed = True
+
+            for task in self.tasks.values():
+                if time.perf_counter() > deadline:
+                    break
+                if task.main_thread and self._is_ready(task):
+                    try:
+                        self._finish(task, task.func(*self._arguments(task)))
+                    except Exception as e:
+                        self._finish(task, error=e)
+                    progressed = True
+
+            self._submit_ready()
+            if time.perf_counter() > deadline:
+                break
+
+        if self.is_done():
+            if self.finished_at is None:
+                self.finished_at = time.perf_counter()
+                self.executor.shutdown(wait=False)
+            return True
+        return False
+
+    def is_done(self):
+        return all(task.done for task in self.tasks.values())
+
+    def get_progress(self):
+        """Fraction of tasks done"""
+        if not self.tasks:
+            return 1.0
+        return sum(1 for task in self.tasks.values() if task.done) / len(self.tasks)
+
+    def get_result(self, name):
+        return self.tasks[name].result
+
+    def get_elapsed(self):
+        """Seconds from start() until everything was done, or until now"""
+        end = self.finished_at if self.finished_at is not None else time.perf_counter()
+        return end - self.started_at if self.started_at is not None else 0.0
+
+    def run_sequentially(self):
+        """Run every task on the calling thread in dependency order, for comparison and tests"""
+        self.started_at = time.perf_counter()
+        for task in self.tasks.values():
+            try:
+                self._finish(task, task.func(*self._arguments(task)))
+            except Exception as e:
+                self._finish(task, error=e)
+        self.finished_at = time.perf_counter()
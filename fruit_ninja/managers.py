@@ -92,17 +92,18 @@ class GameState:
 
 class FruitSpawner:
     """Manages the spawning of fruits"""
-    def __init__(self, spawn_interval=70):  # Slightly faster spawn rate
+    def __init__(self, spawn_interval=70):  # Slightly faster spawn rate, in ticks at GameConstants.BASE_TICK_RATE
         self.spawn_timer = 0
         self.spawn_interval = spawn_interval
     
-    def update(self):
-        self.spawn_timer += 1
+    def update(self, time_scale=1.0):
+        self.spawn_timer += time_scale
         should_spawn = False
         
         if self.spawn_timer >= self.spawn_interval:
             should_spawn = True
-            self.spawn_timer = 0
+            # Carry the overshoot over, so the spawn period doesn't depend on the tick rate
+            self.spawn_timer -= self.spawn_interval
             
         return should_spawn
     
@@ -0,0 +1,219 @@
+"""
+Live frame-time overlay with per-phase timings and per-frame counters
+"""
+import json
+import math
+import time
+import pygame
+from .constants import GameConstants
+
+class FrameCounters:
+    """
+    Work done in the current frame, counted at the call sites
+
+    Incrementing an int attribute is the only cost when the overlay is off,
+    so the counters are always updated and only read while it is on.
+    """
+    __slots__ = ("blits", "rotations", "text_renders")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.blits = 0
+        self.rotations = 0
+        self.text_renders = 0
+
+# Shared by everything that draws
+counters = FrameCounters()
+
+class RingBuffer:
+    """Fixed-size buffer of the most recent float samples"""
+    def __init__(self, size):
+        self.samples = [0.0] * size
+        self.size = size
+        self.index = 0  # Where the next sample goes
+        self.count = 0
+
+    def append(self, value):
+        self.samples[self.index] = value
+        self.index = (self.index + 1) % self.size
+        if self.count < self.size:
+            self.count += 1
+
+    def values(self):
+        """Samples from oldest to newest"""
+        if self.count < self.size:
+            return self.samples[:self.count]
+        return self.samples[self.index:] + self.samples[:self.index]
+
+    def percentile(self, fraction):
+        """Nearest-rank percentile of the buffered samples"""
+        if not self.count:
+            return 0.0
+        ordered = sorted(self.samples[:self.count])
+        return ordered[max(0, math.ceil(fraction * self.count) - 1)]
+
+    def mean(self):
+        return sum(self.samples[:self.count]) / self.count if self.count else 0.0
+
+    def clear(self):
+        self.index = 0
+        self.count = 0
+
+class PhaseTotals:
+    """Whole-session statistics for one phase or counter, for the exit summary"""
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def to_dict(self):
+        return {"mean": self.total / self.count if self.count else 0.0, "max": self.max}
+
+class PerfOverlay:
+    """
+    Toggleable overlay showing rolling FPS, a frame-time graph, per-phase
+    p50/p99 timings and per-frame counters
+
+    Game.run only takes timestamps while the overlay is enabled, so when it is
+    off the cost is one attribute check per phase.
+    """
+    PHASES = ("handle_events", "update", "render", "flip")
+    COUNTERS = ("fruits", "blits", "rotations", "text_renders")
+
+    GRAPH_WIDTH = 240
+    GRAPH_HEIGHT = 60
+    GRAPH_MAX_MS = 50.0  # Frame time at the top of the graph
+    PANEL_COLOR = (0, 0, 0, 170)
+
+    def __init__(self, history=GameConstants.PERF_OVERLAY_HISTORY):
+        self.enabled = False
+        self.history = history
+        self.frame_times = RingBuffer(history)
+        self.phase_times = {phase: RingBuffer(history) for phase in self.PHASES}
+        self.counter_values = {name: RingBuffer(history) for name in self.COUNTERS}
+        self.frame_start = None
+        self.font = None
+
+        # Whole-session totals, collected only while the overlay is enabled
+        self.session_frames = 0
+        self.session_seconds = 0.0
+        self.session_phases = {phase: PhaseTotals() for phase in self.PHASES + ("frame",)}
+        self.session_counters = {name: PhaseTotals() for name in self.COUNTERS}
+
+    def toggle(self):
+        """Show or hide the overlay"""
+        self.enabled = not self.enabled
+        self.frame_start = None  # Don't count the time spent hidden as a frame
+        counters.reset()
+        return self.enabled
+
+    def begin_frame(self):
+        """Start timing a frame; returns the timestamp to pass to the first lap()"""
+        now = time.perf_counter()
+        if self.frame_start is not None:
+            frame_ms = (now - self.frame_start) * 1000
+            self.frame_times.append(frame_ms)
+            self.session_phases["frame"].add(frame_ms)
+            self.session_seconds += frame_ms / 1000
+        self.frame_start = now
+        counters.reset()
+        return now
+
+    def lap(self, phase, start):
+        """Record the time since start as phase; returns the new timestamp for the next phase"""
+        now = time.perf_counter()
+        elapsed_ms = (now - start) * 1000
+        self.phase_times[phase].append(elapsed_ms)
+        self.session_phases[phase].add(elapsed_ms)
+        return now
+
+    def end_frame(self, fruits_alive):
+        """Store the counters of the frame that was just rendered"""
+        values = {
+            "fruits": fruits_alive,
+            "blits": counters.blits,
+            "rotations": counters.rotations,
+            "text_renders": counters.text_renders
+        }
+        for name, value in values.items():
+            self.counter_values[name].append(value)
+            self.session_counters[name].add(value)
+        self.session_frames += 1
+
+    def get_fps(self):
+        """Rolling FPS over the buffered frames"""
+        mean_ms = self.frame_times.mean()
+        return 1000 / mean_ms if mean_ms else 0.0
+
+    def draw(self, screen):
+        """Draw the overlay in the top-right corner and return the rect drawn to"""
+        if self.font is None:
+            self.font = pygame.font.Font(None, 18)
+
+        lines = [f"FPS {self.get_fps():6.1f}   frame p99 {self.frame_times.percentile(0.99):6.2f} ms"]
+        for phase in self.PHASES:
+            times = self.phase_times[phase]
+            lines.append(f"{phase:<13} p50 {times.percentile(0.5):6.2f}  p99 {times.percentile(0.99):6.2f} ms")
+        for name in self.COUNTERS:
+            values = self.counter_values[name]
+            current = int(values.samples[values.index - 1]) if values.count else 0
+            lines.append(f"{name:<13} {current:6d}")
+
+        line_height = self.font.get_linesize()
+        panel_width = self.GRAPH_WIDTH + 20
+        panel_height = len(lines) * line_height + self.GRAPH_HEIGHT + 30
+        panel_x = screen.get_width() - panel_width - 70  # Leave room for the pause button
+
+        panel = pygame.Surface((panel_width, panel_height), pygame.SRCALPHA)
+        panel.fill(self.PANEL_COLOR)
+
+        for i, line in enumerate(lines):
+            panel.blit(self.font.render(line, True, GameConstants.WHITE), (10, 10 + i * line_height))
+
+        # Frame-time graph, oldest on the left, with a line at the frame budget
+        graph_top = 20 + len(lines) * line_height
+        graph_rect = pygame.Rect(10, graph_top, self.GRAPH_WIDTH, self.GRAPH_HEIGHT)
+        budget_y = graph_rect.bottom - int(self.GRAPH_HEIGHT * min(1.0, (1000 / GameConstants.FPS) / self.GRAPH_MAX_MS))
+        pygame.draw.line(panel, GameConstants.GREEN, (graph_rect.left, budget_y), (graph_rect.right, budget_y))
+
+        frame_times = self.frame_times.values()[-self.GRAPH_WIDTH:]
+        if len(frame_times) > 1:
+            step = self.GRAPH_WIDTH / (min(self.history, self.GRAPH_WIDTH) - 1)
+            points = [(graph_rect.left + i * step,
+                       graph_rect.bottom - self.GRAPH_HEIGHT * min(1.0, frame_ms / self.GRAPH_MAX_MS))
+                      for i, frame_ms in enumerate(frame_times)]
+            pygame.draw.lines(panel, GameConstants.YELLOW, False, points)
+
+        return screen.blit(panel, (panel_x, 10))
+
+    def get_summary(self):
+        """Whole-session summary plus percentiles of the most recent frames"""
+        return {
+            "frames": self.session_frames,
+            "seconds": self.session_seconds,
+            "mean_fps": self.session_frames / self.session_seconds if self.session_seconds else 0.0,
+            "phases_ms": {phase: totals.to_dict() for phase, totals in self.session_phases.items()},
+            "counters_per_frame": {name: totals.to_dict() for name, totals in self.session_counters.items()},
+            "recent_ms": {
+                phase: {"p50": times.percentile(0.5), "p99": times.percentile(0.99)}
+                for phase, times in list(self.phase_times.items()) + [("frame", self.frame_times)]
+            }
+        }
+
+    def save_summary(self, path):
+        """Write the session summary as JSON if any frames were profiled"""
+        if not self.session_frames:
+            return
+        try:
+            with open(path, 'w') as f:
+                json.dump(self.get_summary(), f, indent=2)
+        except Exception as e:
+            print(f"Error saving performance summary: {e}")
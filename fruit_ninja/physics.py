@@ -0,0 +1,260 @@
+"""
+Vectorized struct-of-arrays physics backend for fruits
+"""
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, fruits fall back to per-object updates
+    np = None
+
+
+def is_available():
+    """Check if the NumPy physics backend can be used"""
+    return np is not None
+
+
+class PhysicsField:
+    """
+    Descriptor for a piece of fruit physics state
+    Reads and writes go to the fruit's own storage until it is added to a
+    FruitPhysics engine, after which they go to the engine's arrays, and to
+    the DetachedState it leaves them in once removed. The own storage is the
+    class's __slots__ entry of the same name when it has one, otherwise the
+    instance __dict__
+    """
+    def __init__(self, name, column, flag=False, slot=None):
+        self.name = name
+        self.column = column
+        self.flag = flag
+        # Accessors of the __slots__ entry this field replaced, None to use the __dict__
+        self.slot_get = slot.__get__ if slot is not None else None
+        self.slot_set = slot.__set__ if slot is not None else None
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        engine = obj._physics
+        if engine is None:
+            # load() inlined, this runs for every field access of a fruit outside an engine
+            if self.slot_get is not None:
+                return self.slot_get(obj)
+            return obj.__dict__[self.name]
+        if self.flag:
+            return bool(engine.flags[self.column, obj._slot])
+        return float(engine.state[self.column, obj._slot])
+
+    def __set__(self, obj, value):
+        engine = obj._physics
+        if engine is None:
+            if self.slot_set is not None:
+                self.slot_set(obj, value)
+            else:
+                obj.__dict__[self.name] = value
+        elif self.flag:
+            engine.flags[self.column, obj._slot] = value
+        else:
+            engine.state[self.column, obj._slot] = value
+
+    def load(self, obj):
+        """Read the value kept on the object itself"""
+        if self.slot_get is not None:
+            return self.slot_get(obj)
+        return obj.__dict__[self.name]
+
+    def store(self, obj, value):
+        """Write the value kept on the object itself"""
+        if self.slot_set is not None:
+            self.slot_set(obj, value)
+        else:
+            obj.__dict__[self.name] = value
+
+
+def physics_fields(cls):
+    """
+    Class decorator that routes every FruitPhysics field of a fruit class through a PhysicsField
+    A class with __slots__ must list the fields and _physics and _slot in them, and set
+    _physics and _slot to None before using any field
+    """
+    slots = getattr(cls, "__slots__", ())
+    fields = []
+    for column, name in enumerate(FruitPhysics.FIELDS):
+        fields.append(PhysicsField(name, column, slot=cls.__dict__[name] if name in slots else None))
+    flags = []
+    for column, name in enumerate(FruitPhysics.FLAGS):
+        flags.append(PhysicsField(name, column, flag=True, slot=cls.__dict__[name] if name in slots else None))
+    for field in fields + flags:
+        setattr(cls, field.name, field)
+    cls._physics_fields = (tuple(fields), tuple(flags))
+    if "_physics" not in slots:
+        cls._physics = None  # FruitPhysics or DetachedState holding the state, None while stored on the object
+        cls._slot = None  # Index of the fruit in the engine or DetachedState arrays
+    return cls
+
+
+class DetachedState:
+    """
+    Physics state of fruits that left a FruitPhysics engine together, one column per fruit
+    Removing fruits binds them to one of these instead of copying every field
+    back onto each object, and PhysicsField reads and writes it like an engine.
+    It is freed once none of its fruits are referenced anymore
+    """
+    __slots__ = ("state", "flags")
+
+    def __init__(self, state, flags):
+        self.state = state
+        self.flags = flags
+
+
+class FruitPhysics:
+    """Stores the physics state of all live fruits in contiguous arrays and steps them together"""
+    # Float columns of the state array
+    FIELDS = (
+        "x", "y", "vx", "vy", "radius", "gravity", "rotation", "rotation_speed",
+        "left_piece_x", "left_piece_y", "right_piece_x", "right_piece_y",
+        "left_vx", "left_vy", "right_vx", "right_vy",
+        "left_rotation", "right_rotation", "left_rotation_speed", "right_rotation_speed",
+        # State at the start of the last tick, for render interpolation
+        "prev_x", "prev_y", "prev_rotation",
+        "prev_left_piece_x", "prev_left_piece_y", "prev_left_rotation",
+        "prev_right_piece_x", "prev_right_piece_y", "prev_right_rotation"
+    )
+    PREV_START = FIELDS.index("prev_x")
+    # Columns copied into the prev_ columns at the start of every tick
+    SNAPSHOT_SOURCE = list(map(FIELDS.index, (name[len("prev_"):] for name in FIELDS[PREV_START:])))
+    # Boolean columns of the flags array
+    FLAGS = ("_sliced", "_remove")
+
+    def __init__(self, capacity=64):
+        if np is None:
+            raise RuntimeError("NumPy is required for the vectorized physics backend")
+        self.state = np.zeros((len(self.FIELDS), capacity))
+        self.flags = np.zeros((len(self.FLAGS), capacity), dtype=bool)
+        self.fruits = []  # Fruit bound to each slot, in slot order
+        self.count = 0
+
+    @classmethod
+    def column(cls, name):
+        """Get the state column index of a float field"""
+        return cls.FIELDS.index(name)
+
+    @classmethod
+    def flag_column(cls, name):
+        """Get the flags column index of a boolean field"""
+        return cls.FLAGS.index(name)
+
+    def add(self, fruit):
+        """Move a fruit's physics state into the engine"""
+        if self.count == self.state.shape[1]:
+            self._grow()
+
+        slot = self.count
+        source = fruit._physics
+        if source is not None:
+            # A fruit removed earlier, its state is still in a DetachedState
+            self.state[:, slot] = source.state[:, fruit._slot]
+            self.flags[:, slot] = source.flags[:, fruit._slot]
+        else:
+            fields, flags = fruit._physics_fields
+            self.state[:, slot] = [field.load(fruit) for field in fields]
+            self.flags[:, slot] = [field.load(fruit) for field in flags]
+
+        fruit._physics = self
+        fruit._slot = slot
+        self.fruits.append(fruit)
+        self.count += 1
+
+    def _grow(self):
+        capacity = self.state.shape[1] * 2
+        state = np.zeros((len(self.FIELDS), capacity))
+        state[:, :self.count] = self.state[:, :self.count]
+        flags = np.zeros((len(self.FLAGS), capacity), dtype=bool)
+        flags[:, :self.count] = self.flags[:, :self.count]
+        self.state = state
+        self.flags = flags
+
+    def _detach(self, fruits, slots):
+        """
+        Unbind fruits from the engine, moving their state into a DetachedState
+        so they stay usable after leaving it
+        """
+        detached = DetachedState(self.state[:, slots], self.flags[:, slots])
+        for index, fruit in enumerate(fruits):
+            fruit._physics = detached
+            fruit._slot = index
+
+    def clear(self):
+        """Remove all fruits from the engine"""
+        self._detach(self.fruits, np.arange(self.count))
+        self.fruits.clear()
+        self.count = 0
+
+    def step(self, screen_width, screen_height, time_scale=1.0):
+        """
+        Advance every live fruit by one simulation tick
+        time_scale works like in BaseFruit.update
+        Returns the fruits that left the screen and were removed, in slot order
+        """
+        n = self.count
+        if n == 0:
+            return []
+
+        # Remember where every fruit was for render interpolation
+        self.state[self.PREV_START:, :n] = self.state[self.SNAPSHOT_SOURCE, :n]
+
+        (x, y, vx, vy, radius, gravity, rotation, rotation_speed,
+         left_x, left_y, right_x, right_y,
+         left_vx, left_vy, right_vx, right_vy,
+         left_rotation, right_rotation, left_rotation_speed, right_rotation_speed) = self.state[:self.PREV_START, :n]
+        sliced, remove = self.flags[:, :n]
+        whole = ~sliced
+        if time_scale != 1.0:
+            gravity = gravity * time_scale
+
+        # Whole fruits: gravity, movement and rotation
+        np.add(vy, gravity, out=vy, where=whole)
+        np.add(x, vx * time_scale, out=x, where=whole)
+        np.add(y, vy * time_scale, out=y, where=whole)
+        np.add(rotation, rotation_speed * time_scale, out=rotation, where=whole)
+
+        # Bounce off walls with energy preservation
+        hit_left = whole & (x < radius)
+        hit_right = whole & ~hit_left & (x > screen_width - radius)
+        np.copyto(x, radius, where=hit_left)
+        np.copyto(vx, np.abs(vx) * 0.9, where=hit_left)
+        np.copyto(x, screen_width - radius, where=hit_right)
+        np.copyto(vx, -np.abs(vx) * 0.9, where=hit_right)
+
+        # Mark for removal if it falls off screen
+        remove |= whole & (y > screen_height + radius) & (vy > 0)
+
+        # Sliced fruits: both pieces fall and spin independently
+        np.add(left_vy, gravity, out=left_vy, where=sliced)
+        np.add(left_x, left_vx * time_scale, out=left_x, where=sliced)
+        np.add(left_y, left_vy * time_scale, out=left_y, where=sliced)
+        np.add(left_rotation, left_rotation_speed * time_scale, out=left_rotation, where=sliced)
+        np.add(right_vy, gravity, out=right_vy, where=sliced)
+        np.add(right_x, right_vx * time_scale, out=right_x, where=sliced)
+        np.add(right_y, right_vy * time_scale, out=right_y, where=sliced)
+        np.add(right_rotation, right_rotation_speed * time_scale, out=right_rotation, where=sliced)
+
+        # Mark for removal if both pieces fall off screen
+        remove |= sliced & (left_y > screen_height + radius) & (right_y > screen_height + radius)
+
+        removed_slots = np.flatnonzero(remove)
+        if len(removed_slots) == 0:
+            return []
+
+        fruits = self.fruits
+        removed = [fruits[slot] for slot in removed_slots.tolist()]
+        self._detach(removed, removed_slots)
+
+        # Compact the live fruits to the front in one pass, keeping their order
+        kept_slots = np.flatnonzero(~remove)
+        kept = len(kept_slots)
+        self.state[:, :kept] = self.state[:, kept_slots]
+        self.flags[:, :kept] = self.flags[:, kept_slots]
+        first = int(removed_slots[0])  # Fruits before the first removed one keep their slot
+        fruits[first:] = [fruits[slot] for slot in kept_slots[first:].tolist()]
+        for slot in range(first, kept):
+            fruits[slot]._slot = slot
+        self.count = kept
+        return removed
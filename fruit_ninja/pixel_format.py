@@ -0,0 +1,100 @@
+"""
+Load-time pixel format pass: converts each image to the display format that is cheapest to blit
+"""
+import time
+import pygame
+
+OPAQUE = "opaque"  # Every pixel fully opaque: display format without alpha, blitted as a plain copy
+COLORKEY = "colorkey"  # Pixels fully opaque or fully transparent: display format without alpha and a colorkey
+ALPHA = "alpha"  # Some pixels partly transparent: display format with per-pixel alpha, blended on every blit
+
+KEY_COLOR = (255, 0, 255)  # Colorkey for transparent pixels, unless an opaque pixel has this color
+BLIT_TIMING_REPEAT = 3  # The logged blit cost is the best of this many blits
+
+def classify_alpha(surface):
+    """OPAQUE, COLORKEY or ALPHA: how much of its alpha channel an image really uses"""
+    if not surface.get_flags() & pygame.SRCALPHA and surface.get_colorkey() is None:
+        return OPAQUE
+    pixels = surface.get_width() * surface.get_height()
+    opaque = pygame.mask.from_surface(surface, 254).count()
+    if opaque == pixels:
+        return OPAQUE
+    if pygame.mask.from_surface(surface, 0).count() == opaque:
+        return COLORKEY
+    return ALPHA
+
+def convert_keyed(surface):
+    """
+    Convert an image whose pixels are fully opaque or fully transparent to the
+    display format with the transparent ones keyed out, or None if one of its
+    opaque pixels has KEY_COLOR
+    """
+    keyed = pygame.Surface(surface.get_size()).convert()
+    keyed.fill(KEY_COLOR)
+    keyed.blit(surface, (0, 0))
+    transparent = surface.get_width() * surface.get_height() - pygame.mask.from_surface(surface, 0).count()
+    if pygame.mask.from_threshold(keyed, KEY_COLOR, (1, 1, 1, 255)).count() != transparent:
+        return None
+    keyed.set_colorkey(KEY_COLOR)
+    return keyed
+
+def enable_rle(surface):
+    """
+    Run-length encode the transparent pixels of a surface on its first blit
+    Blits then skip transparent runs instead of blending them, but reading or
+    transforming the surface has to decode it, so only use it on surfaces that
+    are only ever blitted
+    """
+    if surface.get_flags() & pygame.SRCALPHA:
+        surface.set_alpha(255, pygame.RLEACCEL)
+    elif surface.get_colorkey() is not None:
+        surface.set_colorkey(surface.get_colorkey(), pygame.RLEACCEL)
+    return surface
+
+def measure_blit(surface, repeat=BLIT_TIMING_REPEAT):
+    """Best time in milliseconds of blitting a surface onto the display format, clipped to the window size"""
+    width, height = surface.get_size()
+    display = pygame.display.get_surface()
+    if display:
+        width = min(width, display.get_width())
+        height = min(height, display.get_height())
+    target = pygame.Surface((max(1, width), max(1, height))).convert()
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        target.blit(surface, (0, 0))
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def optimize(surface, name=None, rle=False):
+    """
+    Convert an image to the cheapest display format that draws it the same (main thread)
+    The result always owns its pixels, so converting a subsurface doesn't keep
+    its parent alive. rle also run-length encodes images with transparent
+    pixels (see enable_rle). With a name, the chosen format and its blit cost
+    are logged
+    """
+    kind = classify_alpha(surface)
+    converted = None
+    if kind == OPAQUE:
+        converted = surface.convert()
+    elif kind == COLORKEY:
+        converted = convert_keyed(surface)
+        if converted is None:
+            kind = ALPHA
+    if kind == ALPHA:
+        converted = surface.convert_alpha()
+    if rle:
+        enable_rle(converted)
+
+    if name is not None:
+        log_format(converted, name, kind, rle)
+    return converted
+
+def log_format(surface, name, kind=None, rle=False):
+    """Log the format of an image, classified with classify_alpha unless kind is given, and its blit cost"""
+    if kind is None:
+        kind = classify_alpha(surface)
+    width, height = surface.get_size()
+    encoding = ", RLE" if rle and kind != OPAQUE else ""
+    print(f"{name}: {width}x{height} {kind}{encoding}, blit {measure_blit(surface):.3f} ms")
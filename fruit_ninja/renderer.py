@@ -3,6 +3,8 @@ Rendering classes for the game
 """
 import pygame
 from .constants import GameConstants
+from .perf_overlay import counters
+from .text_renderer import TextRenderer
 
 class UIRenderer:
     """Renders the game UI elements"""
@@ -15,49 +17,59 @@ class UIRenderer:
             # Fall back to SysFont if Font fails
             self.font = pygame.font.SysFont(None, 36)
             self.small_font = pygame.font.SysFont(None, 24)
+        
+        # HUD strings rarely change, so compose them from glyph atlases and cache them
+        self.text = TextRenderer(self.font)
+        self.small_text = TextRenderer(self.small_font)
     
     def render_ui(self, screen, score, lives, speed_multiplier, game_state, bg_number=1):
+        """Draw the HUD and return the list of screen rects drawn to"""
         # Get current screen dimensions
         screen_width = screen.get_width()
         screen_height = screen.get_height()
         
         # Draw score with antialiasing
-        score_text = self.font.render(f'Score: {score}', True, GameConstants.WHITE)
-        screen.blit(score_text, (10, 10))
+        score_text = self.text.render(f'Score: {score}', GameConstants.WHITE)
+        rects = [screen.blit(score_text, (10, 10))]
         
         # Draw lives as X's
-        lives_text = self.font.render('Lives: ' + 'X' * lives, True, GameConstants.WHITE)
-        screen.blit(lives_text, (10, 50))
+        lives_text = self.text.render('Lives: ' + 'X' * lives, GameConstants.WHITE)
+        rects.append(screen.blit(lives_text, (10, 50)))
         
         # Draw speed multiplier
-        speed_text = self.font.render(f'Speed: x{speed_multiplier:.2f}', True, GameConstants.WHITE)
-        screen.blit(speed_text, (10, 90))
+        speed_text = self.text.render(f'Speed: x{speed_multiplier:.2f}', GameConstants.WHITE)
+        rects.append(screen.blit(speed_text, (10, 90)))
         
         # Calculate and draw level number (based on score)
         level = bg_number  # Level corresponds to background number
-        level_text = self.small_font.render(f'Level: {level}', True, GameConstants.WHITE)
-        screen.blit(level_text, (10, 130))
+        level_text = self.small_text.render(f'Level: {level}', GameConstants.WHITE)
+        rects.append(screen.blit(level_text, (10, 130)))
+        counters.blits += 4
         
         # Draw game over message
         if game_state.is_game_over():
-            game_over_text = self.font.render('GAME OVER', True, GameConstants.RED)
-            final_score_text = self.font.render(f'Final Score: {score}', True, GameConstants.WHITE)
+            game_over_text = self.text.render('GAME OVER', GameConstants.RED)
+            final_score_text = self.text.render(f'Final Score: {score}', GameConstants.WHITE)
             
             # Center align game over text
             game_over_rect = game_over_text.get_rect(center=(screen_width // 2, screen_height // 2 - 50))
             final_score_rect = final_score_text.get_rect(center=(screen_width // 2, screen_height // 2))
             
-            screen.blit(game_over_text, game_over_rect)
-            screen.blit(final_score_text, final_score_rect)
+            rects.append(screen.blit(game_over_text, game_over_rect))
+            rects.append(screen.blit(final_score_text, final_score_rect))
+            counters.blits += 2
             
             # Only show restart message after delay
             if game_state.can_restart():
-                restart_text = self.font.render('Press R to restart', True, GameConstants.WHITE)
-                back_text = self.font.render('Press ESC for menu', True, GameConstants.WHITE)
+                restart_text = self.text.render('Press R to restart', GameConstants.WHITE)
+                back_text = self.text.render('Press ESC for menu', GameConstants.WHITE)
                 
                 # Center align instruction texts
                 restart_rect = restart_text.get_rect(center=(screen_width // 2, screen_height // 2 + 40))
                 back_rect = back_text.get_rect(center=(screen_width // 2, screen_height // 2 + 80))
                 
-                screen.blit(restart_text, restart_rect)
-                screen.blit(back_text, back_rect)
+                rects.append(screen.blit(restart_text, restart_rect))
+                rects.append(screen.blit(back_text, back_rect))
+                counters.blits += 2
+        
+        return rects
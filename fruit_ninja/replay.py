@@ -0,0 +1,320 @@
+"""
+Deterministic replays: the seed and input of every game in a session
+
+Record a session by setting FRUIT_SLICER_RECORD_REPLAY to the file to write
+on exit, then play it back headless with:
+    python -m fruit_ninja.replay session.replay [--realtime]
+"""
+import argparse
+import json
+import os
+import struct
+import time
+import zlib
+from .constants import GameConstants
+from .input_handler import InputHandler
+from .simulation import Simulation
+from .slice_trail import SliceTrail
+from . import physics
+
+MAGIC = b"FSRP"
+HEADER = struct.Struct("<4sII")  # Magic, replay version, header length in bytes
+
+# Input stream records: an op code and its fields. Times are milliseconds since the previous timed record
+OP_RESET = 1  # A new game: seed, world width, world height
+OP_RESIZE = 2  # World width, world height
+OP_SLICE_START = 3  # Time, x, y
+OP_SLICE_MOVE = 4  # Time, x, y
+OP_SLICE_END = 5
+OP_TICK = 6  # Time: one simulation step
+RECORDS = {
+    OP_RESET: struct.Struct("<BIHH"),
+    OP_RESIZE: struct.Struct("<BHH"),
+    OP_SLICE_START: struct.Struct("<BIhh"),
+    OP_SLICE_MOVE: struct.Struct("<BIhh"),
+    OP_SLICE_END: struct.Struct("<B"),
+    OP_TICK: struct.Struct("<BI")
+}
+TIMED_OPS = (OP_SLICE_START, OP_SLICE_MOVE, OP_TICK)
+
+
+def get_result(simulation):
+    """Outcome of the simulation's current game, compared between a recording and its playback"""
+    positions = [value for fruit in simulation.fruits for value in (fruit.x, fruit.y)]
+    return {
+        "seed": simulation.seed,
+        "ticks": simulation.tick,
+        "score": simulation.score_manager.get_score(),
+        "lives": simulation.lives_manager.get_lives(),
+        "level": simulation.level,
+        "fruits": len(simulation.fruits),
+        # Exact fruit positions, which any difference in play would have changed
+        "positions_crc": zlib.crc32(struct.pack(f"<{len(positions)}d", *positions))
+    }
+
+
+def get_spawn_table_hash(path=GameConstants.SPAWN_TABLE_FILE):
+    """CRC of the spawn table file, which changes what the same seed spawns"""
+    try:
+        with open(path, "rb") as f:
+            return zlib.crc32(f.read())
+    except OSError:
+        return None
+
+
+class Replay:
+    """
+    A recorded session: a JSON header and a zlib-compressed stream of input records
+
+    The header holds everything else play depends on (simulation rate,
+    physics backend, fruit catalog, spawn table, slice trail settings) and the
+    result of every recorded game. Each record of the stream is an op code
+    byte and its fixed-size little-endian fields (see RECORDS). Times are
+    stored as deltas, so the stream is mostly small repeated values that
+    compress well.
+    """
+    def __init__(self, header, stream=b""):
+        self.header = header
+        self.stream = bytes(stream)
+
+    def save(self, path):
+        header = json.dumps(self.header).encode("utf-8")
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, GameConstants.REPLAY_VERSION, len(header)))
+            f.write(header)
+            f.write(zlib.compress(self.stream, 9))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, header_length = HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a replay")
+        if version != GameConstants.REPLAY_VERSION:
+            raise ValueError(f"{path} was recorded by replay version {version}, "
+                             f"this game plays version {GameConstants.REPLAY_VERSION}")
+        header = json.loads(data[HEADER.size:HEADER.size + header_length].decode("utf-8"))
+        return cls(header, zlib.decompress(data[HEADER.size + header_length:]))
+
+    def get_records(self):
+        """Decode the stream into (op, time, field, ...) tuples, times in milliseconds since the start"""
+        records = []
+        stream = self.stream
+        offset = 0
+        now = 0
+        while offset < len(stream):
+            record = RECORDS[stream[offset]].unpack_from(stream, offset)
+            offset += RECORDS[record[0]].size
+            if record[0] in TIMED_OPS:
+                now += record[1]
+                record = (record[0], now) + record[2:]
+            records.append(record)
+        return records
+
+    def get_tick_count(self):
+        return sum(result["ticks"] for result in self.header["results"])
+
+
+class ReplayRecorder:
+    """
+    Records a session for Replay as it is played
+
+    The game calls record_reset() to pick the seed of each new game; the
+    input handler reports every change to the slice trail and every
+    simulation tick with the pygame time it used. Together with the seed,
+    that is all the simulation reads, so playing the records back reproduces
+    each game exactly, whatever the frame rate was.
+    """
+    def __init__(self, simulation):
+        self.simulation = simulation
+        self.stream = bytearray()
+        self.last_time = None
+        self.results = []
+        self.header = {
+            "sim_hz": simulation.sim_hz,
+            "physics_backend": simulation.get_physics_backend(),
+            "fruit_names": list(simulation.fruit_factory.fruit_names),
+            "spawn_table_crc": get_spawn_table_hash(),
+            "trail_capacity": GameConstants.SLICE_TRAIL_CAPACITY,
+            "trail_max_age": GameConstants.SLICE_TRAIL_MAX_AGE_MS,
+            "recorded": time.strftime("%Y-%m-%d %H:%M:%S")
+        }
+
+    def _write(self, op, *fields):
+        self.stream += RECORDS[op].pack(op, *fields)
+
+    def _write_timed(self, op, timestamp, *fields):
+        delta = 0 if self.last_time is None else timestamp - self.last_time
+        self.last_time = timestamp
+        self._write(op, delta, *fields)
+
+    def record_reset(self):
+        """Finish the current game and start a new one; returns the seed to reset the simulation with"""
+        if self.results:
+            self.results[-1] = get_result(self.simulation)
+        seed = self.simulation.reseed()
+        self._write(OP_RESET, seed, self.simulation.world_width, self.simulation.world_height)
+        self.results.append(None)
+        return seed
+
+    def record_resize(self, world_width, world_height):
+        self._write(OP_RESIZE, world_width, world_height)
+
+    def record_slice_start(self, x, y, timestamp):
+        self._write_timed(OP_SLICE_START, timestamp, x, y)
+
+    def record_slice_move(self, x, y, timestamp):
+        self._write_timed(OP_SLICE_MOVE, timestamp, x, y)
+
+    def record_slice_end(self):
+        self._write(OP_SLICE_END)
+
+    def record_tick(self, now):
+        self._write_timed(OP_TICK, now)
+
+    def get_replay(self):
+        """The session so far, with the result of the game in progress"""
+        results = list(self.results)
+        if results:
+            results[-1] = get_result(self.simulation)
+        return Replay(dict(self.header, results=results), self.stream)
+
+    def save(self, path):
+        try:
+            replay = self.get_replay()
+            replay.save(path)
+            print(f"Saved replay of {len(replay.header['results'])} games, {replay.get_tick_count()} ticks, "
+                  f"to {path} ({os.path.getsize(path)} bytes)")
+        except Exception as e:
+            print(f"Error saving replay {path}: {e}")
+
+
+class ReplayPlayer:
+    """
+    Plays a Replay back into a headless Simulation
+
+    Records are applied to an InputHandler and the simulation in order, each
+    tick record stepping the simulation with the slice trail as it was at that
+    tick. Nothing reads the clock, so playback gives the same games at any
+    speed: step() as fast as the caller likes, or run(realtime=True) to keep
+    to the recorded timing.
+    """
+    def __init__(self, replay, sprite_manager=None):
+        self.replay = replay
+        self.records = replay.get_records()
+        header = replay.header
+        for warning in self.check_environment():
+            print(f"Replay warning: {warning}")
+
+        self.simulation = Simulation(sim_hz=header["sim_hz"], sprite_manager=sprite_manager,
+                                     physics_backend=header["physics_backend"])
+        self.input_handler = InputHandler()
+        self.input_handler.trail = SliceTrail(header["trail_capacity"], header["trail_max_age"])
+        self.results = []
+        self.position = 0
+        self.time = 0  # Milliseconds since the start of the replay of the last applied record
+
+    def check_environment(self):
+        """Differences between this build and the one the replay was recorded with that change play"""
+        header = self.replay.header
+        fruit_names = [name for name in GameConstants.FRUIT_IMAGES if name not in GameConstants.SKIPPED_FRUITS]
+        warnings = []
+        if header["physics_backend"] == "numpy" and not physics.is_available():
+            warnings.append("recorded with the numpy physics backend, which isn't available")
+        if header["fruit_names"] != fruit_names:
+            warnings.append("the fruit catalog changed since recording")
+        if header["spawn_table_crc"] != get_spawn_table_hash():
+            warnings.append("the spawn table changed since recording")
+        return warnings
+
+    def is_finished(self):
+        return self.position >= len(self.records)
+
+    def step(self):
+        """Apply records up to and including the next tick; returns the tick's events, None at the end"""
+        simulation = self.simulation
+        input_handler = self.input_handler
+        records = self.records
+        while self.position < len(records):
+            record = records[self.position]
+            self.position += 1
+            op = record[0]
+            if op == OP_TICK:
+                self.time = record[1]
+                input_handler.update(record[1])
+                slice_points = input_handler.get_slice_points() if input_handler.is_slicing() else None
+                return simulation.step(slice_points)
+            elif op == OP_SLICE_MOVE:
+                self.time = record[1]
+                if input_handler.slicing:
+                    input_handler.extend_slice(record[2], record[3], record[1])
+            elif op == OP_SLICE_START:
+                self.time = record[1]
+                input_handler.start_slice(record[2], record[3], record[1])
+            elif op == OP_SLICE_END:
+                input_handler.end_slice()
+            elif op == OP_RESIZE:
+                simulation.set_world_size(record[1], record[2])
+            elif op == OP_RESET:
+                if self.results:
+                    self.results[-1] = get_result(simulation)
+                simulation.set_world_size(record[2], record[3])
+                simulation.reset(record[1])
+                self.results.append(None)
+        if self.results:
+            self.results[-1] = get_result(simulation)
+        return None
+
+    def run(self, realtime=False):
+        """Play every remaining record, at the recorded pace if realtime; returns the game results"""
+        start_wall = time.perf_counter()
+        start_time = self.time
+        while self.step() is not None:
+            if realtime:
+                delay = (self.time - start_time) / 1000 - (time.perf_counter() - start_wall)
+                if delay > 0:
+                    time.sleep(delay)
+        return self.results
+
+    def get_mismatches(self):
+        """(game index, recorded result, played result) of every game that played out differently"""
+        recorded = self.replay.header["results"]
+        mismatches = [(index, expected, played) for index, (expected, played)
+                      in enumerate(zip(recorded, self.results)) if expected != played]
+        if len(recorded) != len(self.results):
+            mismatches.append((min(len(recorded), len(self.results)), len(recorded), len(self.results)))
+        return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play a recorded session back headless and check it matches")
+    parser.add_argument("replay", help="replay file recorded with FRUIT_SLICER_RECORD_REPLAY")
+    parser.add_argument("--realtime", action="store_true", help="keep to the recorded timing instead of running flat out")
+    args = parser.parse_args()
+
+    replay = Replay.load(args.replay)
+    header = replay.header
+    print(f"{args.replay}: recorded {header['recorded']}, {len(header['results'])} games, "
+          f"{replay.get_tick_count()} ticks at {header['sim_hz']} Hz, {len(replay.stream)} bytes of input")
+
+    player = ReplayPlayer(replay)
+    start = time.perf_counter()
+    results = player.run(args.realtime)
+    elapsed = time.perf_counter() - start
+    ticks = sum(result["ticks"] for result in results)
+    print(f"Played {ticks} ticks in {elapsed:.2f} s ({ticks / max(elapsed, 1e-9):.0f} ticks/s)")
+    for index, result in enumerate(results):
+        print(f"Game {index + 1}: seed {result['seed']}, score {result['score']}, lives {result['lives']}, "
+              f"level {result['level'] + 1}, {result['ticks']} ticks")
+
+    mismatches = player.get_mismatches()
+    for index, expected, played in mismatches:
+        print(f"Game {index + 1} played differently: recorded {expected}, played {played}")
+    if mismatches:
+        raise SystemExit(1)
+    print("Every game played out as recorded")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Pre-rendered rotation cache for fruit sprites
+"""
+from collections import OrderedDict
+import pygame
+from .perf_overlay import counters
+from .pixel_format import enable_rle
+
+class RotationCache:
+    """Caches rotated copies of sprites in quantized angle buckets"""
+    def __init__(self, angle_step=5, max_bytes=32 * 1024 * 1024):
+        self.angle_step = angle_step
+        self.bucket_count = max(1, int(round(360 / angle_step)))
+        self.max_bytes = max_bytes
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Maps (sprite_index, part, bucket) to a rotated surface, oldest first
+        self.entries = OrderedDict()
+
+    def get_bucket(self, angle):
+        """Quantize an angle in degrees to its bucket number"""
+        return int(round(angle / self.angle_step)) % self.bucket_count
+
+    def get(self, sprite_index, part, surface, angle):
+        """
+        Get a rotated copy of a sprite
+        part identifies which image of the fruit this is ("whole", "left" or "right")
+        """
+        key = (sprite_index, part, self.get_bucket(angle))
+        rotated = self.entries.get(key)
+        if rotated is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return rotated
+
+        self.misses += 1
+        return self._store(key, surface)
+
+    def warm(self, sprite_index, part, surface):
+        """Pre-render every angle bucket for a sprite"""
+        for bucket in range(self.bucket_count):
+            key = (sprite_index, part, bucket)
+            if key not in self.entries:
+                self._store(key, surface)
+
+    def _store(self, key, surface):
+        """Rotate a surface for the given key and add it to the cache"""
+        rotated = pygame.transform.rotate(surface, key[2] * self.angle_step)
+        counters.rotations += 1
+        size = self._surface_bytes(rotated)
+
+        # Never cache a surface that on its own exceeds the memory cap
+        if size > self.max_bytes:
+            return rotated
+
+        # Evict least recently used entries until the new one fits
+        while self.entries and self.used_bytes + size > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.used_bytes -= self._surface_bytes(evicted)
+            self.evictions += 1
+
+        # Cached rotations are only ever blitted, so their transparent corners can be run-length encoded
+        self.entries[key] = enable_rle(rotated)
+        self.used_bytes += size
+        return rotated
+
+    def _surface_bytes(self, surface):
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+    def get_stats(self):
+        """Get hit/miss counters and memory usage"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self.entries),
+            "used_bytes": self.used_bytes,
+            "max_bytes": self.max_bytes
+        }
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def clear(self):
+        self.entries.clear()
+        self.used_bytes = 0
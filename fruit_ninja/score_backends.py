@@ -0,0 +1,349 @@
+"""
+Score storage backends: the JSON top-10 file and an indexed SQLite store
+
+Import an existing JSON file into a SQLite store with:
+    python -m fruit_ninja.score_backends fruit_ninja_scores.json fruit_ninja_scores.db
+"""
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+try:
+    import fcntl
+except ImportError:  # Windows locks files through msvcrt instead
+    fcntl = None
+    import msvcrt
+from .constants import GameConstants
+
+MAX_HIGH_SCORES = 10
+
+def entry_key(entry):
+    """Identity of a score entry, used to merge lists without duplicates"""
+    return (entry["name"], entry["score"], entry["date"])
+
+def merge_scores(*score_lists):
+    """Merge score lists into the top MAX_HIGH_SCORES, best first, dropping duplicates"""
+    merged = {}
+    for scores in score_lists:
+        for entry in scores:
+            merged.setdefault(entry_key(entry), entry)
+    return sorted(merged.values(), key=lambda x: x["score"], reverse=True)[:MAX_HIGH_SCORES]
+
+def load_score_file(path):
+    """Read a scores file, an empty list if it doesn't exist"""
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r') as f:
+        return json.load(f)
+
+class ScoreFileLock:
+    """
+    Lock file guarding a scores file across game instances
+    Holds an OS advisory lock on the file (flock, or msvcrt.locking on
+    Windows), which the OS drops when the holder exits or crashes, so there is
+    never a stale lock to break. The file itself stays in place: removing it
+    would let another process lock a new file of the same name meanwhile
+    """
+    def __init__(self, path):
+        self.path = path
+        self.fd = None
+
+    @staticmethod
+    def try_lock(fd):
+        try:
+            if fcntl:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False  # Held by another process
+
+    def acquire(self, timeout=GameConstants.SCORE_LOCK_TIMEOUT):
+        deadline = time.monotonic() + timeout
+        fd = os.open(self.path, os.O_CREAT | os.O_RDWR)
+        while not self.try_lock(fd):
+            if time.monotonic() > deadline:
+                os.close(fd)
+                return False
+            time.sleep(0.01)
+        self.fd = fd
+        return True
+
+    def release(self):
+        if self.fd is None:
+            return
+        try:
+            if fcntl:
+                fcntl.flock(self.fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(self.fd, 0, os.SEEK_SET)
+                msvcrt.locking(self.fd, msvcrt.LK_UNLCK, 1)
+        except OSError:
+            pass
+        finally:
+            os.close(self.fd)
+            self.fd = None
+
+    def __enter__(self):
+        if not self.acquire():
+            raise TimeoutError(f"Timed out waiting for {self.path}")
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+
+# Score backend interface
+class ScoreBackend(ABC):
+    """
+    Where scores are stored. Entries are dicts with "name", "score" and
+    "date" ("%Y-%m-%d %H:%M:%S", so dates compare as strings)
+    """
+    keeps_history = False  # True if every run is stored, not only the top MAX_HIGH_SCORES
+
+    @abstractmethod
+    def load(self):
+        """Get the top MAX_HIGH_SCORES entries, best first"""
+        pass
+
+    @abstractmethod
+    def write(self, entries):
+        """Store new entries, merging with what other game instances stored; returns the new top list"""
+        pass
+
+    @abstractmethod
+    def get_top(self, count):
+        """Get the best count entries"""
+        pass
+
+    @abstractmethod
+    def get_rank(self, score):
+        """1-based rank a score would have: one more than the number of stored scores above it"""
+        pass
+
+    @abstractmethod
+    def get_player_best(self, name):
+        """A player's best entry, or None"""
+        pass
+
+    @abstractmethod
+    def get_between(self, start, end, limit=100):
+        """Entries dated from start up to (not including) end, oldest first"""
+        pass
+
+    def close(self):
+        pass
+
+
+class JsonScoreBackend(ScoreBackend):
+    """
+    The top MAX_HIGH_SCORES entries in a JSON file, the default store
+    Writes merge into the file under a lock file and replace it atomically;
+    queries scan the ten entries
+    """
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        return load_score_file(self.path)
+
+    def write(self, entries):
+        with ScoreFileLock(self.path + ".lock"):
+            merged = merge_scores(load_score_file(self.path), entries)
+            temp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(temp_path, 'w') as f:
+                json.dump(merged, f, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+        return merged
+
+    def get_top(self, count):
+        return self.load()[:count]
+
+    def get_rank(self, score):
+        return sum(1 for entry in self.load() if entry["score"] > score) + 1
+
+    def get_player_best(self, name):
+        return next((entry for entry in self.load() if entry["name"] == name), None)
+
+    def get_between(self, start, end, limit=100):
+        entries = sorted((entry for entry in self.load() if start <= entry["date"] < end), key=lambda x: x["date"])
+        return entries[:limit]
+
+
+class SqliteScoreBackend(ScoreBackend):
+    """
+    Every run ever played, in an indexed SQLite database
+
+    Top-N, per-player best and per-player history walk an index, and date
+    ranges seek one. Ranks come from a Fenwick tree of score counts kept in
+    the rank_tree table: over scores below 2**SCORE_RANK_BITS, adding a score
+    updates at most SCORE_RANK_BITS rows and counting the scores above one
+    sums at most SCORE_RANK_BITS rows looked up by primary key, so both are
+    O(log n) without counting index entries. Game instances sharing the file
+    are serialized by SQLite's own locking.
+    """
+    keeps_history = True
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS scores (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            score INTEGER NOT NULL,
+            date TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS scores_by_score ON scores (score DESC, id);
+        CREATE INDEX IF NOT EXISTS scores_by_player ON scores (name, score DESC);
+        CREATE INDEX IF NOT EXISTS scores_by_player_date ON scores (name, date);
+        CREATE INDEX IF NOT EXISTS scores_by_date ON scores (date);
+        CREATE TABLE IF NOT EXISTS rank_tree (node INTEGER PRIMARY KEY, count INTEGER NOT NULL);
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+    """
+    RANK_SIZE = 1 << GameConstants.SCORE_RANK_BITS
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()  # The connection is shared by the game and writer threads
+        self.connection = sqlite3.connect(path, timeout=GameConstants.SCORE_LOCK_TIMEOUT, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(self.SCHEMA)
+
+    def rank_index(self, score):
+        """Fenwick tree position of a score (1-based), clamped into the tree"""
+        return min(max(int(score), 0), self.RANK_SIZE - 1) + 1
+
+    def rank_path(self, score):
+        """Tree nodes updated when a score is added"""
+        node = self.rank_index(score)
+        while node <= self.RANK_SIZE:
+            yield node
+            node += node & -node
+
+    def count_at_most(self, score):
+        """Number of stored scores at or below score"""
+        if score < 0:
+            return 0
+        nodes = []
+        node = self.rank_index(score)
+        while node > 0:
+            nodes.append(node)
+            node -= node & -node
+        placeholders = ",".join("?" * len(nodes))
+        row = self.connection.execute(f"SELECT SUM(count) FROM rank_tree WHERE node IN ({placeholders})",
+                                      nodes).fetchone()
+        return row[0] or 0
+
+    def count(self):
+        # The last node of the tree covers every score
+        row = self.connection.execute("SELECT count FROM rank_tree WHERE node = ?", (self.RANK_SIZE,)).fetchone()
+        return row[0] if row else 0
+
+    def load(self):
+        return self.get_top(MAX_HIGH_SCORES)
+
+    def insert(self, entries):
+        """Insert entries and count them in the rank tree, inside the caller's transaction"""
+        self.connection.executemany("INSERT INTO scores (name, score, date) VALUES (?, ?, ?)",
+                                    [(entry["name"], entry["score"], entry["date"]) for entry in entries])
+        # Count each distinct score once, so bulk imports walk one tree path per score value
+        score_counts = {}
+        for entry in entries:
+            score_counts[entry["score"]] = score_counts.get(entry["score"], 0) + 1
+        increments = {}
+        for score, count in score_counts.items():
+            for node in self.rank_path(score):
+                increments[node] = increments.get(node, 0) + count
+        self.connection.executemany(
+            "INSERT INTO rank_tree (node, count) VALUES (?, ?) "
+            "ON CONFLICT(node) DO UPDATE SET count = count + excluded.count",
+            increments.items())
+
+    def write(self, entries):
+        with self.lock, self.connection:
+            self.insert(entries)
+        return self.load()
+
+    def get_top(self, count):
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT name, score, date FROM scores ORDER BY score DESC, id LIMIT ?", (count,)).fetchall()
+        return [{"name": name, "score": score, "date": date} for name, score, date in rows]
+
+    def get_rank(self, score):
+        with self.lock:
+            return self.count() - self.count_at_most(score) + 1
+
+    def get_player_best(self, name):
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT name, score, date FROM scores WHERE name = ? ORDER BY score DESC LIMIT 1", (name,)).fetchone()
+        return {"name": row[0], "score": row[1], "date": row[2]} if row else None
+
+    def get_player_history(self, name, limit=100):
+        """A player's most recent entries, newest first"""
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT name, score, date FROM scores WHERE name = ? ORDER BY date DESC LIMIT ?",
+                (name, limit)).fetchall()
+        return [{"name": name, "score": score, "date": date} for name, score, date in rows]
+
+    def get_between(self, start, end, limit=100):
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT name, score, date FROM scores WHERE date >= ? AND date < ? ORDER BY date LIMIT ?",
+                (start, end, limit)).fetchall()
+        return [{"name": name, "score": score, "date": date} for name, score, date in rows]
+
+    def import_json(self, json_path):
+        """
+        One-time import of a JSON scores file; returns the number of entries imported
+        Recorded in the meta table, so opening the store again doesn't import twice
+        """
+        key = "imported:" + os.path.abspath(json_path)
+        with self.lock, self.connection:
+            if self.connection.execute("SELECT 1 FROM meta WHERE key = ?", (key,)).fetchone():
+                return 0
+            entries = load_score_file(json_path)
+            self.insert(entries)
+            self.connection.execute("INSERT INTO meta (key, value) VALUES (?, ?)", (key, str(len(entries))))
+        return len(entries)
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+
+def create_score_backend(kind=GameConstants.SCORE_BACKEND, json_path=GameConstants.SCORES_FILE,
+                         sqlite_path=GameConstants.SQLITE_SCORES_FILE):
+    """
+    Create the configured backend
+    The SQLite store imports the JSON file the first time it is opened
+    """
+    if kind == "sqlite":
+        backend = SqliteScoreBackend(sqlite_path)
+        if os.path.exists(json_path):
+            imported = backend.import_json(json_path)
+            if imported:
+                print(f"Imported {imported} high scores from {json_path}")
+        return backend
+    return JsonScoreBackend(json_path)
+
+def main():
+    parser = argparse.ArgumentParser(description="Import a JSON high score file into a SQLite score store")
+    parser.add_argument("json_path", nargs="?", default=GameConstants.SCORES_FILE)
+    parser.add_argument("sqlite_path", nargs="?", default=GameConstants.SQLITE_SCORES_FILE)
+    args = parser.parse_args()
+
+    backend = SqliteScoreBackend(args.sqlite_path)
+    imported = backend.import_json(args.json_path)
+    print(f"Imported {imported} entries into {args.sqlite_path} ({backend.count()} stored)")
+    backend.close()
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ Game screens (home screen, about screen, etc.)
 """
 import pygame
 from .constants import GameConstants
+from .perf_overlay import counters
 
 class Button:
     """Interactive button class for UI screens"""
@@ -20,12 +21,18 @@ class Button:
         self.text_surface = self.font.render(self.text, True, self.text_color)
         self.text_rect = self.text_surface.get_rect(center=self.rect.center)
         
+    def move_to(self, x, y):
+        """Move the button and its text"""
+        self.rect.x = x
+        self.rect.y = y
+        self.text_rect.center = self.rect.center
+        
     def update(self, mouse_pos):
         """Update button state based on mouse position"""
         self.is_hovered = self.rect.collidepoint(mouse_pos)
         
     def draw(self, screen):
-        """Draw the button on the screen"""
+        """Draw the button on the screen and return the rect drawn to"""
         # Draw button background
         color = self.hover_color if self.is_hovered else self.bg_color
         pygame.draw.rect(screen, color, self.rect)
@@ -33,6 +40,8 @@ class Button:
         
         # Draw button text
         screen.blit(self.text_surface, self.text_rect)
+        counters.blits += 1
+        return self.rect
         
     def is_clicked(self, event):
         """Check if button was clicked"""
@@ -41,11 +50,103 @@ class Button:
         return False
 
 
-class HomeScreen:
-    """Home screen with play and about buttons"""
-    def __init__(self, screen, background_image=None, high_score_manager=None):
+class LoadingScreen:
+    """Progress bar shown while startup assets load"""
+    def __init__(self, screen):
+        self.screen = screen
+        # The game font is an asset too, so this uses the default font
+        self.font = pygame.font.Font(None, 48)
+        self.title_text = self.font.render("Loading...", True, GameConstants.WHITE)
+        
+    def draw(self, progress):
+        """Draw the screen with the bar filled to progress (0 to 1)"""
+        self.screen.fill(GameConstants.BLACK)
+        width, height = self.screen.get_size()
+        
+        title_rect = self.title_text.get_rect(center=(width // 2, height // 2 - 40))
+        self.screen.blit(self.title_text, title_rect)
+        
+        bar_rect = pygame.Rect(0, 0, width // 2, 24)
+        bar_rect.center = (width // 2, height // 2 + 20)
+        fill_rect = bar_rect.copy()
+        fill_rect.width = int(bar_rect.width * max(0.0, min(1.0, progress)))
+        pygame.draw.rect(self.screen, GameConstants.WHITE, fill_rect)
+        pygame.draw.rect(self.screen, GameConstants.WHITE, bar_rect, 2)  # Border
+
+
+class StaticLayerScreen:
+    """
+    Base class for menu screens whose content only changes with the window size or data
+
+    The background, titles, text and tables are composited once into a static
+    layer, which is rebuilt only when get_static_key() changes. Each frame then
+    only needs the widgets drawn over the layer (the buttons, whose hover state
+    changes), and Game restores just the rects they and the cursor covered.
+    """
+    def __init__(self, screen, background_image=None):
         self.screen = screen
         self.background = background_image
+        self.static_layer = None
+        self.static_key = None
+        self.rebuilds = 0
+        
+    def set_background(self, background_image):
+        """Change the background, rebuilding the static layer if it is a different image"""
+        if background_image is not self.background:
+            self.background = background_image
+            self.static_layer = None
+        
+    def get_static_key(self):
+        """Everything the static layer depends on; it is rebuilt when this changes"""
+        return self.screen.get_size()
+        
+    def get_static_layer(self):
+        """Get the static layer, rebuilding it if the window size or data changed"""
+        key = self.get_static_key()
+        if self.static_layer is None or key != self.static_key:
+            screen_width, screen_height = self.screen.get_size()
+            self.layout(screen_width, screen_height)
+            self.static_layer = pygame.Surface((screen_width, screen_height)).convert()
+            self.draw_background(self.static_layer)
+            self.build_static_layer(self.static_layer)
+            self.static_key = key
+            self.rebuilds += 1
+        return self.static_layer
+        
+    def draw_background(self, layer):
+        """Draw the background, scaled to the layer if needed"""
+        if self.background:
+            # Scale background to fit current screen size if needed
+            if self.background.get_size() != layer.get_size():
+                layer.blit(pygame.transform.smoothscale(self.background, layer.get_size()), (0, 0))
+            else:
+                layer.blit(self.background, (0, 0))
+        else:
+            layer.fill(GameConstants.BLACK)
+        
+    def layout(self, screen_width, screen_height):
+        """Position the widgets for the current screen size"""
+        pass
+        
+    def build_static_layer(self, layer):
+        """Draw everything that doesn't change from frame to frame onto the layer"""
+        pass
+        
+    def draw_widgets(self):
+        """Draw the widgets over the static layer and return the rects drawn to"""
+        return []
+        
+    def draw(self):
+        """Draw the whole screen and return the rects of the widgets"""
+        self.screen.blit(self.get_static_layer(), (0, 0))
+        counters.blits += 1
+        return self.draw_widgets()
+
+
+class HomeScreen(StaticLayerScreen):
+    """Home screen with play and about buttons"""
+    def __init__(self, screen, background_image=None, high_score_manager=None):
+        super().__init__(screen, background_image)
         self.high_score_manager = high_score_manager
         
         # Get current screen dimensions
@@ -67,14 +168,8 @@ class HomeScreen:
         self.title_text = self.font_large.render("FRUIT SLICER", True, GameConstants.WHITE)
         self.title_rect = self.title_text.get_rect(center=(screen_width // 2, 150))
         
-        # Create high score text
+        # The high score text is rendered into the static layer
         self.high_score = 0
-        if high_score_manager and high_score_manager.get_high_scores():
-            # Get the highest score
-            self.high_score = high_score_manager.get_high_scores()[0]["score"]
-        
-        self.high_score_text = self.font_small.render(f"High Score: {self.high_score}", True, GameConstants.WHITE)
-        self.high_score_rect = self.high_score_text.get_rect(topleft=(10, 10))
         
         # Create buttons
         button_width = 200
@@ -114,61 +209,43 @@ class HomeScreen:
         self.play_button.update(mouse_pos)
         self.about_button.update(mouse_pos)
         
-        # Update high score if needed
-        if self.high_score_manager and self.high_score_manager.get_high_scores():
-            new_high_score = self.high_score_manager.get_high_scores()[0]["score"]
-            if new_high_score != self.high_score:
-                self.high_score = new_high_score
-                self.high_score_text = self.font_small.render(f"High Score: {self.high_score}", True, GameConstants.WHITE)
-        
-    def draw(self):
-        """Draw the home screen"""
-        # Get current screen dimensions
-        screen_width = self.screen.get_width()
-        screen_height = self.screen.get_height()
+    def get_static_key(self):
+        """The layer shows the top high score, so it also changes with the score table"""
+        revision = self.high_score_manager.revision if self.high_score_manager else 0
+        return (self.screen.get_size(), revision)
         
-        # Draw background
-        if self.background:
-            # Scale background to fit current screen size if needed
-            if (self.background.get_width() != screen_width or 
-                self.background.get_height() != screen_height):
-                scaled_bg = pygame.transform.smoothscale(self.background, (screen_width, screen_height))
-                self.screen.blit(scaled_bg, (0, 0))
-            else:
-                self.screen.blit(self.background, (0, 0))
-        else:
-            self.screen.fill(GameConstants.BLACK)
-            
-        # Draw high score in top left corner
-        self.screen.blit(self.high_score_text, self.high_score_rect)
-            
-        # Update title position for current screen size
+    def layout(self, screen_width, screen_height):
+        """Position the title and buttons for the current screen size"""
         self.title_rect.center = (screen_width // 2, 150)
-        self.screen.blit(self.title_text, self.title_rect)
         
-        # Update button positions for current screen size
         button_width = 200
         button_y_start = screen_height // 2 - 50
         button_spacing = 80
+        self.play_button.move_to(screen_width // 2 - button_width // 2, button_y_start)
+        self.about_button.move_to(screen_width // 2 - button_width // 2, button_y_start + button_spacing)
+        
+    def build_static_layer(self, layer):
+        """Draw the high score and the title"""
+        if self.high_score_manager and self.high_score_manager.get_high_scores():
+            # Get the highest score
+            self.high_score = self.high_score_manager.get_high_scores()[0]["score"]
         
-        self.play_button.rect.x = screen_width // 2 - button_width // 2
-        self.play_button.rect.y = button_y_start
-        self.play_button.text_rect.center = self.play_button.rect.center
+        # Draw high score in top left corner
+        high_score_text = self.font_small.render(f"High Score: {self.high_score}", True, GameConstants.WHITE)
+        layer.blit(high_score_text, high_score_text.get_rect(topleft=(10, 10)))
+        counters.text_renders += 1
         
-        self.about_button.rect.x = screen_width // 2 - button_width // 2
-        self.about_button.rect.y = button_y_start + button_spacing
-        self.about_button.text_rect.center = self.about_button.rect.center
+        layer.blit(self.title_text, self.title_rect)
         
-        # Draw buttons
-        self.play_button.draw(self.screen)
-        self.about_button.draw(self.screen)
+    def draw_widgets(self):
+        """Draw the buttons"""
+        return [self.play_button.draw(self.screen), self.about_button.draw(self.screen)]
 
 
-class AboutScreen:
+class AboutScreen(StaticLayerScreen):
     """About screen with game information"""
     def __init__(self, screen, background_image=None):
-        self.screen = screen
-        self.background = background_image
+        super().__init__(screen, background_image)
         
         # Get current screen dimensions
         screen_width = screen.get_width()
@@ -229,53 +306,35 @@ class AboutScreen:
         mouse_pos = pygame.mouse.get_pos()
         self.back_button.update(mouse_pos)
         
-    def draw(self):
-        """Draw the about screen"""
-        # Get current screen dimensions
-        screen_width = self.screen.get_width()
-        screen_height = self.screen.get_height()
-        
-        # Draw background
-        if self.background:
-            # Scale background to fit current screen size if needed
-            if (self.background.get_width() != screen_width or 
-                self.background.get_height() != screen_height):
-                scaled_bg = pygame.transform.smoothscale(self.background, (screen_width, screen_height))
-                self.screen.blit(scaled_bg, (0, 0))
-            else:
-                self.screen.blit(self.background, (0, 0))
-        else:
-            self.screen.fill(GameConstants.BLACK)
-            
-        # Update title position for current screen size
+    def layout(self, screen_width, screen_height):
+        """Position the title and back button for the current screen size"""
         self.title_rect.center = (screen_width // 2, 100)
-        self.screen.blit(self.title_text, self.title_rect)
+        self.back_button.move_to(screen_width // 2 - 100, screen_height - 100)
+        
+    def build_static_layer(self, layer):
+        """Draw the title and the about text"""
+        layer.blit(self.title_text, self.title_rect)
         
         # Draw about text - left aligned
-        left_margin = screen_width // 8
+        left_margin = layer.get_width() // 8
         y_offset = 180
         line_spacing = 30
         
         # Use pre-rendered text surfaces
         for text_surface in self.text_surfaces:
             text_rect = text_surface.get_rect(left=left_margin, top=y_offset)
-            self.screen.blit(text_surface, text_rect)
+            layer.blit(text_surface, text_rect)
             y_offset += line_spacing
         
-        # Update back button position
-        self.back_button.rect.x = screen_width // 2 - 100
-        self.back_button.rect.y = screen_height - 100
-        self.back_button.text_rect.center = self.back_button.rect.center
-        
-        # Draw back button
-        self.back_button.draw(self.screen)
+    def draw_widgets(self):
+        """Draw the back button"""
+        return [self.back_button.draw(self.screen)]
 
 
-class HighScoreScreen:
+class HighScoreScreen(StaticLayerScreen):
     """Screen to display high scores"""
     def __init__(self, screen, background_image, high_score_manager):
-        self.screen = screen
-        self.background = background_image
+        super().__init__(screen, background_image)
         self.high_score_manager = high_score_manager
         
         # Get current screen dimensions
@@ -318,26 +377,22 @@ class HighScoreScreen:
         mouse_pos = pygame.mouse.get_pos()
         self.back_button.update(mouse_pos)
         
-    def draw(self):
-        """Draw the high score screen"""
-        # Get current screen dimensions
-        screen_width = self.screen.get_width()
-        screen_height = self.screen.get_height()
+    def get_static_key(self):
+        """The layer shows the score table, so it also changes with it"""
+        return (self.screen.get_size(), self.high_score_manager.revision)
+        
+    def layout(self, screen_width, screen_height):
+        """Position the title and back button for the current screen size"""
+        self.title_rect.center = (screen_width // 2, 100)
+        self.back_button.move_to(screen_width // 2 - 100, screen_height - 100)
+        
+    def build_static_layer(self, layer):
+        """Draw the title and the score table"""
+        screen_width = layer.get_width()
+        screen_height = layer.get_height()
         
-        # Draw background
-        if self.background:
-            # Scale background to fit current screen size if needed
-            if (self.background.get_width() != screen_width or 
-                self.background.get_height() != screen_height):
-                scaled_bg = pygame.transform.smoothscale(self.background, (screen_width, screen_height))
-                self.screen.blit(scaled_bg, (0, 0))
-            else:
-                self.screen.blit(self.background, (0, 0))
-        else:
-            self.screen.fill(GameConstants.BLACK)
-            
         # Draw title
-        self.screen.blit(self.title_text, self.title_rect)
+        layer.blit(self.title_text, self.title_rect)
         
         # Draw high scores
         scores = self.high_score_manager.get_high_scores()
@@ -346,7 +401,8 @@ class HighScoreScreen:
             # No scores yet
             no_scores_text = self.font_medium.render("No high scores yet!", True, GameConstants.WHITE)
             no_scores_rect = no_scores_text.get_rect(center=(screen_width // 2, screen_height // 2))
-            self.screen.blit(no_scores_text, no_scores_rect)
+            layer.blit(no_scores_text, no_scores_rect)
+            counters.text_renders += 1
         else:
             # Draw column headers
             rank_header = self.font_medium.render("Rank", True, GameConstants.YELLOW)
@@ -361,10 +417,11 @@ class HighScoreScreen:
             score_x = screen_width // 2
             date_x = 3 * screen_width // 4
             
-            self.screen.blit(rank_header, (rank_x, header_y))
-            self.screen.blit(name_header, (name_x, header_y))
-            self.screen.blit(score_header, (score_x, header_y))
-            self.screen.blit(date_header, (date_x, header_y))
+            layer.blit(rank_header, (rank_x, header_y))
+            layer.blit(name_header, (name_x, header_y))
+            layer.blit(score_header, (score_x, header_y))
+            layer.blit(date_header, (date_x, header_y))
+            counters.text_renders += 4
             
             # Draw scores
             row_height = 40
@@ -373,24 +430,21 @@ class HighScoreScreen:
             for i, score in enumerate(scores):
                 # Rank
                 rank_text = self.font_small.render(f"{i+1}", True, GameConstants.WHITE)
-                self.screen.blit(rank_text, (rank_x, start_y + i * row_height))
+                layer.blit(rank_text, (rank_x, start_y + i * row_height))
                 
                 # Name
                 name_text = self.font_small.render(score["name"], True, GameConstants.WHITE)
-                self.screen.blit(name_text, (name_x, start_y + i * row_height))
+                layer.blit(name_text, (name_x, start_y + i * row_height))
                 
                 # Score
                 score_text = self.font_small.render(str(score["score"]), True, GameConstants.WHITE)
-                self.screen.blit(score_text, (score_x, start_y + i * row_height))
+                layer.blit(score_text, (score_x, start_y + i * row_height))
                 
                 # Date
                 date_text = self.font_small.render(score["date"], True, GameConstants.WHITE)
-                self.screen.blit(date_text, (date_x, start_y + i * row_height))
-        
-        # Update back button position
-        self.back_button.rect.x = screen_width // 2 - 100
-        self.back_button.rect.y = screen_height - 100
-        self.back_button.text_rect.center = self.back_button.rect.center
+                layer.blit(date_text, (date_x, start_y + i * row_height))
+                counters.text_renders += 4
         
-        # Draw back button
-        self.back_button.draw(self.screen)
+    def draw_widgets(self):
+        """Draw the back button"""
+        return [self.back_button.draw(self.screen)]
@@ -0,0 +1,255 @@
+"""
+Headless gameplay simulation, independent of pygame.display
+"""
+import math
+import random
+from .constants import GameConstants
+from .fruit import FruitFactory
+from .managers import ScoreManager, LivesManager, DifficultyManager, GameState, FruitSpawner
+from .spatial_hash import SpatialHash, PackedSpatialHash
+from .utils import CollisionDetector
+from . import physics
+
+class Simulation:
+    """
+    Owns the fruits and gameplay managers and advances them in fixed ticks
+
+    Nothing here needs a window or an initialized pygame, so it can be stepped
+    as fast as the CPU allows in tests, servers and batch jobs. step() returns
+    the gameplay events of the tick so a presentation layer can react to them
+    (sounds, backgrounds, high scores):
+    - "fruit_throw": a fruit was spawned
+    - "lose_life": an unsliced fruit fell off screen
+    - "game_over": the last life was lost
+    - "fruit_slice": at least one fruit was sliced
+    - "level_up": the score reached a new level
+
+    All gameplay randomness comes from self.rng, seeded with self.seed at
+    every reset, so a game is fully determined by its seed, the world size
+    and the slice points passed to each step() (see replay.py).
+    """
+    def __init__(self, world_width=GameConstants.DEFAULT_SCREEN_WIDTH,
+                 world_height=GameConstants.DEFAULT_SCREEN_HEIGHT,
+                 sprite_manager=None, sim_hz=GameConstants.SIM_HZ, seed=None, physics_backend=None):
+        self.world_width = world_width
+        self.world_height = world_height
+
+        # Length of one tick in seconds, and in ticks of the rate gameplay values are tuned for
+        self.dt = 1.0 / sim_hz
+        self.time_scale = GameConstants.BASE_TICK_RATE / sim_hz
+        self.sim_hz = sim_hz
+        self.tick = 0
+
+        # Fruits, stored in a vectorized physics engine when NumPy is available
+        # (physics_backend overrides GameConstants.PHYSICS_BACKEND)
+        self.physics = None
+        if (physics_backend or GameConstants.PHYSICS_BACKEND) == "numpy" and physics.is_available():
+            self.physics = physics.FruitPhysics()
+        self.fruits = self.physics.fruits if self.physics else []
+
+        # Brought up to date with the fruit positions whenever the slice path is tested
+        if CollisionDetector.batch_available():
+            self.spatial_hash = PackedSpatialHash(GameConstants.SPATIAL_HASH_CELL_SIZE)
+        else:
+            self.spatial_hash = SpatialHash(GameConstants.SPATIAL_HASH_CELL_SIZE)
+        self.spatial_hash_stale = True  # Fruits were removed since the hash was built, so indices moved
+
+        # Gameplay random numbers, reseeded at every reset
+        self.rng = random.Random()
+        self.seed = None
+        self.reseed(seed)
+
+        # Fruits are created without sprites when there is no sprite manager
+        self.fruit_factory = FruitFactory(sprite_manager, rng=self.rng)
+        # Levels: score thresholds and what each level spawns
+        self.spawn_table = self.fruit_factory.spawn_table
+
+        # Gameplay managers
+        self.score_manager = ScoreManager()
+        self.lives_manager = LivesManager(5)
+        self.difficulty_manager = DifficultyManager()
+        self.fruit_spawner = FruitSpawner()
+        self.game_state = GameState()
+        self.level = 0  # 0-based index of the current level
+
+    def get_physics_backend(self):
+        """Name of the physics backend in use, numpy or python"""
+        return "numpy" if self.physics else "python"
+
+    def set_world_size(self, world_width, world_height):
+        """Change the bounds fruits spawn in and bounce off"""
+        self.world_width = world_width
+        self.world_height = world_height
+
+    def reseed(self, seed=None):
+        """Seed the gameplay random numbers, with a new random seed when seed is None"""
+        self.seed = random.getrandbits(32) if seed is None else seed
+        self.rng.seed(self.seed)
+        return self.seed
+
+    def reset(self, seed=None):
+        """Reset the simulation to the start of a new game, seeded with seed or a new random seed"""
+        self.reseed(seed)
+        self.clear_fruits()
+        self.score_manager.reset()
+        self.lives_manager.reset()
+        self.difficulty_manager.reset()
+        self.fruit_spawner.reset()
+        self.game_state.reset()
+        self.level = 0
+        self.tick = 0
+
+    def clear_fruits(self):
+        """Remove every fruit, returning them to the factory pool"""
+        removed = list(self.fruits)
+        self.spatial_hash_stale = True
+        if self.physics:
+            self.physics.clear()
+        else:
+            self.fruits = []
+        for fruit in removed:
+            self.fruit_factory.release(fruit)
+
+    def step(self, slice_points=None):
+        """
+        Advance the simulation by one tick
+        slice_points is the current slice path, or None when the player isn't slicing
+        Returns the list of events that happened during the tick
+        """
+        events = []
+        if self.game_state.is_game_over():
+            return events
+        self.tick += 1
+
+        # Check if we should spawn new fruits
+        if self.fruit_spawner.update(self.time_scale):
+            self.spawn_fruits(events)
+
+        # Update fruits and collect the ones that left the screen
+        if self.physics:
+            removed = self.physics.step(self.world_width, self.world_height, self.time_scale)
+        else:
+            for fruit in self.fruits:
+                fruit.update(self.world_width, self.world_height, self.time_scale)
+            removed = [fruit for fruit in self.fruits if fruit.is_removable()]
+            if removed:
+                self.fruits = [fruit for fruit in self.fruits if not fruit.is_removable()]
+        if removed:
+            self.spatial_hash_stale = True
+
+        # Check if fruits fell off screen without being sliced
+        for fruit in removed:
+            if not fruit.is_sliced():
+                self.lives_manager.lose_life()
+                events.append("lose_life")
+                if not self.lives_manager.has_lives():
+                    self.game_state.set_game_over()
+                    events.append("game_over")
+            self.fruit_factory.release(fruit)
+
+        # Check for slicing
+        if slice_points is not None and len(slice_points) > 1:
+            sliced_any = False
+            for fruit in self.slice_fruits(slice_points):
+                sliced_any = True
+                self.score_manager.add_score(fruit.get_points())
+                fruits_sliced = self.score_manager.get_fruits_sliced()
+                self.difficulty_manager.increase_difficulty(fruits_sliced)
+
+                # Check if the score reached a new level
+                self.check_level_change(events)
+
+            if sliced_any:
+                events.append("fruit_slice")
+
+        return events
+
+    def spawn_fruits(self, events):
+        """Spawn new fruits based on current difficulty"""
+        num_fruits = self.fruit_spawner.get_spawn_count()
+        speed_multiplier = self.difficulty_manager.get_speed_multiplier()
+
+        for _ in range(num_fruits):
+            self.add_fruit(self.fruit_factory.create_fruit(self.world_width, self.world_height, speed_multiplier,
+                                                           self.level))
+            events.append("fruit_throw")
+
+    def add_fruit(self, fruit):
+        """Add a fruit to the simulation"""
+        if self.physics:
+            self.physics.add(fruit)  # Also adds it to self.fruits
+        else:
+            self.fruits.append(fruit)
+
+    def slice_fruits(self, slice_points):
+        """
+        Slice every fruit hit by the slice path and return them in fruit order
+        Fruits are tested over the whole path their center moved along this
+        tick (swept), not only where they ended up, so fast fruits at low tick
+        rates can't pass through the slice between two ticks
+        """
+        if self.physics:
+            count = self.physics.count
+            column = self.physics.column
+            starts = self.physics.state[[column("prev_x"), column("prev_y")], :count].T
+            ends = self.physics.state[[column("x"), column("y")], :count].T
+            radii = self.physics.state[column("radius"), :count]
+            # Circles around the middle of each fruit's motion that cover all of it
+            motion = ends - starts
+            bound_centers = starts + motion / 2
+            bound_radii = radii + (motion * motion).sum(axis=1) ** 0.5 / 2
+        else:
+            starts = [(fruit.prev_x, fruit.prev_y) for fruit in self.fruits]
+            ends = [(fruit.x, fruit.y) for fruit in self.fruits]
+            radii = [fruit.radius for fruit in self.fruits]
+            bound_centers = [((x1 + x2) / 2, (y1 + y2) / 2) for (x1, y1), (x2, y2) in zip(starts, ends)]
+            bound_radii = [radius + math.hypot(x2 - x1, y2 - y1) / 2
+                           for (x1, y1), (x2, y2), radius in zip(starts, ends, radii)]
+
+        # Broad phase: only fruits whose motion is in grid cells overlapped by the slice segments
+        # Between removals fruits keep their index, so only the ones that changed cells are moved in the hash
+        if self.spatial_hash_stale:
+            self.spatial_hash.rebuild(bound_centers, bound_radii)
+            self.spatial_hash_stale = False
+        else:
+            self.spatial_hash.refresh(bound_centers, bound_radii)
+        candidates = sorted(self.spatial_hash.query_polyline(slice_points))
+        if not candidates:
+            return []
+
+        if not CollisionDetector.batch_available():
+            return [self.fruits[index] for index in candidates if self.fruits[index].check_slice(slice_points, self.rng)]
+
+        # Narrow phase: test the candidates against the whole slice path in one batched pass
+        if self.physics:
+            starts = starts[candidates]
+            ends = ends[candidates]
+            radii = radii[candidates]
+            active = ~self.physics.flags[self.physics.flag_column("_sliced"), candidates]
+        else:
+            starts = [starts[index] for index in candidates]
+            ends = [ends[index] for index in candidates]
+            radii = [radii[index] for index in candidates]
+            active = [not self.fruits[index].is_sliced() for index in candidates]
+
+        hit_indices, segments = CollisionDetector.batch_swept_slice_hits(slice_points, starts, ends, radii, active)
+
+        sliced = []
+        for hit_index, segment in zip(hit_indices.tolist(), segments.tolist()):
+            fruit = self.fruits[candidates[hit_index]]
+            fruit.slice_with_segment(slice_points[segment], slice_points[segment + 1], self.rng)
+            sliced.append(fruit)
+        return sliced
+
+    def check_level_change(self, events):
+        """Check if the score reached a new level"""
+        new_level = self.spawn_table.get_level_index(self.score_manager.get_score())
+
+        # Some levels raise the speed to a minimum
+        min_speed = self.spawn_table.get_level(new_level).min_speed_multiplier
+        if self.difficulty_manager.get_speed_multiplier() < min_speed:
+            self.difficulty_manager.speed_multiplier = min_speed
+
+        if new_level != self.level:
+            self.level = new_level
+            events.append("level_up")
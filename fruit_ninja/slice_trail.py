@@ -0,0 +1,74 @@
+"""
+Fixed-capacity ring buffer of timestamped slice trail samples
+"""
+from array import array
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, the trail falls back to lists
+    np = None
+from .constants import GameConstants
+
+class SliceTrail:
+    """
+    The recent (x, y, timestamp) samples of the slice path, oldest first
+
+    Samples are stored as three doubles in a flat array twice the capacity
+    long, and written twice, at i and i + capacity, so the live samples are
+    always one contiguous run of it however far the ring has wrapped.
+    get_points() returns that run as an (n, 2) NumPy view over the array
+    without copying; segment i of the path is rows i and i + 1. Adding a
+    sample only writes into the array, and samples leave the trail when they
+    are older than max_age (or the ring is full), so the trail shrinks behind
+    the cursor by time whatever the mouse event rate. Without NumPy,
+    get_points() returns a list of the live points instead.
+    """
+    FIELDS = 3  # x, y, timestamp
+
+    def __init__(self, capacity=GameConstants.SLICE_TRAIL_CAPACITY, max_age=GameConstants.SLICE_TRAIL_MAX_AGE_MS):
+        self.capacity = capacity
+        self.max_age = max_age  # Milliseconds a sample stays in the trail
+        self.samples = array("d", bytes(8 * self.FIELDS * capacity * 2))
+        self.start = 0  # Sample index of the oldest live sample, below capacity
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.start = 0
+        self.count = 0
+
+    def add(self, x, y, timestamp):
+        """Append a sample, dropping the oldest one if the ring is full"""
+        if self.count == self.capacity:
+            self.start = (self.start + 1) % self.capacity
+            self.count -= 1
+        samples = self.samples
+        first = (self.start + self.count) % self.capacity * self.FIELDS
+        second = first + self.capacity * self.FIELDS
+        samples[first] = samples[second] = x
+        samples[first + 1] = samples[second + 1] = y
+        samples[first + 2] = samples[second + 2] = timestamp
+        self.count += 1
+
+    def expire(self, now):
+        """Drop samples older than max_age at time now"""
+        cutoff = now - self.max_age
+        while self.count and self.samples[self.start * self.FIELDS + 2] < cutoff:
+            self.start = (self.start + 1) % self.capacity
+            self.count -= 1
+
+    def get_samples(self):
+        """Live samples as rows of (x, y, timestamp), oldest first; a view of the array with NumPy"""
+        if np is not None:
+            return np.frombuffer(self.samples, count=self.count * self.FIELDS,
+                                 offset=self.start * self.FIELDS * 8).reshape(self.count, self.FIELDS)
+        begin = self.start * self.FIELDS
+        values = self.samples[begin:begin + self.count * self.FIELDS]
+        return list(zip(values[0::3], values[1::3], values[2::3]))
+
+    def get_points(self):
+        """Live points as rows of (x, y), oldest first; a view of the array with NumPy"""
+        if np is not None:
+            return self.get_samples()[:, :2]
+        return [(x, y) for x, y, _ in self.get_samples()]
@@ -1,44 +1,113 @@
 """
 Sound management for the game
 """
+import os
 import pygame
 from .constants import GameConstants
+from .channels import ChannelManager
 
 class SoundManager:
-    """Manages loading and playing sounds"""
+    """
+    Manages loading and playing sounds
     
-    def __init__(self):
+    Music tracks are always streamed through pygame.mixer.music and never
+    decoded into memory. Sound effects are decoded on first use, except the
+    hot set in SOUND_PREWARM, which load_sounds() decodes up front so the
+    sounds of the first slices don't stall a frame. Effects play through a
+    ChannelManager, which keeps channels free for important cues.
+    """
+    
+    def __init__(self, load=True):
         # Initialize pygame mixer if not already initialized
         if not pygame.mixer.get_init():
             pygame.mixer.init()
         
+        self.channels = ChannelManager()
         self.sounds = {}
+        self.failed_sounds = set()  # Effects that couldn't be loaded, so they aren't retried on every play
         self.music_playing = False
         self.sound_enabled = True
         self.music_enabled = True
-        self.load_sounds()
+        
+        # Without load, call load_sounds() later, e.g. with sounds decoded on worker threads
+        if load:
+            self.load_sounds()
     
-    def load_sounds(self):
-        """Load all sound effects"""
+    @staticmethod
+    def decode_sound(sound_path):
+        """Decode a sound file (thread safe once the mixer is initialized)"""
+        return pygame.mixer.Sound(sound_path)
+    
+    def load_sounds(self, decoded=None):
+        """
+        Load the hot set of sound effects; the others load on first use
+        decoded optionally maps sound names to sounds already decoded by decode_sound
+        """
         try:
-            for sound_name, sound_path in GameConstants.SOUNDS.items():
-                try:
-                    self.sounds[sound_name] = pygame.mixer.Sound(sound_path)
-                except Exception as e:
-                    print(f"Could not load sound {sound_name}: {e}")
+            for sound_name in GameConstants.SOUND_PREWARM:
+                sound = decoded.get(sound_name) if decoded else None
+                if sound is not None:
+                    self.sounds[sound_name] = sound
+                else:
+                    self.get_sound(sound_name)
             
-            print(f"Loaded {len(self.sounds)} sound effects")
+            print(f"Loaded {len(self.sounds)} of {len(GameConstants.SOUNDS)} sound effects, "
+                  f"{self.get_resident_bytes() / 1024:.0f} KiB resident")
         except Exception as e:
             print(f"Error loading sounds: {e}")
     
+    def get_sound(self, sound_name):
+        """Get a sound effect, decoding it on first use; None if it can't be loaded"""
+        sound = self.sounds.get(sound_name)
+        if sound is None and sound_name not in self.failed_sounds and sound_name in GameConstants.SOUNDS:
+            try:
+                sound = self.decode_sound(GameConstants.SOUNDS[sound_name])
+                self.sounds[sound_name] = sound
+            except Exception as e:
+                print(f"Could not load sound {sound_name}: {e}")
+                self.failed_sounds.add(sound_name)
+        return sound
+    
     def play_sound(self, sound_name, volume=1.0):
         """Play a sound effect"""
         if not self.sound_enabled:
             return
             
-        if sound_name in self.sounds:
-            self.sounds[sound_name].set_volume(volume)
-            self.sounds[sound_name].play()
+        sound = self.get_sound(sound_name)
+        if sound:
+            self.channels.play(sound_name, sound, volume)
+    
+    @staticmethod
+    def get_music_path(music_name):
+        """
+        Path of a music track, preferring a compressed copy next to it
+        E.g. MainTheme.ogg is streamed instead of MainTheme.wav when it exists
+        """
+        path = GameConstants.MUSIC[music_name]
+        stem = os.path.splitext(path)[0]
+        for extension in GameConstants.COMPRESSED_MUSIC_FORMATS:
+            if os.path.exists(stem + extension):
+                return stem + extension
+        return path
+    
+    @staticmethod
+    def get_sound_bytes(sound):
+        """Memory a decoded sound holds, in the mixer's sample format"""
+        frequency, sample_format, channels = pygame.mixer.get_init()
+        return int(sound.get_length() * frequency) * channels * (abs(sample_format) // 8)
+    
+    def get_resident_bytes(self):
+        """Memory held by decoded sound effects; music is streamed and holds none"""
+        return sum(self.get_sound_bytes(sound) for sound in self.sounds.values())
+    
+    def get_memory_report(self):
+        """Resident audio memory, per loaded effect"""
+        return {
+            "resident_bytes": self.get_resident_bytes(),
+            "effects": {name: self.get_sound_bytes(sound) for name, sound in self.sounds.items()},
+            "unloaded_effects": sorted(set(GameConstants.SOUNDS) - set(self.sounds)),
+            "streamed_music": {name: self.get_music_path(name) for name in GameConstants.MUSIC}
+        }
     
     def play_music(self, music_name="main_theme", loops=-1):
         """Play background music"""
@@ -46,8 +115,8 @@ class SoundManager:
             return
             
         try:
-            if music_name in GameConstants.SOUNDS:
-                pygame.mixer.music.load(GameConstants.SOUNDS[music_name])
+            if music_name in GameConstants.MUSIC:
+                pygame.mixer.music.load(self.get_music_path(music_name))
                 pygame.mixer.music.set_volume(0.5)  # Lower volume for background music
                 pygame.mixer.music.play(loops)
                 self.music_playing = True
@@ -0,0 +1,298 @@
+"""
+Uniform-grid spatial hash for broad-phase entity queries
+"""
+import math
+
+try:
+    import numpy as np
+except ImportError:  # PackedSpatialHash needs NumPy, SpatialHash works without it
+    np = None
+
+class SpatialHash:
+    """
+    Buckets circular entities into square grid cells so queries only look at
+    entities near the queried area instead of every entity in the game
+    """
+    def __init__(self, cell_size=128):
+        self.cell_size = cell_size
+        self.cells = {}  # Maps (cell_x, cell_y) to the items overlapping that cell
+        self.bounds = {}  # Maps item to its (x, y, radius)
+        self.item_cells = {}  # Maps item to the (x0, y0, x1, y1) range of cells it occupies
+
+    def _cell_range(self, left, top, right, bottom):
+        size = self.cell_size
+        return (int(math.floor(left / size)), int(math.floor(top / size)),
+                int(math.floor(right / size)), int(math.floor(bottom / size)))
+
+    def insert(self, item, x, y, radius):
+        """Add an item covering the circle at (x, y) with the given radius"""
+        cell_range = self._cell_range(x - radius, y - radius, x + radius, y + radius)
+        self.bounds[item] = (x, y, radius)
+        self.item_cells[item] = cell_range
+        x0, y0, x1, y1 = cell_range
+        for cell_x in range(x0, x1 + 1):
+            for cell_y in range(y0, y1 + 1):
+                self.cells.setdefault((cell_x, cell_y), []).append(item)
+
+    def remove(self, item):
+        """Remove an item from the hash"""
+        x0, y0, x1, y1 = self.item_cells.pop(item)
+        del self.bounds[item]
+        for cell_x in range(x0, x1 + 1):
+            for cell_y in range(y0, y1 + 1):
+                bucket = self.cells[(cell_x, cell_y)]
+                bucket.remove(item)
+                if not bucket:
+                    del self.cells[(cell_x, cell_y)]
+
+    def update(self, item, x, y, radius):
+        """Move an item, only touching the grid when it crossed into different cells"""
+        if item not in self.item_cells:
+            self.insert(item, x, y, radius)
+            return
+
+        cell_range = self._cell_range(x - radius, y - radius, x + radius, y + radius)
+        if cell_range == self.item_cells[item]:
+            self.bounds[item] = (x, y, radius)
+        else:
+            self.remove(item)
+            self.insert(item, x, y, radius)
+
+    def rebuild(self, centers, radii):
+        """Replace the contents with items 0..n-1 at the given centers and radii"""
+        self.clear()
+        for item, ((x, y), radius) in enumerate(zip(centers, radii)):
+            self.insert(item, float(x), float(y), float(radius))
+
+    def refresh(self, centers, radii):
+        """
+        Move items 0..n-1 to the given centers and radii with update()
+        Items must keep their index since the last rebuild or refresh, items
+        past the previous count are added. Use rebuild after removing or
+        reordering items
+        """
+        if len(self.bounds) > len(radii):
+            self.rebuild(centers, radii)
+            return
+        for item, ((x, y), radius) in enumerate(zip(centers, radii)):
+            self.update(item, float(x), float(y), float(radius))
+
+    def clear(self):
+        self.cells.clear()
+        self.bounds.clear()
+        self.item_cells.clear()
+
+    def __len__(self):
+        return len(self.bounds)
+
+    def _items_in_cells(self, left, top, right, bottom, found):
+        x0, y0, x1, y1 = self._cell_range(left, top, right, bottom)
+        cells = self.cells
+        # Walk whichever is smaller: the cells in the range or the occupied cells
+        if (x1 - x0 + 1) * (y1 - y0 + 1) <= len(cells):
+            for cell_x in range(x0, x1 + 1):
+                for cell_y in range(y0, y1 + 1):
+                    bucket = cells.get((cell_x, cell_y))
+                    if bucket:
+                        found.update(bucket)
+        else:
+            for (cell_x, cell_y), bucket in cells.items():
+                if x0 <= cell_x <= x1 and y0 <= cell_y <= y1:
+                    found.update(bucket)
+
+    def query_aabb(self, left, top, right, bottom):
+        """Get the items whose bounding boxes overlap the given box"""
+        found = set()
+        self._items_in_cells(left, top, right, bottom, found)
+        bounds = self.bounds
+        return {item for item in found
+                if self._overlaps(bounds[item], left, top, right, bottom)}
+
+    def query_radius(self, x, y, radius):
+        """Get the items whose circles overlap the circle at (x, y) with the given radius"""
+        found = set()
+        self._items_in_cells(x - radius, y - radius, x + radius, y + radius, found)
+        result = set()
+        for item in found:
+            item_x, item_y, item_radius = self.bounds[item]
+            reach = radius + item_radius
+            if (item_x - x) ** 2 + (item_y - y) ** 2 < reach * reach:
+                result.add(item)
+        return result
+
+    def query_segment(self, x1, y1, x2, y2):
+        """Get the items whose bounding boxes overlap the bounding box of a segment"""
+        return self.query_aabb(min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+
+    def query_polyline(self, points):
+        """Get the items whose bounding boxes overlap the bounding box of any segment of a polyline"""
+        result = set()
+        for i in range(len(points) - 1):
+            (x1, y1), (x2, y2) = points[i], points[i + 1]
+            result |= self.query_segment(x1, y1, x2, y2)
+        return result
+
+    @staticmethod
+    def _overlaps(item_bounds, left, top, right, bottom):
+        x, y, radius = item_bounds
+        return (x - radius <= right and x + radius >= left and
+                y - radius <= bottom and y + radius >= top)
+
+
+class PackedSpatialHash:
+    """
+    Spatial hash bulk-built from arrays of centers and radii, for updating every frame
+    Items are the indices 0..n-1 of the arrays it was built from. Instead of a
+    dict of cells, it keeps one sorted array of (cell key, item) entries and
+    finds the items of a cell with a binary search, so a rebuild is a few
+    vectorized NumPy operations with no per-item Python work, and a refresh
+    only replaces the entries of the items that changed cells.
+    """
+    # Cell coordinates are packed into one int64 key: x in the high 32 bits, y in the low 32 bits
+    KEY_OFFSET = 1 << 31
+
+    def __init__(self, cell_size=128):
+        if np is None:
+            raise RuntimeError("NumPy is required for PackedSpatialHash")
+        self.cell_size = cell_size
+        self.clear()
+
+    def _pack(self, cell_x, cell_y):
+        return ((cell_x + self.KEY_OFFSET) << 32) | (cell_y + self.KEY_OFFSET)
+
+    def _set_bounds(self, centers, radii):
+        centers = np.asarray(centers, dtype=float).reshape(-1, 2)
+        self.x = centers[:, 0].copy()
+        self.y = centers[:, 1].copy()
+        self.radii = np.array(radii, dtype=float)
+        # Rows of first cell x, first cell y, last cell x and last cell y covered by each item
+        bounds = np.stack((self.x - self.radii, self.y - self.radii, self.x + self.radii, self.y + self.radii))
+        self.cell_ranges = np.floor(bounds / self.cell_size).astype(np.int64)
+
+    def _entries(self, items):
+        """Get the unsorted (cell key, item) entries of the given items"""
+        x0, y0, x1, y1 = self.cell_ranges[:, items]
+        span_x = x1 - x0
+        span_y = y1 - y0
+
+        # One entry per covered cell, usually 1 to 4 per item when radii are under the cell size
+        keys = []
+        entry_items = []
+        for dx in range(int(span_x.max()) + 1):
+            for dy in range(int(span_y.max()) + 1):
+                covered = (span_x >= dx) & (span_y >= dy)
+                keys.append(self._pack(x0[covered] + dx, y0[covered] + dy))
+                entry_items.append(items[covered])
+        return np.concatenate(keys), np.concatenate(entry_items)
+
+    def rebuild(self, centers, radii):
+        """Replace the contents with items 0..n-1 at the given centers and radii"""
+        self._set_bounds(centers, radii)
+        if len(self.radii) == 0:
+            self.keys = np.empty(0, dtype=np.int64)
+            self.items = np.empty(0, dtype=np.intp)
+            return
+
+        keys, items = self._entries(np.arange(len(self.radii)))
+        order = np.argsort(keys, kind="stable")
+        self.keys = keys[order]
+        self.items = items[order]
+
+    def refresh(self, centers, radii):
+        """
+        Move items 0..n-1 to the given centers and radii, only replacing the
+        entries of items that crossed into different cells
+        Items must keep their index since the last rebuild or refresh, items
+        past the previous count are added. Use rebuild after removing or
+        reordering items
+        """
+        old_count = len(self.radii)
+        if len(radii) < old_count:
+            self.rebuild(centers, radii)
+            return
+        old_ranges = self.cell_ranges
+        self._set_bounds(centers, radii)
+        count = len(self.radii)
+
+        changed = np.ones(count, dtype=bool)
+        changed[:old_count] = (self.cell_ranges[:, :old_count] != old_ranges).any(axis=0)
+        moved = np.flatnonzero(changed)
+        if len(moved) == 0:
+            return
+
+        # Drop the old entries of the moved items and append their new ones. The
+        # stable sort is a merge of two sorted runs then, linear in the entries
+        kept = ~changed[self.items]
+        new_keys, new_items = self._entries(moved)
+        keys = np.concatenate((self.keys[kept], new_keys))
+        order = np.argsort(keys, kind="stable")
+        self.keys = keys[order]
+        self.items = np.concatenate((self.items[kept], new_items))[order]
+
+    def clear(self):
+        self.keys = np.empty(0, dtype=np.int64)
+        self.items = np.empty(0, dtype=np.intp)
+        self.x = np.empty(0)
+        self.y = np.empty(0)
+        self.radii = np.empty(0)
+        self.cell_ranges = np.empty((4, 0), dtype=np.int64)
+
+    def __len__(self):
+        return len(self.radii)
+
+    def _candidates(self, boxes):
+        """Get the unique items in the cells overlapping any of the (left, top, right, bottom) boxes"""
+        size = self.cell_size
+        query_keys = []
+        for left, top, right, bottom in boxes:
+            cell_xs = np.arange(math.floor(left / size), math.floor(right / size) + 1, dtype=np.int64)
+            cell_ys = np.arange(math.floor(top / size), math.floor(bottom / size) + 1, dtype=np.int64)
+            query_keys.append(self._pack(cell_xs[:, None], cell_ys[None, :]).ravel())
+        query_keys = np.unique(np.concatenate(query_keys))
+
+        starts = np.searchsorted(self.keys, query_keys, side="left")
+        ends = np.searchsorted(self.keys, query_keys, side="right")
+        found = [self.items[start:end] for start, end in zip(starts.tolist(), ends.tolist()) if end > start]
+        if not found:
+            return np.empty(0, dtype=np.intp)
+        return np.unique(np.concatenate(found))
+
+    def _overlapping(self, items, left, top, right, bottom):
+        """Get the items whose bounding boxes overlap any of the boxes given as coordinate arrays"""
+        x = self.x[items][:, None]
+        y = self.y[items][:, None]
+        radii = self.radii[items][:, None]
+        overlaps = ((x - radii <= right) & (x + radii >= left) &
+                    (y - radii <= bottom) & (y + radii >= top))
+        return items[overlaps.any(axis=1)]
+
+    def query_aabb(self, left, top, right, bottom):
+        """Get the sorted indices of items whose bounding boxes overlap the given box"""
+        items = self._candidates([(left, top, right, bottom)])
+        return self._overlapping(items, left, top, right, bottom)
+
+    def query_radius(self, x, y, radius):
+        """Get the sorted indices of items whose circles overlap the circle at (x, y) with the given radius"""
+        items = self._candidates([(x - radius, y - radius, x + radius, y + radius)])
+        reach = radius + self.radii[items]
+        overlaps = (self.x[items] - x) ** 2 + (self.y[items] - y) ** 2 < reach * reach
+        return items[overlaps]
+
+    def query_segment(self, x1, y1, x2, y2):
+        """Get the sorted indices of items whose bounding boxes overlap the bounding box of a segment"""
+        return self.query_aabb(min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+
+    def query_polyline(self, points):
+        """Get the sorted indices of items whose bounding boxes overlap the bounding box of any segment of a polyline"""
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        if len(points) < 2 or len(self.keys) == 0:
+            return np.empty(0, dtype=np.intp)
+
+        # Bounding box of every segment
+        left = np.minimum(points[:-1, 0], points[1:, 0])
+        top = np.minimum(points[:-1, 1], points[1:, 1])
+        right = np.maximum(points[:-1, 0], points[1:, 0])
+        bottom = np.maximum(points[:-1, 1], points[1:, 1])
+
+        items = self._candidates(zip(left.tolist(), top.tolist(), right.tolist(), bottom.tolist()))
+        return self._overlapping(items, left, top, right, bottom)
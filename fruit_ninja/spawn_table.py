@@ -0,0 +1,142 @@
+"""
+Data-driven spawn table: per-level fruit weights, special fruits, points and score thresholds
+"""
+import json
+import random
+from bisect import bisect_right
+from .constants import GameConstants
+
+# Level settings used where the table file doesn't set them
+LEVEL_DEFAULTS = {
+    "default_weight": 1.0,  # Weight of fruits missing from "weights"
+    "weights": {},  # Fruit name to relative spawn weight, 0 never spawns it
+    "special_fruit": "freeze_banana",
+    "special_chance": 0.05,
+    "points": 10,
+    "special_points_multiplier": 1,
+    "speed_scale": 0.8,  # Scales the launch velocity of every fruit
+    "min_speed_multiplier": 1.0  # Reaching the level raises the difficulty speed multiplier to at least this
+}
+
+class AliasSampler:
+    """
+    Weighted random choice in constant time (Vose's alias method)
+
+    Built once in O(n): every index gets a column of equal width holding its
+    own probability and the index that fills the rest of the column. A sample
+    picks a column and then one of its two indices, from a single random draw.
+    """
+    def __init__(self, weights):
+        count = len(weights)
+        total = float(sum(weights))
+        if count == 0 or total <= 0:
+            raise ValueError("AliasSampler needs at least one positive weight")
+        if min(weights) < 0:
+            raise ValueError("AliasSampler weights can't be negative")
+
+        self.count = count
+        self.probabilities = [0.0] * count
+        self.aliases = list(range(count))
+
+        scaled = [weight * count / total for weight in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            self.probabilities[less] = scaled[less]
+            self.aliases[less] = more
+            # The larger index gives away what fills the smaller one's column
+            scaled[more] -= 1.0 - scaled[less]
+            if scaled[more] < 1.0:
+                small.append(more)
+            else:
+                large.append(more)
+        # Whatever is left is 1.0 up to rounding error
+        for i in small + large:
+            self.probabilities[i] = 1.0
+
+    def sample(self, rng=random):
+        """Draw an index with probability proportional to its weight"""
+        position = rng.random() * self.count
+        column = int(position)
+        if position - column < self.probabilities[column]:
+            return column
+        return self.aliases[column]
+
+
+class SpawnLevel:
+    """The compiled settings of one level"""
+    def __init__(self, index, settings, fruit_names):
+        self.index = index
+        self.score = settings["score"]
+        self.points = settings["points"]
+        self.special_points_multiplier = settings["special_points_multiplier"]
+        self.speed_scale = settings["speed_scale"]
+        self.min_speed_multiplier = settings["min_speed_multiplier"]
+
+        weights = settings["weights"]
+        for name in weights:
+            if name not in fruit_names:
+                print(f"Spawn table level {index + 1}: unknown fruit {name}")
+        self.sampler = AliasSampler([weights.get(name, settings["default_weight"]) for name in fruit_names])
+
+        # Index of the special fruit, None if the catalog doesn't have it
+        special = settings["special_fruit"]
+        self.special_index = fruit_names.index(special) if special in fruit_names else None
+        self.special_chance = settings["special_chance"] if self.special_index is not None else 0.0
+
+    def get_points(self, is_special):
+        if is_special:
+            return self.points * self.special_points_multiplier
+        return self.points
+
+
+class SpawnTable:
+    """
+    Levels compiled from a spawn table for a catalog of fruit names
+
+    The table file has "defaults" and a list of "levels" ordered by the
+    "score" needed to reach them, the first at 0. Each level only lists the
+    settings it changes from the level before it (see LEVEL_DEFAULTS). At load
+    every level gets an AliasSampler over the fruit weights, so picking a fruit
+    is O(1) however many fruits there are, and the score thresholds are kept
+    sorted, so finding the level of a score is a bisect.
+    """
+    def __init__(self, data, fruit_names):
+        self.fruit_names = list(fruit_names)
+        settings = dict(LEVEL_DEFAULTS)
+        settings.update(data.get("defaults", {}))
+
+        self.levels = []
+        for index, level_data in enumerate(data["levels"]):
+            if "score" not in level_data:
+                raise ValueError(f"Spawn table level {index + 1} has no score")
+            settings = dict(settings, **level_data)
+            self.levels.append(SpawnLevel(index, settings, self.fruit_names))
+        self.thresholds = [level.score for level in self.levels]
+        if not self.levels or self.thresholds[0] != 0:
+            raise ValueError("The first spawn table level must start at score 0")
+        if self.thresholds != sorted(self.thresholds):
+            raise ValueError("Spawn table levels must be ordered by score")
+
+    def get_level_index(self, score):
+        """0-based index of the level a score is in"""
+        return max(0, bisect_right(self.thresholds, score) - 1)
+
+    def get_level(self, index):
+        """Settings of a 0-based level, the last one past the end of the table"""
+        return self.levels[min(index, len(self.levels) - 1)]
+
+    def get_level_count(self):
+        return len(self.levels)
+
+
+def load_spawn_table(fruit_names, path=GameConstants.SPAWN_TABLE_FILE):
+    """Load and compile the spawn table file, falling back to a single level of LEVEL_DEFAULTS"""
+    try:
+        with open(path, 'r') as f:
+            return SpawnTable(json.load(f), fruit_names)
+    except Exception as e:
+        print(f"Error loading spawn table {path}: {e}")
+        return SpawnTable({"levels": [{"score": 0}]}, fruit_names)
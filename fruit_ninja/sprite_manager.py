@@ -5,48 +5,71 @@ import pygame
 import os
 import random
 from .constants import GameConstants
+from .rotation_cache import RotationCache
+from .loader import decode_image, fit_size, scale_image
+from .texture_atlas import get_image
 
 class SpriteManager:
     """Manages loading and accessing sprites from spritesheets"""
     
-    def __init__(self):
+    def __init__(self, load=True):
         self.fruit_sprites = []
         self.sliced_fruit_sprites = []
         self.fruit_to_sliced_map = {}  # Maps fruit index to its specific sliced pair
         self.fruit_names = []  # Names of loaded fruits for reference
-        self.load_sprites()
+        self.rotation_cache = RotationCache(
+            GameConstants.ROTATION_CACHE_ANGLE_STEP,
+            GameConstants.ROTATION_CACHE_MAX_BYTES
+        )
+        
+        # Without load, call load_sprites() later, e.g. with a texture atlas built on worker threads
+        if load:
+            self.load_sprites()
+    
+    @staticmethod
+    def get_sprite_paths():
+        """Paths of every sprite image load_sprites() uses"""
+        paths = []
+        for fruit_name, fruit_data in GameConstants.FRUIT_IMAGES.items():
+            if fruit_name not in GameConstants.SKIPPED_FRUITS:
+                paths.append(fruit_data["whole"])
+                paths.extend(fruit_data["sliced"])
+        return paths
+    
+    @staticmethod
+    def get_sprite_target_size(path):
+        """Size in pixels a sprite image is scaled to fit"""
+        # Special handling for banana slices - make them bigger
+        if "BananaTop" in path or "BananaBottom" in path:
+            return 120  # Reduced from 150 but still larger than other fruits
+        # Special handling for frozen banana - make it and its slices smaller
+        elif "FreezeBanana" in path:
+            return 70
+        # Scale to appropriate size if needed - reduced overall size
+        return 80  # Further reduced from 100
     
-    def load_sprites(self):
-        """Load all sprites from individual files"""
+    @staticmethod
+    def decode_sprite(path):
+        """Decode a sprite image and scale it to its target size, maintaining aspect ratio (thread safe)"""
+        image = decode_image(path)
+        return scale_image(image, fit_size(image, SpriteManager.get_sprite_target_size(path)))
+    
+    def load_sprites(self, atlas=None):
+        """
+        Load all sprites from individual files
+        With a converted texture atlas, sprites are taken from it by name instead
+        """
         try:
             # Load individual fruit images
             for fruit_name, fruit_data in GameConstants.FRUIT_IMAGES.items():
-                # Skip magic bean
-                if fruit_name == "magic_bean":
+                # Skip fruits that are never spawned (magic bean)
+                if fruit_name in GameConstants.SKIPPED_FRUITS:
                     continue
                     
                 # Load whole fruit
                 whole_path = fruit_data["whole"]
                 if os.path.exists(whole_path):
-                    whole_image = pygame.image.load(whole_path).convert_alpha()
-                    
-                    # Special handling for frozen banana - make it smaller
-                    if "FreezeBanana" in whole_path:
-                        scaled_size = 70  # Smaller size for frozen banana
-                    else:
-                        # Scale to appropriate size if needed - reduced overall size
-                        scaled_size = 80  # Further reduced from 100
-                    
-                    # Maintain aspect ratio
-                    aspect_ratio = whole_image.get_width() / whole_image.get_height()
-                    if aspect_ratio > 1:
-                        new_width = scaled_size
-                        new_height = int(scaled_size / aspect_ratio)
-                    else:
-                        new_width = int(scaled_size * aspect_ratio)
-                        new_height = scaled_size
-                    
-                    whole_image = pygame.transform.smoothscale(whole_image, (new_width, new_height))
+                    whole_image = get_image(atlas, whole_path, self.decode_sprite)
                     
                     # Add to fruit sprites
                     fruit_index = len(self.fruit_sprites)
@@ -57,27 +80,7 @@ class SpriteManager:
                     sliced_images = []
                     for sliced_path in fruit_data["sliced"]:
                         if os.path.exists(sliced_path):
-                            sliced_image = pygame.image.load(sliced_path).convert_alpha()
-                            
-                            # Special handling for banana slices - make them bigger
-                            if "BananaTop" in sliced_path or "BananaBottom" in sliced_path:
-                                scaled_size = 120  # Reduced from 150 but still larger than other fruits
-                            elif "FreezeBanana" in sliced_path:
-                                scaled_size = 70  # Smaller for frozen banana slices
-                            else:
-                                scaled_size = 80  # Reduced from 100
-                            
-                            # Maintain aspect ratio
-                            aspect_ratio = sliced_image.get_width() / sliced_image.get_height()
-                            if aspect_ratio > 1:
-                                new_width = scaled_size
-                                new_height = int(scaled_size / aspect_ratio)
-                            else:
-                                new_width = int(scaled_size * aspect_ratio)
-                                new_height = scaled_size
-                            
-                            sliced_image = pygame.transform.smoothscale(sliced_image, (new_width, new_height))
-                            sliced_images.append(sliced_image)
+                            sliced_images.append(get_image(atlas, sliced_path, self.decode_sprite))
                     
                     # If we have at least one sliced image
                     if sliced_images:
@@ -100,6 +103,9 @@ class SpriteManager:
             print(f"Error loading sprites: {e}")
             # Create fallback sprites if loading fails
             self._create_fallback_sprites()
+        
+        if GameConstants.ROTATION_CACHE_WARM:
+            self.warm_rotation_cache()
     
     def _load_legacy_sprites(self):
         """Load sprites from spritesheets (legacy method)"""
@@ -218,6 +224,18 @@ class SpriteManager:
             self.sliced_fruit_sprites.append((left_half, right_half))
             self.fruit_to_sliced_map[i] = i
     
+    def warm_rotation_cache(self):
+        """Pre-render every rotation bucket for all whole and sliced fruit sprites"""
+        for fruit_index, sprite in enumerate(self.fruit_sprites):
+            self.rotation_cache.warm(fruit_index, "whole", sprite)
+            sliced_sprites = self.get_matching_sliced_sprite(fruit_index)
+            if sliced_sprites:
+                self.rotation_cache.warm(fruit_index, "left", sliced_sprites[0])
+                self.rotation_cache.warm(fruit_index, "right", sliced_sprites[1])
+        
+        stats = self.rotation_cache.get_stats()
+        print(f"Warmed rotation cache with {stats['entries']} sprites ({stats['used_bytes'] // 1024} KB)")
+    
     def get_random_fruit_sprite(self):
         """Get a random fruit sprite"""
         if not self.fruit_sprites:
@@ -0,0 +1,111 @@
+"""
+Glyph-atlas text rendering with a cache of whole strings
+"""
+from collections import OrderedDict
+import pygame
+from .constants import GameConstants
+from .perf_overlay import counters
+
+class GlyphAtlas:
+    """
+    Every glyph of a font rasterized once into one surface
+
+    Glyphs are rendered white so strings of any color can be tinted from them.
+    Each glyph keeps its horizontal bearing and advance, so strings composed
+    from the atlas match font.render pixel for pixel (the font has no kerning
+    pairs for these characters).
+    """
+    ATLAS_WIDTH = 1024
+    PADDING = 1  # Keeps neighbouring glyphs from bleeding into each other
+
+    def __init__(self, font, characters=GameConstants.GLYPH_ATLAS_CHARACTERS):
+        self.font = font
+        self.height = font.get_height()
+        self.glyphs = {}  # Maps a character to (area in atlas, min x bearing, advance)
+
+        # Rasterize each glyph and pack them into rows
+        rendered = []
+        for char in characters:
+            metrics = font.metrics(char)[0]
+            if metrics is None:
+                continue  # Glyph missing from the font
+            rendered.append((char, font.render(char, True, GameConstants.WHITE), metrics[0], metrics[4]))
+            counters.text_renders += 1
+
+        x = y = 0
+        areas = []
+        for char, surface, min_x, advance in rendered:
+            if x + surface.get_width() > self.ATLAS_WIDTH:
+                x = 0
+                y += self.height + self.PADDING
+            areas.append(pygame.Rect(x, y, surface.get_width(), surface.get_height()))
+            x += surface.get_width() + self.PADDING
+
+        self.surface = pygame.Surface((self.ATLAS_WIDTH, y + self.height), pygame.SRCALPHA)
+        for (char, surface, min_x, advance), area in zip(rendered, areas):
+            self.surface.blit(surface, area)
+            self.glyphs[char] = (area, min_x, advance)
+
+    def has_glyphs(self, text):
+        """Check if every character of text is in the atlas"""
+        return all(char in self.glyphs for char in text)
+
+    def compose(self, text):
+        """Compose a white string from the atlas; every character must be in it"""
+        width = sum(self.glyphs[char][2] for char in text)
+        surface = pygame.Surface((max(1, width), self.height), pygame.SRCALPHA)
+        if not text:
+            return surface
+
+        # A first glyph that overhangs to the left pushes the whole string right, as in SDL_ttf
+        x = max(0, -self.glyphs[text[0]][1])
+        for char in text:
+            area, min_x, advance = self.glyphs[char]
+            # Overhanging glyphs overlap their neighbours, keep the stronger coverage
+            surface.blit(self.surface, (x + min(0, min_x), 0), area, special_flags=pygame.BLEND_RGBA_MAX)
+            x += advance
+        return surface
+
+class TextRenderer:
+    """
+    Renders strings for one font from a glyph atlas, caching whole strings
+
+    render() returns the same surface for the same text and color until it is
+    evicted, so callers must not draw onto it. A HUD whose values haven't
+    changed costs only the blits of its cached strings.
+    """
+    def __init__(self, font, cache_size=GameConstants.TEXT_CACHE_SIZE):
+        self.font = font
+        self.atlas = GlyphAtlas(font)
+        self.cache_size = cache_size
+        # Maps (text, color) to a rendered surface, least recently used first
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, text, color):
+        """Get a surface of text in color, like font.render(text, True, color)"""
+        key = (text, tuple(color))
+        surface = self.cache.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.cache.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        counters.text_renders += 1
+        if self.atlas.has_glyphs(text):
+            surface = self.atlas.compose(text)
+            if tuple(color[:3]) != GameConstants.WHITE:
+                surface.fill(color, special_flags=pygame.BLEND_RGBA_MULT)
+        else:
+            surface = self.font.render(text, True, color)
+
+        self.cache[key] = surface
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return surface
+
+    def size(self, text):
+        """Size of the rendered text, like font.size"""
+        return self.font.size(text)
@@ -0,0 +1,142 @@
+"""
+Texture atlas: many small images packed into one surface
+"""
+import os
+import pygame
+from .constants import GameConstants
+
+def get_image_name(path):
+    """Logical name of an image in the atlas: its file name without the extension"""
+    return os.path.splitext(os.path.basename(path))[0]
+
+def skyline_pack(sizes, width, padding):
+    """
+    Pack sizes bottom-left into a strip of the given width, tallest first
+    The skyline is the top edge of everything packed so far, as (x, width, y)
+    segments. Each image goes where it rests lowest on it, leftmost on ties,
+    so short images fill the gaps next to taller ones instead of leaving them
+    empty like rows of fixed height would
+    Returns the rects in the order of sizes and the total height
+    """
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0]))
+    rects = [None] * len(sizes)
+    skyline = [(0, width + padding, 0)]
+    for i in order:
+        w, h = sizes[i]
+        # Padding goes right of and below every image, so the strip gets the same on its right
+        span = w + padding
+        best_x = best_y = None
+        for start, (x, _, _) in enumerate(skyline):
+            if x + span > width + padding:
+                break
+            # The image rests on the highest segment under it
+            y = max(segment_y for segment_x, _, segment_y in skyline[start:] if segment_x < x + span)
+            if best_y is None or y < best_y:
+                best_x, best_y = x, y
+        rects[i] = pygame.Rect(best_x, best_y, w, h)
+
+        # Raise the skyline under the image, then merge neighbouring segments of the same height
+        right = best_x + span
+        raised = []
+        for x, segment_width, y in skyline:
+            if x < best_x:
+                raised.append((x, min(segment_width, best_x - x), y))
+            if x + segment_width > right:
+                raised.append((max(x, right), x + segment_width - max(x, right), y))
+        raised.append((best_x, span, best_y + h + padding))
+        raised.sort()
+        skyline = [raised[0]]
+        for x, segment_width, y in raised[1:]:
+            last_x, last_width, last_y = skyline[-1]
+            if y == last_y:
+                skyline[-1] = (last_x, last_width + segment_width, y)
+            else:
+                skyline.append((x, segment_width, y))
+    height = max((rect.bottom for rect in rects), default=0)
+    return rects, height
+
+def get_image(atlas, path, decode):
+    """
+    Get the image of a source path from a converted atlas, or decode and convert it if the atlas doesn't hold it
+    A dict of converted images by name works as the atlas too
+    """
+    name = get_image_name(path)
+    if atlas is not None and name in atlas:
+        return atlas.get(name)
+    return decode(path).convert_alpha()
+
+class TextureAtlas:
+    """
+    One surface holding many images, with their rects looked up by name
+
+    get() returns a subsurface, which shares the atlas pixels, so the images
+    can be blitted, rotated and cached like separate surfaces while only the
+    atlas is kept in memory. An atlas is built once from the loaded images, or
+    loaded whole from the asset pack.
+    """
+    def __init__(self, surface, rects):
+        self.surface = surface
+        self.rects = {name: pygame.Rect(rect) for name, rect in rects.items()}
+        self.subsurfaces = {}
+
+    @classmethod
+    def build(cls, images, max_width=GameConstants.ATLAS_MAX_WIDTH, padding=GameConstants.ATLAS_PADDING):
+        """
+        Pack images (name to surface) into a new atlas (thread safe, the surface isn't converted)
+        Every width up to max_width is tried in ATLAS_WIDTH_STEP steps, keeping the tightest packing
+        """
+        names = list(images)
+        sizes = [images[name].get_size() for name in names]
+        widest = max((w for w, h in sizes), default=1)
+        best = None
+        for width in range(widest, max(widest, max_width) + 1, GameConstants.ATLAS_WIDTH_STEP):
+            rects, height = skyline_pack(sizes, width, padding)
+            used_width = max((rect.right for rect in rects), default=1)
+            if best is None or used_width * height < best[0]:
+                best = (used_width * height, used_width, height, rects)
+        _, width, height, rects = best
+
+        surface = pygame.Surface((max(1, width), max(1, height)), pygame.SRCALPHA, 32)
+        for name, rect in zip(names, rects):
+            # The atlas starts fully transparent, so MAX copies pixels exactly instead of blending them
+            surface.blit(images[name], rect, special_flags=pygame.BLEND_RGBA_MAX)
+        return cls(surface, dict(zip(names, rects)))
+
+    def convert(self):
+        """Copy of the atlas in the display format (main thread)"""
+        return TextureAtlas(self.surface.convert_alpha(), self.rects)
+
+    def __contains__(self, name):
+        return name in self.rects
+
+    def get(self, name):
+        """Get an image by name as a subsurface of the atlas"""
+        subsurface = self.subsurfaces.get(name)
+        if subsurface is None:
+            subsurface = self.surface.subsurface(self.rects[name])
+            self.subsurfaces[name] = subsurface
+        return subsurface
+
+    def get_report(self):
+        """Packing efficiency and the memory used compared with one surface per image"""
+        width, height = self.surface.get_size()
+        bytes_per_pixel = self.surface.get_bytesize()
+        used_pixels = sum(rect.width * rect.height for rect in self.rects.values())
+        # Pixel memory only; separate surfaces would also each carry their own SDL and pygame objects
+        individual_bytes = used_pixels * bytes_per_pixel
+        atlas_bytes = self.surface.get_pitch() * height
+        return {
+            "images": len(self.rects),
+            "size": [width, height],
+            "efficiency": used_pixels / (width * height),
+            "individual_bytes": individual_bytes,
+            "atlas_bytes": atlas_bytes,
+            "saved_bytes": individual_bytes - atlas_bytes
+        }
+
+    def format_report(self):
+        report = self.get_report()
+        return (f"Texture atlas: {report['images']} images in {report['size'][0]}x{report['size'][1]}, "
+                f"{report['efficiency']:.0%} packed, {report['atlas_bytes'] / 1024:.0f} KiB vs "
+                f"{report['individual_bytes'] / 1024:.0f} KiB as separate surfaces "
+                f"({report['saved_bytes'] / 1024:+.0f} KiB saved)")
@@ -3,6 +3,11 @@ Utility classes and functions for the game
 """
 import math
 
+try:
+    import numpy as np
+except ImportError:  # Batched collision needs NumPy, callers fall back to the scalar path
+    np = None
+
 class CollisionDetector:
     @staticmethod
     def point_to_line_distance(x, y, x1, y1, x2, y2):
@@ -36,3 +41,158 @@ class CollisionDetector:
         dy = y - yy
         
         return math.sqrt(dx * dx + dy * dy)
+
+    @staticmethod
+    def segment_to_segment_distance(ax1, ay1, ax2, ay2, bx1, by1, bx2, by2):
+        """
+        Calculate the distance between the line segments (ax1,ay1)-(ax2,ay2) and (bx1,by1)-(bx2,by2)
+        Zero if they cross, otherwise the closest an endpoint of one gets to the other
+        """
+        if CollisionDetector._segments_cross(ax1, ay1, ax2, ay2, bx1, by1, bx2, by2):
+            return 0.0
+        distance = CollisionDetector.point_to_line_distance
+        return min(
+            distance(ax1, ay1, bx1, by1, bx2, by2),
+            distance(ax2, ay2, bx1, by1, bx2, by2),
+            distance(bx1, by1, ax1, ay1, ax2, ay2),
+            distance(bx2, by2, ax1, ay1, ax2, ay2)
+        )
+
+    @staticmethod
+    def _segments_cross(ax1, ay1, ax2, ay2, bx1, by1, bx2, by2):
+        """Check if two segments properly cross; touching and collinear cases are left to the endpoint distances"""
+        d1 = (bx2 - bx1) * (ay1 - by1) - (by2 - by1) * (ax1 - bx1)
+        d2 = (bx2 - bx1) * (ay2 - by1) - (by2 - by1) * (ax2 - bx1)
+        d3 = (ax2 - ax1) * (by1 - ay1) - (ay2 - ay1) * (bx1 - ax1)
+        d4 = (ax2 - ax1) * (by2 - ay1) - (ay2 - ay1) * (bx2 - ax1)
+        return d1 * d2 < 0 and d3 * d4 < 0
+
+    @staticmethod
+    def batch_available():
+        """Check if the batched collision functions can be used"""
+        return np is not None
+
+    @staticmethod
+    def batch_slice_hits(slice_points, centers, radii, active=None):
+        """
+        Test every fruit against every segment of a slice polyline in one pass
+        slice_points: sequence of (x, y) points of the slice
+        centers: (N, 2) array of fruit centers
+        radii: (N,) array of fruit radii
+        active: optional (N,) boolean array, fruits where it is False are never hit
+        Returns (fruit_indices, segment_indices): the fruits that were hit, in
+        ascending order, and for each the first segment whose distance to the
+        fruit center is less than its radius. Segment i runs from
+        slice_points[i] to slice_points[i + 1].
+        """
+        centers = np.asarray(centers, dtype=float).reshape(-1, 2)
+        radii = np.asarray(radii, dtype=float)
+        points = np.asarray(slice_points, dtype=float).reshape(-1, 2)
+        if len(centers) == 0 or len(points) < 2:
+            empty = np.empty(0, dtype=np.intp)
+            return empty, empty
+
+        # Fruits along rows, segments along columns
+        x = centers[:, 0:1]
+        y = centers[:, 1:2]
+        x1 = points[:-1, 0]
+        y1 = points[:-1, 1]
+        x2 = points[1:, 0]
+        y2 = points[1:, 1]
+
+        # Same arithmetic as point_to_line_distance so results match the scalar path exactly
+        A = x - x1
+        B = y - y1
+        C = x2 - x1
+        D = y2 - y1
+
+        dot = A * C + B * D
+        len_sq = C * C + D * D
+
+        degenerate = len_sq == 0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            param = dot / len_sq
+
+        xx = np.where(param < 0, x1, np.where(param > 1, x2, x1 + param * C))
+        yy = np.where(param < 0, y1, np.where(param > 1, y2, y1 + param * D))
+        dx = np.where(degenerate, A, x - xx)
+        dy = np.where(degenerate, B, y - yy)
+
+        hits = np.sqrt(dx * dx + dy * dy) < radii[:, None]
+        hit_any = hits.any(axis=1)
+        if active is not None:
+            hit_any &= np.asarray(active, dtype=bool)
+
+        fruit_indices = np.flatnonzero(hit_any)
+        return fruit_indices, hits[fruit_indices].argmax(axis=1)
+
+    @staticmethod
+    def batch_swept_slice_hits(slice_points, starts, ends, radii, active=None):
+        """
+        Swept version of batch_slice_hits: test every fruit's motion over the
+        last tick against every segment of a slice polyline in one pass
+        starts, ends: (N, 2) arrays of fruit centers at the start and end of the tick
+        A fruit is hit by a segment when the segment comes closer than its
+        radius to the path of its center, so a fruit moving more than its
+        diameter per tick can't pass through a slice between two ticks.
+        Returns (fruit_indices, segment_indices) like batch_slice_hits, and
+        matches segment_to_segment_distance exactly.
+        """
+        starts = np.asarray(starts, dtype=float).reshape(-1, 2)
+        ends = np.asarray(ends, dtype=float).reshape(-1, 2)
+        radii = np.asarray(radii, dtype=float)
+        points = np.asarray(slice_points, dtype=float).reshape(-1, 2)
+        if len(starts) == 0 or len(points) < 2:
+            empty = np.empty(0, dtype=np.intp)
+            return empty, empty
+
+        # Fruits along rows, segments along columns
+        ax1 = starts[:, 0:1]
+        ay1 = starts[:, 1:2]
+        ax2 = ends[:, 0:1]
+        ay2 = ends[:, 1:2]
+        bx1 = points[:-1, 0]
+        by1 = points[:-1, 1]
+        bx2 = points[1:, 0]
+        by2 = points[1:, 1]
+
+        d1 = (bx2 - bx1) * (ay1 - by1) - (by2 - by1) * (ax1 - bx1)
+        d2 = (bx2 - bx1) * (ay2 - by1) - (by2 - by1) * (ax2 - bx1)
+        d3 = (ax2 - ax1) * (by1 - ay1) - (ay2 - ay1) * (bx1 - ax1)
+        d4 = (ax2 - ax1) * (by2 - ay1) - (ay2 - ay1) * (bx2 - ax1)
+        cross = (d1 * d2 < 0) & (d3 * d4 < 0)
+
+        radius = radii[:, None]
+        hits = (cross |
+                (_batch_point_to_line_distance(ax1, ay1, bx1, by1, bx2, by2) < radius) |
+                (_batch_point_to_line_distance(ax2, ay2, bx1, by1, bx2, by2) < radius) |
+                (_batch_point_to_line_distance(bx1, by1, ax1, ay1, ax2, ay2) < radius) |
+                (_batch_point_to_line_distance(bx2, by2, ax1, ay1, ax2, ay2) < radius))
+
+        hit_any = hits.any(axis=1)
+        if active is not None:
+            hit_any &= np.asarray(active, dtype=bool)
+
+        fruit_indices = np.flatnonzero(hit_any)
+        return fruit_indices, hits[fruit_indices].argmax(axis=1)
+
+
+def _batch_point_to_line_distance(x, y, x1, y1, x2, y2):
+    """Broadcasting version of CollisionDetector.point_to_line_distance, with the same arithmetic"""
+    A = x - x1
+    B = y - y1
+    C = x2 - x1
+    D = y2 - y1
+
+    dot = A * C + B * D
+    len_sq = C * C + D * D
+
+    degenerate = len_sq == 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        param = dot / len_sq
+
+    xx = np.where(param < 0, x1, np.where(param > 1, x2, x1 + param * C))
+    yy = np.where(param < 0, y1, np.where(param > 1, y2, y1 + param * D))
+    dx = np.where(degenerate, A, x - xx)
+    dy = np.where(degenerate, B, y - yy)
+    return np.sqrt(dx * dx + dy * dy)